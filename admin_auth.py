@@ -0,0 +1,129 @@
+import os
+import sys
+import math
+import time
+import hmac
+import hashlib
+import getpass
+import threading
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from rate_limit import SQLiteBackend, ParseLimit
+
+# ============================================ ADMIN AUTH ============================================
+# THE PASSWORD IS ONLY EVER HELD AS A SALTED KDF HASH. THE EXPENSIVE CHECK RUNS ONCE PER LOGIN, NEVER PER REQUEST:
+#   - LOGIN: PER-IP THROTTLE FIRST (A TOKEN BUCKET IN ITS OWN SQLITE FILE, ADMIN_LOGIN_DB, WHATEVER RATE_LIMIT_BACKEND
+#     SAYS - N WORKERS MUST NOT MEAN N TIMES THE GUESSES), THEN THE KDF, AT MOST ADMIN_KDF_CONCURRENCY AT A TIME PER
+#     WORKER SO A FLOOD CAN'T PIN THE CPU
+#   - EVERY ADMIN REQUEST: THE SIGNED SESSION COOKIE CARRIES A STAMP AND A LOGIN TIME, SO VALIDATING IT IS A DICT
+#     LOOKUP + STRING COMPARE. THE STAMP IS HMAC(SECRET_KEY, CONFIGURED PASSWORD) - THE SAME IN EVERY WORKER AND
+#     ACROSS RESTARTS - SO ROTATING THE PASSWORD OR SECRET_KEY INVALIDATES EVERY SESSION.
+#   ADMIN_PASSWORD_HASH - OUTPUT OF `python admin_auth.py hash` (PREFERRED)
+#   ADMIN_PASSWORD - PLAINTEXT FALLBACK, HASHED ONCE AT STARTUP (WITH A FRESH SALT PER PROCESS)
+#   ADMIN_KDF - werkzeug METHOD STRING; RAISE THE SCRYPT N (2ND FIELD) TO MAKE EACH GUESS COST MORE
+
+ADMIN_PASSWORD_HASH = os.environ.get("ADMIN_PASSWORD_HASH")
+ADMIN_KDF = os.environ.get("ADMIN_KDF", "scrypt:32768:8:1")
+ADMIN_LOGIN_LIMIT = os.environ.get("ADMIN_LOGIN_LIMIT", "5/900")   # BURST/SECONDS TO FULLY REFILL
+ADMIN_KDF_CONCURRENCY = int(os.environ.get("ADMIN_KDF_CONCURRENCY", 2))
+ADMIN_SESSION_HOURS = float(os.environ.get("ADMIN_SESSION_HOURS", 12))
+# NOT RATE_LIMIT_DB - THE FORM LIMITER'S SWEEP WOULD DROP LOGIN BUCKETS BEFORE THEIR SLOWER REFILL IS DONE
+ADMIN_LOGIN_DB = os.environ.get("ADMIN_LOGIN_DB", "admin_login.sqlite3")
+
+LOGIN_LIMIT = ParseLimit(ADMIN_LOGIN_LIMIT)
+LOGIN_RETRY_AFTER = math.ceil(1 / LOGIN_LIMIT[1])  # SECONDS UNTIL ONE MORE ATTEMPT IS EARNED
+kdf_slots = threading.BoundedSemaphore(ADMIN_KDF_CONCURRENCY)
+login_buckets = SQLiteBackend(ADMIN_LOGIN_DB)  # SHARED BY EVERY WORKER ON THE HOST
+
+
+def HashPassword(password, method=ADMIN_KDF):
+    return generate_password_hash(password, method=method)
+
+
+def LoadPasswordHash():
+    if ADMIN_PASSWORD_HASH:
+        return ADMIN_PASSWORD_HASH
+    plaintext = os.environ.get("ADMIN_PASSWORD")
+    if plaintext:
+        print("⚠️ ADMIN_PASSWORD is plaintext - set ADMIN_PASSWORD_HASH (python admin_auth.py hash) instead")
+        return HashPassword(plaintext)
+    print("⚠️ No ADMIN_PASSWORD_HASH or ADMIN_PASSWORD set - admin login disabled")
+    return None
+
+
+def SessionStamp():
+    """Derived from the configured secret, never from password_hash - a plaintext fallback is salted per process"""
+    configured = ADMIN_PASSWORD_HASH or os.environ.get("ADMIN_PASSWORD")
+    if not configured:
+        return None
+    secret = (os.environ.get("SECRET_KEY") or "").encode()
+    return hmac.new(secret, configured.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+password_hash = LoadPasswordHash()
+session_stamp = SessionStamp()  # CHANGES WHENEVER THE PASSWORD OR SECRET_KEY DOES - OLD SESSIONS STOP MATCHING
+
+
+# ---------- LOGIN ----------
+def LoginThrottled(ip):
+    """Seconds the client must wait before another attempt, or 0 if it may try now"""
+    try:
+        if login_buckets.Take(f"admin-login:{ip}", *LOGIN_LIMIT, time.time()):
+            return 0
+    except Exception as e:
+        print(f"❌ Login throttle error (allowing attempt): {e}")
+        return 0
+    print(f"⚠️ Throttled admin login attempt from {ip}")
+    return LOGIN_RETRY_AFTER
+
+
+def CheckPassword(password):
+    """The expensive KDF check - returns None when too many are already running in this worker"""
+    if not password_hash or not password:
+        return False
+    if not kdf_slots.acquire(timeout=1):
+        return None
+    try:
+        return check_password_hash(password_hash, password)
+    finally:
+        kdf_slots.release()
+
+
+# ---------- SESSIONS ----------
+def StartSession(session):
+    session.clear()  # NO FIXATION - NOTHING FROM THE ANONYMOUS SESSION CARRIES OVER
+    session['admin_logged_in'] = True
+    session['admin_stamp'] = session_stamp
+    session['admin_since'] = int(time.time())
+
+
+def ValidSession(session):
+    """Cheap per-request check: right stamp and not expired. No KDF, no database"""
+    stamp = session.get('admin_stamp')
+    if not stamp or not session_stamp or not hmac.compare_digest(stamp, session_stamp):
+        return False
+    return time.time() - session.get('admin_since', 0) < ADMIN_SESSION_HOURS * 3600
+
+
+def EndSession(session):
+    for key in ('admin_logged_in', 'admin_stamp', 'admin_since'):
+        if key in session:  # WITHOUT SECRET_KEY FLASK GIVES A READ-ONLY NullSession - pop() WOULD RAISE
+            session.pop(key)
+
+
+def Main():
+    if sys.argv[1:] != ["hash"]:
+        print("Usage: python admin_auth.py hash   # prompts for a password, prints ADMIN_PASSWORD_HASH")
+        sys.exit(1)
+    password = getpass.getpass("Admin password: ")
+    if password != getpass.getpass("Again: "):
+        print("❌ Passwords don't match")
+        sys.exit(1)
+    start = time.perf_counter()
+    hashed = HashPassword(password)
+    print(f"# {ADMIN_KDF} took {(time.perf_counter() - start) * 1000:.0f} ms per check")
+    print(f"ADMIN_PASSWORD_HASH='{hashed}'")
+
+
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,165 @@
+import os
+import math
+import time
+import threading
+from collections import deque
+from flask import request, g
+
+# ============================================ ADMISSION CONTROL (BULKHEADS) ============================================
+# /convert IS CPU-BOUND AND THE ADMIN PAGES ARE DB-HEAVY; LEFT ALONE EITHER CAN TAKE EVERY THREAD IN A WORKER AND
+# STALL home/resume. EACH ROUTE CLASS GETS ITS OWN SLOTS AND A SHORT BOUNDED QUEUE:
+#   - A FREE SLOT ADMITS IMMEDIATELY
+#   - OTHERWISE WAIT IN THE QUEUE FOR UP TO max_wait SECONDS
+#   - QUEUE FULL OR WAITED TOO LONG -> 503 + Retry-After BEFORE THE BODY (E.G. AN UPLOAD) IS EVEN READ
+# SLOTS ARE HELD UNTIL THE RESPONSE IS FULLY SENT, SO STREAMED ADMIN PAGES AND send_file COUNT FOR THEIR WHOLE LIFE.
+# QUEUE WAIT GOES OUT IN A Server-Timing HEADER AND IS SUMMARISED AT /admin/bulkheads.
+# LIMITS ARE PER WORKER PROCESS - THEY ONLY MATTER WITH --threads / gthread / asgi.py, WHERE ONE PROCESS SERVES
+# MANY REQUESTS AT ONCE.
+#   BULKHEAD_<CLASS>=SLOTS:QUEUE:MAX_WAIT_SECONDS   (SLOTS 0 = UNLIMITED)
+
+BULKHEADS_ENABLED = os.environ.get("BULKHEADS_ENABLED", "1") != "0"
+BULKHEAD_SPECS = {
+    "convert": os.environ.get("BULKHEAD_CONVERT", f"{max(1, (os.cpu_count() or 2) // 2)}:4:30"),
+    "admin": os.environ.get("BULKHEAD_ADMIN", "4:8:5"),
+    "public": os.environ.get("BULKHEAD_PUBLIC", "0:0:0"),
+}
+# LONG-LIVED OR ALREADY-GUARDED PATHS THAT MUST NEVER WAIT BEHIND A SLOT
+BULKHEAD_EXEMPT = ("/static/", "/admin/events", "/admin/login", "/admin/logout", "/admin/bulkheads")
+WAIT_SAMPLES = 1000
+
+
+def RouteClass(path):
+    if path.startswith(BULKHEAD_EXEMPT):
+        return None
+    if path == "/convert":
+        return "convert"
+    if path.startswith("/admin"):
+        return "admin"
+    return "public"
+
+
+class Bulkhead:
+    def __init__(self, name, spec):
+        slots, queue, max_wait = spec.split(":")
+        self.name = name
+        self.slots = int(slots)
+        self.queue = int(queue)
+        self.max_wait = float(max_wait)
+        self.cond = threading.Condition()
+        self.in_use = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.hold_seconds = 1.0  # EWMA OF HOW LONG A REQUEST KEEPS ITS SLOT - DRIVES Retry-After
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+
+    def Acquire(self):
+        """Seconds spent queued, or None if rejected"""
+        start = time.monotonic()
+        with self.cond:
+            if self.in_use >= self.slots:
+                if self.waiting >= self.queue:
+                    self.rejected += 1
+                    return None
+                self.waiting += 1
+                try:
+                    admitted = self.cond.wait_for(lambda: self.in_use < self.slots, timeout=self.max_wait)
+                finally:
+                    self.waiting -= 1
+                if not admitted:
+                    self.rejected += 1
+                    return None
+            self.in_use += 1
+            self.admitted += 1
+            waited = time.monotonic() - start
+            self.waits.append(waited)
+        return waited
+
+    def Release(self, held):
+        with self.cond:
+            self.in_use -= 1
+            self.hold_seconds = 0.8 * self.hold_seconds + 0.2 * held
+            self.cond.notify()
+
+    def RetryAfter(self):
+        """Rough time until a new request would get in: queue ahead of it x average hold / slots"""
+        return max(1, math.ceil(self.hold_seconds * (self.waiting + 1) / self.slots))
+
+    def Stats(self):
+        with self.cond:
+            waits = sorted(self.waits)
+        pick = lambda q: round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 1) if waits else None
+        return {
+            "slots": self.slots,
+            "queue": self.queue,
+            "max_wait_s": self.max_wait,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_hold_ms": round(self.hold_seconds * 1000, 1),
+            "wait_p50_ms": pick(0.50),
+            "wait_p95_ms": pick(0.95),
+            "wait_max_ms": round(waits[-1] * 1000, 1) if waits else None,
+        }
+
+
+bulkheads = {name: Bulkhead(name, spec) for name, spec in BULKHEAD_SPECS.items()}
+
+
+class Ticket:
+    """One admitted request's slot - released exactly once, when the response is closed"""
+
+    def __init__(self, bulkhead, waited):
+        self.bulkhead = bulkhead
+        self.waited = waited
+        self.start = time.monotonic()
+        self.released = False
+
+    def Release(self):
+        if not self.released:
+            self.released = True
+            self.bulkhead.Release(time.monotonic() - self.start)
+
+
+def AdmitRequest():
+    """before_request hook - take a slot for this route class or reject with 503"""
+    bulkhead = bulkheads.get(RouteClass(request.path))
+    if bulkhead is None or bulkhead.slots <= 0:
+        return None
+    waited = bulkhead.Acquire()
+    if waited is None:
+        retry_after = bulkhead.RetryAfter()
+        print(f"⚠️ {bulkhead.name} bulkhead full - rejected {request.method} {request.path} (retry in {retry_after}s)")
+        return "Server busy. Please try again shortly.", 503, {"Retry-After": str(retry_after)}
+    g.bulkhead_ticket = Ticket(bulkhead, waited)
+    return None
+
+
+def ReleaseOnClose(response):
+    """after_request hook - keep the slot until the (possibly streamed) body is sent"""
+    ticket = g.pop("bulkhead_ticket", None)
+    if ticket is not None:
+        response.headers.add("Server-Timing", f'queue;dur={ticket.waited * 1000:.1f};desc="{ticket.bulkhead.name}"')
+        response.call_on_close(ticket.Release)
+    return response
+
+
+def ReleaseOnError(error=None):
+    """teardown hook - a request that raised never reached after_request"""
+    ticket = g.pop("bulkhead_ticket", None)
+    if ticket is not None:
+        ticket.Release()
+
+
+def BulkheadStats():
+    return {name: bulkhead.Stats() for name, bulkhead in bulkheads.items()}
+
+
+def Bulkheads(app):
+    """Register per-route-class admission control on a Flask app"""
+    if BULKHEADS_ENABLED:
+        app.before_request(AdmitRequest)
+        app.after_request(ReleaseOnClose)
+        app.teardown_request(ReleaseOnError)
+    return app
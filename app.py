@@ -1,21 +1,20 @@
 import pandas as pd
 from datetime import datetime
-from flask import Flask, render_template, request, redirect, url_for, session, flash, send_file
+from flask import Flask, render_template, stream_template, request, redirect, url_for, session, flash, send_file, send_from_directory, get_flashed_messages
 import os
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from threading import Thread
 from functools import wraps
 import uuid
-import subprocess
+import time
+from markupsafe import Markup, escape
 
 from db_helpers import (
     NewContactSubmission, 
     UpdateContactStatus,
     GetContactSubmissions, 
     NewWishlistItem,
-    GetWishlist,
+    GetWishlistSummary,
     update_wishlist_status,
     update_wishlist_notes,
     delete_wishlist_item_db,
@@ -23,52 +22,127 @@ from db_helpers import (
     submit_app_request,
     update_app_request_notes,
     update_app_request_status,
-    get_all_app_requests,
     get_app_request_stats,
+    get_app_requests_page,
+    bulk_update_app_requests,
     archive_app_request_db,
+    APP_REQUEST_STATUSES,
+    APP_REQUESTS_PER_PAGE,
     NewSupportTicket,
     GetSupportTickets,
     NewGameFeedback,
-    GetGameFeedback
+    GetGameFeedback,
+    CountByStatus,
+    StreamContactSubmissions,
+    StreamSupportTickets,
+    StreamGameFeedback,
+    StreamWishlist,
+    SearchSubmissions,
+    SEARCH_HIGHLIGHT_START,
+    SEARCH_HIGHLIGHT_STOP,
+    GetHistory,
+    GetHistoryCounts
 )
+from page_cache import CachedPage
+from template_cache import ConfigureTemplateCache, WarmTemplates, TEMPLATE_WARMUP
+from compression import Compress
+from admission import Bulkheads, BulkheadStats
+import profiling
+from audio_convert import ConvertFile, ConversionError, HasAllowedExtension
+from spool import SubmitOrInsert, spool
+from db_resilience import breaker, query_stats
+from email_digest import DigestScheduler, EMAIL_DIGEST_WINDOW
+from email_render import RenderEmail, RenderDigest
+from live_updates import EventStream, LIVE_UPDATES_ENABLED
+from archive import RunArchival, StartArchiveSchedule, ARCHIVE_POLICIES, ARCHIVE_RETENTION_DAYS
+from rate_limit import CheckSubmission, ForgetSubmission, ClientIP, RATE_LIMITED, DUPLICATE
+from admin_auth import LoginThrottled, CheckPassword, StartSession, ValidSession, EndSession
 
 app = Flask(__name__)
+ConfigureTemplateCache(app)
+Compress(app)
+Bulkheads(app)
+profiling.Profiling(app)
 
 # ============================================ ENVIRONMENTAL VARIABLES ============================================
 app.secret_key = os.environ.get("SECRET_KEY")  
+app.config.update(SESSION_COOKIE_HTTPONLY=True, SESSION_COOKIE_SAMESITE="Lax")
 SENDER_EMAIL = os.environ.get("SENDER_EMAIL")  
 EMAIL_PASSWORD = os.environ.get("EMAIL_PASSWORD")  
 RECEIVE_INBOX = os.environ.get("RECEIVE_EMAIL")
-ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD")
+SMTP_HOST = os.environ.get("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", 587))
+SMTP_SSL_PORT = int(os.environ.get("SMTP_SSL_PORT", 465))
+SMTP_STARTTLS = os.environ.get("SMTP_STARTTLS", "1") != "0"
+STREAM_CHUNK_SIZE = int(os.environ.get("STREAM_CHUNK_SIZE", 8192))
+
+# ============================================ DEGRADED MODE ============================================
+@app.context_processor
+def DatabaseStatus():
+    """Lets base.html warn admins that empty pages mean 'database down', not 'no data'"""
+    return {'db_degraded': breaker.IsOpen(), 'spool_pending': spool.Pending}
 
 # ============================================ ADMIN DECORATOR ============================================
 def AdminRequired(f):
     @wraps(f)
     def Decorated(*args, **kwargs):
-        if not session.get('admin_logged_in'):
+        if not ValidSession(session):  # SIGNED-COOKIE STAMP + AGE - NO KDF, NO DB (admin_auth.py)
+            EndSession(session)
             return redirect(url_for('admin_login'))
         return f(*args, **kwargs)
     return Decorated
 
+# ============================================ STREAMED ADMIN PAGES ============================================
+def WantsStream():
+    """Admin list pages stream the full history when called with ?stream=1"""
+    return request.args.get('stream') == '1'
+
+def StreamAdminPage(template_name, **context):
+    """Render a template as a chunked stream so the first rows reach the browser immediately"""
+    # POP FLASHES NOW - THE SESSION COOKIE IS SENT WITH THE HEADERS, BEFORE THE TEMPLATE RUNS
+    get_flashed_messages(with_categories=True)
+
+    def Buffered(chunks):
+        buffer = []
+        size = 0
+        for chunk in chunks:
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= STREAM_CHUNK_SIZE:
+                yield "".join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield "".join(buffer)
+
+    return app.response_class(Buffered(stream_template(template_name, streaming=True, **context)), mimetype="text/html")
+
 # ============================================ EMAIL FUNCTIONS ============================================
-def SendSMTP(message):
+def SendSMTP(email):
+    """Send a pre-rendered OutgoingEmail - the serialized bytes are reused for the SSL fallback"""
     try:
-        server = smtplib.SMTP("smtp.gmail.com", 587, timeout=10)
-        server.starttls()
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=10)
+        if SMTP_STARTTLS:
+            server.starttls()
         server.login(SENDER_EMAIL, EMAIL_PASSWORD)
-        server.sendmail(message["From"], message["To"], message.as_string())
+        server.sendmail(email.sender, email.recipient, email.payload)
         server.quit()
         return True, None
     except Exception as e1:
         try:
-            server = smtplib.SMTP_SSL("smtp.gmail.com", 465, timeout=10)
+            server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_SSL_PORT, timeout=10)
             server.login(SENDER_EMAIL, EMAIL_PASSWORD)
-            server.sendmail(message["From"], message["To"], message.as_string())
+            server.sendmail(email.sender, email.recipient, email.payload)
             server.quit()
             return True, None
         except Exception as e2:
             return False, f"587 error: {e1}; 465 error: {e2}"
 
+def BuildEmail(kind, data):
+    """Render a notification ('contact', 'support' or 'review') from templates/email/"""
+    return RenderEmail(kind, data, SENDER_EMAIL, RECEIVE_INBOX)
+
+
 def SendContactEmail(UserInput):
     """Send email for contact form submissions"""
     try:
@@ -76,23 +150,7 @@ def SendContactEmail(UserInput):
         if not SENDER_EMAIL or not EMAIL_PASSWORD:
             raise RuntimeError("Email settings not configured")
 
-        message = MIMEMultipart("alternative")
-        subject = f"📬 CONTACT FORM: {UserInput.get('HumanName')}"
-        message["Subject"] = subject
-        message["From"] = SENDER_EMAIL
-        message["To"] = RECEIVE_INBOX
-
-        text = (
-            f"📬 NEW CONTACT FORM SUBMISSION!\n\n"
-            f"Name: {UserInput.get('HumanName')}\n"
-            f"Email: {UserInput.get('EmailAddy')}\n\n"
-            f"Message:\n{UserInput.get('message')}\n\n"
-            f"Timestamp: {UserInput.get('timestamp')}\n"
-        )
-        part = MIMEText(text, "plain")
-        message.attach(part)
-
-        ok, err = SendSMTP(message)
+        ok, err = SendSMTP(BuildEmail("contact", UserInput))
         if ok:
             print(f"✅ Contact email sent successfully for {UserInput.get('HumanName')}")
         else:
@@ -108,24 +166,7 @@ def SendSupportEmail(support_data):
         if not SENDER_EMAIL or not EMAIL_PASSWORD:
             raise RuntimeError("Email settings not configured")
 
-        message = MIMEMultipart("alternative")
-        subject = f"🆘 SUPPORT REQUEST: {support_data.get('page', 'Unknown Page')}"
-        message["Subject"] = subject
-        message["From"] = SENDER_EMAIL
-        message["To"] = RECEIVE_INBOX
-
-        text = (
-            f"🆘 NEW SUPPORT REQUEST!\n\n"
-            f"Name: {support_data.get('name')}\n"
-            f"Email: {support_data.get('email', 'Not provided')}\n"
-            f"Affected Page: {support_data.get('page')}\n\n"
-            f"Issue Description:\n{support_data.get('issue')}\n\n"
-            f"Timestamp: {support_data.get('timestamp')}\n"
-        )
-        part = MIMEText(text, "plain")
-        message.attach(part)
-
-        ok, err = SendSMTP(message)
+        ok, err = SendSMTP(BuildEmail("support", support_data))
         if ok:
             print(f"✅ Support email sent successfully for {support_data.get('name')}")
         else:
@@ -141,25 +182,7 @@ def SendGameFeedbackEmail(feedback_data):
         if not SENDER_EMAIL or not EMAIL_PASSWORD:
             raise RuntimeError("Email settings not configured")
 
-        message = MIMEMultipart("alternative")
-        stars_visual = "⭐" * feedback_data.get('stars', 0)
-        subject = f"🎮 GAME REVIEW: {stars_visual} from {feedback_data.get('name')}"
-        message["Subject"] = subject
-        message["From"] = SENDER_EMAIL
-        message["To"] = RECEIVE_INBOX
-
-        text = (
-            f"🎮 NEW CATASTROPHE GAME REVIEW!\n\n"
-            f"Name: {feedback_data.get('name')}\n"
-            f"Email: {feedback_data.get('email', 'Not provided')}\n"
-            f"Rating: {stars_visual} ({feedback_data.get('stars')}/5)\n\n"
-            f"Review:\n{feedback_data.get('review')}\n\n"
-            f"Timestamp: {feedback_data.get('timestamp')}\n"
-        )
-        part = MIMEText(text, "plain")
-        message.attach(part)
-
-        ok, err = SendSMTP(message)
+        ok, err = SendSMTP(BuildEmail("review", feedback_data))
         if ok:
             print(f"✅ Game feedback email sent successfully for {feedback_data.get('name')}")
         else:
@@ -168,18 +191,51 @@ def SendGameFeedbackEmail(feedback_data):
         print(f"❌ Game Feedback Email Error: {type(e).__name__}: {e}")
 
 
+# ===== DIGEST MODE =====
+EMAIL_SENDERS = {
+    "contact": SendContactEmail,
+    "support": SendSupportEmail,
+    "review": SendGameFeedbackEmail,
+}
+
+def SendDigestEmail(items):
+    """Send a batch of notifications in a single SMTP session"""
+    try:
+        if not SENDER_EMAIL or not EMAIL_PASSWORD:
+            raise RuntimeError("Email settings not configured")
+
+        ok, err = SendSMTP(RenderDigest(items, SENDER_EMAIL, RECEIVE_INBOX))
+        if ok:
+            print(f"✅ Digest email sent with {len(items)} notifications")
+        else:
+            print(f"❌ Digest Email Error: {err}")
+    except Exception as e:
+        print(f"❌ Digest Email Error: {type(e).__name__}: {e}")
+
+def SendSingleEmail(kind, data):
+    EMAIL_SENDERS[kind](data)
+
+digest = DigestScheduler(SendSingleEmail, SendDigestEmail) if EMAIL_DIGEST_WINDOW > 0 else None
+
+
 # Async wrappers
 def SendContactEmailAsync(submission):
+    if digest and digest.Add("contact", submission):
+        return
     thread = Thread(target=SendContactEmail, args=(submission,))
     thread.daemon = True
     thread.start()
 
 def SendSupportEmailAsync(support_data):
+    if digest and digest.Add("support", support_data):
+        return
     thread = Thread(target=SendSupportEmail, args=(support_data,))
     thread.daemon = True
     thread.start()
 
 def SendGameFeedbackEmailAsync(feedback_data):
+    if digest and digest.Add("review", feedback_data):
+        return
     thread = Thread(target=SendGameFeedbackEmail, args=(feedback_data,))
     thread.daemon = True
     thread.start()
@@ -188,31 +244,75 @@ def SendGameFeedbackEmailAsync(feedback_data):
 
 
 
+# ============================================ FORM PARSING ============================================
+# SHARED BY THE FLASK ROUTES AND THE ASGI FORM HANDLERS (asgi.py)
+def ContactFromForm(form):
+    return {
+        "HumanName": form.get("HumanName"),
+        "EmailAddy": form.get("EmailAddy"),
+        "message": form.get("message"),
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def SupportFromForm(form):
+    return {
+        "name": form.get("name"),
+        "email": form.get("email"),
+        "page": form.get("page"),
+        "issue": form.get("issue"),
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def FeedbackFromForm(form):
+    return {
+        "name": form.get("name"),
+        "email": form.get("email", ""),
+        "stars": int(form.get("stars")),
+        "review": form.get("review"),
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+RATE_LIMIT_MESSAGE = "Too many submissions - please wait a few minutes and try again."
+
+def GuardSubmission(kind, email, data):
+    """Rate limit / duplicate check for a public form post - returns (verdict, content_hash)"""
+    ip = ClientIP(request.remote_addr, request.headers.get("X-Forwarded-For"))
+    return CheckSubmission(kind, ip, email, data)
+
+
 # ============================================ PUBLIC PAGE ROUTES ============================================
 @app.route("/")
+@CachedPage("about.html")
 def home():
     return render_template("about.html")
 
 @app.route("/resume")
+@CachedPage("resume.html")
 def resume():
     return render_template("resume.html")
 
 # ============================================ CONTACT FORM ============================================
 @app.route("/contact", methods=["GET", "POST"])
+@CachedPage("contact.html")
 def contact():
     if request.method == "POST":
-        NewRequest = {
-            "HumanName": request.form.get("HumanName"),
-            "EmailAddy": request.form.get("EmailAddy"),
-            "message": request.form.get("message"),
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        NewRequest = ContactFromForm(request.form)
         
-        if NewContactSubmission(NewRequest):
+        verdict, content_hash = GuardSubmission("contact", NewRequest.get("EmailAddy"), NewRequest)
+        if verdict == RATE_LIMITED:
+            flash(RATE_LIMIT_MESSAGE, "error")
+            return redirect(url_for("contact"))
+        if verdict == DUPLICATE:  # ALREADY SAVED - ANSWER AS IF IT WENT THROUGH
+            flash("Message sent successfully!", "success")
+            return redirect(url_for("contact"))
+
+        if SubmitOrInsert("contact_me", NewRequest, NewContactSubmission):
             SendContactEmailAsync(NewRequest)
             flash("Message sent successfully!", "success")
             return redirect(url_for("contact"))
         else:
+            ForgetSubmission(content_hash)
             flash("Error saving contact submission", "error")
             return redirect(url_for("contact"))
     
@@ -221,21 +321,25 @@ def contact():
 
 # ============================================ SUPPORT FORM ============================================
 @app.route("/support", methods=["GET", "POST"])
+@CachedPage("support.html")
 def support():
     if request.method == "POST":
-        new_support = {
-            "name": request.form.get("name"),
-            "email": request.form.get("email"),
-            "page": request.form.get("page"),
-            "issue": request.form.get("issue"),
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        new_support = SupportFromForm(request.form)
         
-        if NewSupportTicket(new_support):
+        verdict, content_hash = GuardSubmission("support", new_support.get("email"), new_support)
+        if verdict == RATE_LIMITED:
+            flash(RATE_LIMIT_MESSAGE, "error")
+            return redirect(url_for("support"))
+        if verdict == DUPLICATE:  # ALREADY SAVED - ANSWER AS IF IT WENT THROUGH
+            flash("Support request submitted! We'll get back to you soon.", "success")
+            return redirect(url_for("support"))
+
+        if SubmitOrInsert("support", new_support, NewSupportTicket):
             SendSupportEmailAsync(new_support)
             flash("Support request submitted! We'll get back to you soon.", "success")
             return redirect(url_for("support"))
         else:
+            ForgetSubmission(content_hash)
             flash("Error submitting support request", "error")
             return redirect(url_for("support"))
     
@@ -244,21 +348,25 @@ def support():
 
 # ============================================ GAME FEEDBACK/REVIEWS ============================================
 @app.route("/review", methods=["GET", "POST"])
+@CachedPage("review.html")
 def review():
     if request.method == "POST":
-        feedback = {
-            "name": request.form.get("name"),
-            "email": request.form.get("email", ""),
-            "stars": int(request.form.get("stars")),
-            "review": request.form.get("review"),
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-
-        if NewGameFeedback(feedback):
+        feedback = FeedbackFromForm(request.form)
+
+        verdict, content_hash = GuardSubmission("review", feedback.get("email"), feedback)
+        if verdict == RATE_LIMITED:
+            flash(RATE_LIMIT_MESSAGE, "error")
+            return redirect(url_for("review"))
+        if verdict == DUPLICATE:  # ALREADY SAVED - ANSWER AS IF IT WENT THROUGH
+            flash("⭐ Thanks for your feedback! You're pawsome!", "success")
+            return redirect(url_for("review"))
+
+        if SubmitOrInsert("game_feedback", feedback, NewGameFeedback):
             SendGameFeedbackEmailAsync(feedback)
             flash("⭐ Thanks for your feedback! You're pawsome!", "success")
             return redirect(url_for("review"))
         else:
+            ForgetSubmission(content_hash)
             flash("❌ Error submitting feedback. Please try again.", "error")
             return redirect(url_for("review"))
 
@@ -269,55 +377,106 @@ def review():
 @app.route("/admin/login", methods=["GET", "POST"])
 def admin_login():
     if request.method == "POST":
-        password = request.form.get("password")
-        if password == ADMIN_PASSWORD:
-            session['admin_logged_in'] = True
+        # THROTTLE BEFORE THE KDF - A LOCKED-OUT GUESS COSTS ONE BUCKET LOOKUP AND NO TEMPLATE
+        retry_after = LoginThrottled(ClientIP(request.remote_addr, request.headers.get("X-Forwarded-For")))
+        if retry_after:
+            return "Too many login attempts. Try again later.", 429, {"Retry-After": str(retry_after)}
+
+        verdict = CheckPassword(request.form.get("password"))
+        if verdict is None:
+            return "Login busy. Try again shortly.", 503, {"Retry-After": "1"}
+        if verdict:
+            StartSession(session)
             flash("Login successful!", "success")
             return redirect(url_for('admin_dashboard'))
         else:
             flash("Invalid password", "error")
-            return render_template("admin_login.html")
+            return render_template("admin_login.html"), 401
     
     return render_template("admin_login.html")
 
 @app.route("/admin/logout")
 def admin_logout():
-    session.pop('admin_logged_in', None)
+    EndSession(session)
     flash("Logged out successfully", "success")
     return redirect(url_for('home'))
 
 @app.route("/admin")
 @AdminRequired
 def admin_dashboard():
-    contacts = GetContactSubmissions()
-    support_tickets = GetSupportTickets()
-    game_feedback = GetGameFeedback()
-    
-    unread_contacts = sum(1 for c in contacts if c.get('status') == 'unread')
-    new_support = sum(1 for s in support_tickets if s.get('status') == 'new')
-    new_feedback = sum(1 for f in game_feedback if f.get('status') == 'new')
-    
+    # COUNTS IN SQL, AND ONLY THE FIVE ROWS PER TABLE THE DASHBOARD ACTUALLY SHOWS
     stats = {
-        'unread_contacts': unread_contacts,
-        'recent_contacts': contacts[:5],
-        'new_support_tickets': new_support,
-        'recent_support': support_tickets[:5],
-        'new_game_feedback': new_feedback,
-        'recent_feedback': game_feedback[:5]
+        'unread_contacts': CountByStatus('contact_me').get('unread', 0),
+        'recent_contacts': GetContactSubmissions(limit=5),
+        'new_support_tickets': CountByStatus('support').get('new', 0),
+        'recent_support': GetSupportTickets(limit=5),
+        'new_game_feedback': CountByStatus('game_feedback').get('new', 0),
+        'recent_feedback': GetGameFeedback(limit=5),
+        'new_app_requests': get_app_request_stats()['new_requests']
     }
 
-    return render_template("admin_dashboard.html", stats=stats)
+    return render_template("admin_dashboard.html", stats=stats, live_updates=LIVE_UPDATES_ENABLED)
+
+@app.route('/admin/events')
+@AdminRequired
+def admin_events():
+    """Server-sent events for the dashboard: new rows and status changes as they are committed"""
+    if not LIVE_UPDATES_ENABLED:
+        return "", 204
+    return app.response_class(
+        EventStream(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+# ===== SEARCH =====
+SEARCH_SOURCE_PAGES = {
+    'contact': 'admin_messages_suggestions',
+    'support': 'admin_support',
+    'review': 'admin_game_feedback',
+    'wishlist': 'admin_wishlist'
+}
+
+@app.template_filter('highlight')
+def HighlightSnippet(snippet):
+    """Escape a search snippet, then turn the ts_headline markers into <mark> tags"""
+    escaped = str(escape(snippet or ''))
+    return Markup(escaped.replace(SEARCH_HIGHLIGHT_START, '<mark>').replace(SEARCH_HIGHLIGHT_STOP, '</mark>'))
+
+@app.route('/admin/search')
+@AdminRequired
+def admin_search():
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+
+    start = time.perf_counter()
+    search = SearchSubmissions(query, page)
+    elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    return render_template('admin_search.html',
+                         query=query,
+                         search=search,
+                         elapsed_ms=elapsed_ms,
+                         source_pages=SEARCH_SOURCE_PAGES)
 
 # ===== MESSAGES AND SUGGESTIONS =====
 @app.route('/admin/messages-suggestions')
 @AdminRequired
 def admin_messages_suggestions():
     try:
+        if WantsStream():
+            counts = CountByStatus('contact_me')
+            return StreamAdminPage('admin_messages_suggestions.html',
+                                   contacts=StreamContactSubmissions(),
+                                   contact_count=counts['total'],
+                                   unread_contacts=counts.get('unread', 0))
+
         contacts = GetContactSubmissions()
-        unread_contacts = sum(1 for c in contacts if c['status'] == 'unread')
+        unread_contacts = sum(1 for c in contacts if c.status == 'unread')
         
         return render_template('admin_messages_suggestions.html', 
                              contacts=contacts, 
+                             contact_count=len(contacts),
                              unread_contacts=unread_contacts)
     except Exception as e:
         flash(f'Error loading data: {str(e)}', 'error')
@@ -339,11 +498,19 @@ def update_contact_submission_status(submission_id, status):
 @AdminRequired
 def admin_support():
     try:
+        if WantsStream():
+            counts = CountByStatus('support')
+            return StreamAdminPage('admin_support.html',
+                                   tickets=StreamSupportTickets(),
+                                   total_count=counts['total'],
+                                   new_count=counts.get('new', 0))
+
         tickets = GetSupportTickets()
-        new_count = sum(1 for t in tickets if t.get('status') == 'new')
+        new_count = sum(1 for t in tickets if t.status == 'new')
         
         return render_template('admin_support.html', 
                              tickets=tickets,
+                             total_count=len(tickets),
                              new_count=new_count)
     except Exception as e:
         flash(f'Error loading support tickets: {str(e)}', 'error')
@@ -368,11 +535,19 @@ def update_support_status(ticket_id, status):
 @AdminRequired
 def admin_game_feedback():
     try:
+        if WantsStream():
+            counts = CountByStatus('game_feedback')
+            return StreamAdminPage('admin_game_feedback.html',
+                                   feedback=StreamGameFeedback(),
+                                   total_count=counts['total'],
+                                   new_count=counts.get('new', 0))
+
         feedback = GetGameFeedback()
-        new_count = sum(1 for f in feedback if f.get('status') == 'new')
+        new_count = sum(1 for f in feedback if f.status == 'new')
         
         return render_template('admin_game_feedback.html',
                              feedback=feedback,
+                             total_count=len(feedback),
                              new_count=new_count)
     except Exception as e:
         flash(f'Error loading game feedback: {str(e)}', 'error')
@@ -422,12 +597,82 @@ def add_feedback_to_wishlist(feedback_id):
     return redirect(url_for('admin_game_feedback'))
 
 
-# ===== APP REQUESTS (PLACEHOLDER) =====
+# ===== APP REQUESTS =====
+def AppRequestsRedirect():
+    """Back to the listing, keeping the filter and page the action was submitted from"""
+    return redirect(url_for('admin_app_requests',
+                            status=request.args.get('filter'),
+                            page=request.args.get('page')))
+
 @app.route('/admin/app_requests')
 @AdminRequired
 def admin_app_requests():
-    flash('App/Website requests feature coming soon!', 'info')
-    return redirect(url_for('admin_dashboard'))
+    filter_status = request.args.get('status')
+    if filter_status not in APP_REQUEST_STATUSES:
+        filter_status = None
+    page = max(request.args.get('page', 1, type=int), 1)
+
+    stats = get_app_request_stats()
+    matching = stats[f'{filter_status}_requests'] if filter_status else stats['total_requests']
+
+    return render_template('admin_app_requests.html',
+                         app_requests=get_app_requests_page(filter_status, page),
+                         stats=stats,
+                         statuses=APP_REQUEST_STATUSES,
+                         filter_status=filter_status,
+                         page=page,
+                         per_page=APP_REQUESTS_PER_PAGE,
+                         matching=matching)
+
+@app.route('/admin/app_requests/<int:request_id>/status/<status>', methods=['POST'])
+@AdminRequired
+def update_app_request_status_route(request_id, status):
+    if status not in APP_REQUEST_STATUSES:
+        flash(f'Unknown status: {status}', 'error')
+    elif update_app_request_status(request_id, status):
+        flash(f'Request marked as {status.replace("_", " ")}!', 'success')
+    else:
+        flash('Error updating status', 'error')
+    return AppRequestsRedirect()
+
+@app.route('/admin/app_requests/<int:request_id>/notes', methods=['POST'])
+@AdminRequired
+def update_app_request_notes_route(request_id):
+    if update_app_request_notes(request_id, request.form.get('notes', '')):
+        flash('Notes updated!', 'success')
+    else:
+        flash('Error updating notes', 'error')
+    return AppRequestsRedirect()
+
+@app.route('/admin/app_requests/<int:request_id>/archive', methods=['POST'])
+@AdminRequired
+def archive_app_request(request_id):
+    if archive_app_request_db(request_id):
+        flash('Request archived successfully!', 'success')
+    else:
+        flash('Error archiving request', 'error')
+    return AppRequestsRedirect()
+
+@app.route('/admin/app_requests/bulk', methods=['POST'])
+@AdminRequired
+def bulk_app_requests():
+    """Triage every checked request at once: 'archive' or 'status:<status>'"""
+    request_ids = request.form.getlist('request_ids', type=int)
+    action = request.form.get('action', '')
+    if not request_ids:
+        flash('Select at least one request first.', 'error')
+        return AppRequestsRedirect()
+
+    if action == 'archive':
+        changed = bulk_update_app_requests(request_ids, archive=True)
+        flash(f'Archived {changed} requests!', 'success')
+    elif action.startswith('status:') and action[7:] in APP_REQUEST_STATUSES:
+        status = action[7:]
+        changed = bulk_update_app_requests(request_ids, status=status)
+        flash(f'Marked {changed} requests as {status.replace("_", " ")}!', 'success')
+    else:
+        flash(f'Unknown action: {action}', 'error')
+    return AppRequestsRedirect()
 
 
 # ======= WISHLIST ======
@@ -435,24 +680,29 @@ def admin_app_requests():
 @AdminRequired
 def admin_wishlist():
     filter_status = request.args.get('filter_status')
+
+    # COUNTS COME FROM THE wishlist_status_counts COUNTER TABLE - NO SECOND FULL FETCH TO COUNT IN PYTHON
+    summary = GetWishlistSummary(filter_status, include_items=not WantsStream())
+    counts = summary['counts']
+    status_counts = dict(all_count=counts['total'],
+                         not_started_count=counts['not_started'],
+                         in_progress_count=counts['in_progress'],
+                         completed_count=counts['completed'],
+                         revisiting_count=counts['revisiting'])
+
+    if WantsStream():
+        return StreamAdminPage("admin_wishlist.html",
+                               wishlist_items=StreamWishlist(filter_status),
+                               item_count=counts.get(filter_status, 0) if filter_status else counts['total'],
+                               filter_status=filter_status,
+                               **status_counts)
     
-    wishlist_items = GetWishlist(filter_status)
-    
-    all_items = GetWishlist()
-    all_count = len(all_items)
-    not_started_count = sum(1 for item in all_items if item['status'] == 'not_started')
-    in_progress_count = sum(1 for item in all_items if item['status'] == 'in_progress')
-    completed_count = sum(1 for item in all_items if item['status'] == 'completed')
-    revisiting_count = sum(1 for item in all_items if item['status'] == 'revisiting')
-    
+    wishlist_items = summary['items']
     return render_template("admin_wishlist.html", 
                          wishlist_items=wishlist_items,
+                         item_count=len(wishlist_items),
                          filter_status=filter_status,
-                         all_count=all_count,
-                         not_started_count=not_started_count,
-                         in_progress_count=in_progress_count,
-                         completed_count=completed_count,
-                         revisiting_count=revisiting_count)
+                         **status_counts)
 
 @app.route("/admin/wishlist/add", methods=["POST"])
 @AdminRequired
@@ -516,9 +766,107 @@ def delete_wishlist_item(wishlist_id):
     
     return redirect(url_for('admin_wishlist'))
 
+# ===== HISTORY (ARCHIVED ROWS) =====
+@app.route('/admin/history')
+@AdminRequired
+def admin_history():
+    source = request.args.get('source', '')
+    if source not in ARCHIVE_POLICIES:
+        source = ''
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+
+    return render_template('admin_history.html',
+                         source=source,
+                         query=query,
+                         history=GetHistory(source, query, page),
+                         counts={count['source']: count for count in GetHistoryCounts()},
+                         policies=ARCHIVE_POLICIES,
+                         retention_days=ARCHIVE_RETENTION_DAYS)
+
+@app.route('/admin/history/run', methods=['POST'])
+@AdminRequired
+def run_archival():
+    report = RunArchival()
+    if report is None:
+        flash('Archival is already running (or the database is unavailable).', 'error')
+    else:
+        moved = sum(r['moved'] for r in report.values())
+        purged = sum(r['purged'] for r in report.values())
+        flash(f'Archived {moved} rows, purged {purged} expired history rows.', 'success')
+    return redirect(url_for('admin_history'))
+
+
+# ===== ADMISSION CONTROL =====
+@app.route('/admin/bulkheads')
+@AdminRequired
+def admin_bulkheads():
+    """Per-route-class slots, queue depth, rejections and queue wait percentiles for this worker"""
+    return {'pid': os.getpid(), 'bulkheads': BulkheadStats()}
+
+
+# ===== PROFILING =====
+@app.route('/admin/profiling')
+@AdminRequired
+def admin_profiling():
+    return render_template('admin_profiling.html',
+                         pid=os.getpid(),
+                         header=profiling.PROFILE_HEADER,
+                         sampling=profiling.SamplingProfiler is not None,
+                         memory=profiling.TracemallocStatus(),
+                         files=profiling.ListProfiles(),
+                         snapshots=profiling.Snapshots(),
+                         queries=profiling.SlowQueryReport())
+
+@app.route('/admin/profiling/memory/<action>', methods=['POST'])
+@AdminRequired
+def profiling_memory(action):
+    if action == 'start':
+        profiling.TracemallocStart()
+        flash(f'tracemalloc started in worker {os.getpid()}.', 'success')
+    elif action == 'stop':
+        profiling.TracemallocStop()
+        flash(f'tracemalloc stopped in worker {os.getpid()}.', 'success')
+    elif action == 'snapshot':
+        name = profiling.TracemallocSnapshot()
+        if name:
+            flash(f'Saved snapshot {name}.', 'success')
+        else:
+            flash('Start tracemalloc before taking a snapshot.', 'error')
+    elif action == 'diff':
+        base, head = request.form.get('base', ''), request.form.get('head', '')
+        if base not in profiling.Snapshots() or head not in profiling.Snapshots():
+            flash('Pick two snapshots to compare.', 'error')
+        else:
+            return send_from_directory(profiling.PROFILE_DIR, profiling.TracemallocDiff(base, head), as_attachment=True)
+    return redirect(url_for('admin_profiling'))
+
+@app.route('/admin/profiling/queries/<action>', methods=['POST'])
+@AdminRequired
+def profiling_queries(action):
+    actions = {'start': (query_stats.Start, 'started'), 'stop': (query_stats.Stop, 'stopped'),
+               'reset': (query_stats.Reset, 'reset')}
+    if action not in actions:
+        return "Unknown action", 404
+    run, done = actions[action]
+    run()
+    flash(f'Query timing {done} in worker {os.getpid()}.', 'success')
+    return redirect(url_for('admin_profiling'))
+
+@app.route('/admin/profiling/queries.json')
+@AdminRequired
+def profiling_queries_download():
+    report = profiling.SlowQueryReport(request.args.get('n', 100, type=int))
+    return report, 200, {'Content-Disposition': f'attachment; filename=slow-queries-{os.getpid()}.json'}
+
+@app.route('/admin/profiling/files/<name>')
+@AdminRequired
+def profiling_download(name):
+    return send_from_directory(profiling.PROFILE_DIR, name, as_attachment=True)
 
 # ============================================ AUDIO CONVERTER ============================================
 @app.route("/audio-converter")
+@CachedPage("audio_converter.html")
 def audio_converter():
     return render_template("audio_converter.html")
 
@@ -530,8 +878,7 @@ def convert():
         return redirect(url_for('audio_converter'))
     
     filename = file.filename.lower() # CHECK FILE EXTENSION
-    allowed_extensions = ['.m4a', '.wav', '.flac', '.ogg', '.aac', '.wma']
-    if not any(filename.endswith(ext) for ext in allowed_extensions):
+    if not HasAllowedExtension(filename):
         flash("Invalid file type. Please upload an audio file.", "error")
         return redirect(url_for('audio_converter'))
     
@@ -550,18 +897,17 @@ def convert():
     try:
         file.save(input_path)
         
-        subprocess.run([ # CONVERT USING FFmpeg
-           "ffmpeg", "-i", input_path,
-           "-vn", "-ab", "192k", output_path
-           # r"C:\Users\mkb00\ffmpeg\bin\ffmpeg.exe", "-i", input_path,
-           # "-vn", "-ab", "192k", output_path
-        ], check=True, capture_output=True)
+        # PROBE (CACHED BY CONTENT HASH), CHECK DURATION, PICK SETTINGS, THEN FFmpeg UNDER A WATCHDOG (audio_convert.py)
+        info, estimate, elapsed = ConvertFile(input_path, output_path)
+        print(f"✅ Converted {info.duration or 0:.0f}s of {info.codec} audio in {elapsed:.1f}s (estimated {estimate:.1f}s)")
         
         response = send_file( # SERVE FILES FOR DOWNLOAD
             output_path, 
             as_attachment=True, 
             download_name=f"converted_{os.path.splitext(filename)[0]}.mp3"
         )
+        response.headers["X-Audio-Duration"] = f"{info.duration or 0:.1f}"
+        response.headers.add("Server-Timing", f'ffmpeg;dur={elapsed * 1000:.0f};desc="estimated {estimate:.1f}s"')
         
         @response.call_on_close # CLEAN UP TEMP FILES
         def cleanup():
@@ -575,8 +921,8 @@ def convert():
         
         return response
         
-    except subprocess.CalledProcessError as e:
-        flash(f"Conversion failed: {e}", "error") # CLEANUP ON ERROR
+    except ConversionError as e:
+        flash(str(e), "error") # CLEANUP ON ERROR
         if os.path.exists(input_path):
             os.remove(input_path)
         if os.path.exists(output_path):
@@ -586,6 +932,13 @@ def convert():
         flash(f"Error: {str(e)}", "error")
         return redirect(url_for('audio_converter'))
 
+# ============================================ TEMPLATE WARM-UP ============================================
+if TEMPLATE_WARMUP:
+    WarmTemplates(app)
+
+# ============================================ ARCHIVAL SCHEDULE ============================================
+StartArchiveSchedule()
+
 # ============================================ MAIN ============================================
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
@@ -0,0 +1,105 @@
+"""Hot/cold archival: move archived and old handled rows out of the live tables into archive_history.
+
+Run from cron (python archive.py [--purge-only]) or in-process with ARCHIVE_INTERVAL_HOURS > 0.
+Needs migrations/002_archive_history.sql.
+"""
+import os
+import json
+import time
+import argparse
+import threading
+from collections import namedtuple
+from db_helpers import ConnectToDB, ArchiveRows, PurgeHistory
+
+# ============================================ ARCHIVE POLICIES ============================================
+# where SELECTS ROWS THAT ARE DONE BEING WORKED ON; after_days (IF SET) IS BOUND AS %(days)s.
+#   ARCHIVE_CONTACT_AFTER_DAYS / ARCHIVE_SUPPORT_AFTER_DAYS - HOW LONG READ CONTACTS / RESOLVED TICKETS STAY HOT
+#   ARCHIVE_RETENTION_DAYS - HOW LONG HISTORY IS KEPT (0 = FOREVER)
+#   ARCHIVE_INTERVAL_HOURS - RUN INSIDE THE APP EVERY N HOURS (0 = OFF, USE CRON)
+
+ARCHIVE_CONTACT_AFTER_DAYS = int(os.environ.get("ARCHIVE_CONTACT_AFTER_DAYS", 90))
+ARCHIVE_SUPPORT_AFTER_DAYS = int(os.environ.get("ARCHIVE_SUPPORT_AFTER_DAYS", 90))
+ARCHIVE_RETENTION_DAYS = int(os.environ.get("ARCHIVE_RETENTION_DAYS", 730))
+ARCHIVE_INTERVAL_HOURS = float(os.environ.get("ARCHIVE_INTERVAL_HOURS", 0))
+ARCHIVE_BATCH_SIZE = int(os.environ.get("ARCHIVE_BATCH_SIZE", 1000))
+ARCHIVE_LOCK_KEY = 0x61726368  # pg_try_advisory_lock KEY - ONE ARCHIVER AT A TIME ACROSS WORKERS/CRON
+
+ArchivePolicy = namedtuple("ArchivePolicy", ["label", "id_column", "created_column", "where", "after_days"])
+
+ARCHIVE_POLICIES = {
+    "wishlist": ArchivePolicy("Wishlist", "wishlist_id", "created_at", "archived = TRUE", None),
+    "app_requests": ArchivePolicy("App Requests", "id", "time_submitted", "archived = TRUE", None),
+    "contact_me": ArchivePolicy(
+        "Contact Messages", "id", "timestamp",
+        "status = 'read' AND timestamp < NOW() - make_interval(days => %(days)s)",
+        ARCHIVE_CONTACT_AFTER_DAYS,
+    ),
+    "support": ArchivePolicy(
+        "Support Tickets", "id", "timestamp",
+        "status = 'resolved' AND timestamp < NOW() - make_interval(days => %(days)s)",
+        ARCHIVE_SUPPORT_AFTER_DAYS,
+    ),
+}
+
+
+def RunArchival(purge_only=False):
+    """Move every policy's rows to history, then apply retention - returns per-source counts"""
+    conn = ConnectToDB()
+    if not conn:
+        return None
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", (ARCHIVE_LOCK_KEY,))
+        if not cursor.fetchone()[0]:
+            print("⚠️ Archival already running elsewhere - skipping")
+            return None
+
+        start = time.perf_counter()
+        report = {}
+        for table, policy in ARCHIVE_POLICIES.items():
+            moved = 0
+            if not purge_only:
+                params = {"days": policy.after_days} if policy.after_days is not None else None
+                moved = ArchiveRows(table, policy.id_column, policy.created_column, policy.where,
+                                    params, ARCHIVE_BATCH_SIZE)
+            purged = PurgeHistory(table, ARCHIVE_RETENTION_DAYS) if ARCHIVE_RETENTION_DAYS > 0 else 0
+            report[table] = {"moved": moved, "purged": purged}
+
+        cursor.execute("SELECT pg_advisory_unlock(%s)", (ARCHIVE_LOCK_KEY,))
+        print(f"✅ Archival finished in {time.perf_counter() - start:.1f}s: {report}")
+        return report
+    finally:
+        conn.close()
+
+
+# ============================================ SCHEDULE ============================================
+def StartArchiveSchedule(interval_hours=ARCHIVE_INTERVAL_HOURS):
+    """Run RunArchival every interval_hours on a daemon timer (the advisory lock keeps workers from overlapping)"""
+    if interval_hours <= 0:
+        return None
+
+    def Tick():
+        try:
+            RunArchival()
+        except Exception as e:
+            print(f"❌ Scheduled archival failed: {e}")
+        Schedule()
+
+    def Schedule():
+        timer = threading.Timer(interval_hours * 3600, Tick)
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    return Schedule()
+
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--purge-only", action="store_true", help="only apply retention to existing history")
+    args = parser.parse_args()
+    print(json.dumps(RunArchival(args.purge_only), indent=2))
+
+
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,373 @@
+import os
+import json
+import asyncio
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qsl
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.http import dump_cookie
+import asgiref
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+
+try:
+    import asyncpg
+except ImportError:  # WITHOUT asyncpg THE SYNC HELPERS RUN IN A THREAD
+    asyncpg = None
+
+try:
+    import aiosmtplib
+except ImportError:  # WITHOUT aiosmtplib SendSMTP RUNS IN A THREAD
+    aiosmtplib = None
+
+from app import (
+    app as flask_app,
+    SENDER_EMAIL,
+    EMAIL_PASSWORD,
+    SMTP_HOST,
+    SMTP_PORT,
+    SMTP_SSL_PORT,
+    SMTP_STARTTLS,
+    SendSMTP,
+    ContactFromForm,
+    SupportFromForm,
+    FeedbackFromForm,
+    BuildEmail,
+    RATE_LIMIT_MESSAGE,
+    digest,
+)
+from rate_limit import CheckSubmission, ForgetSubmission, ClientIP, RATE_LIMITED, DUPLICATE
+from admin_auth import ValidSession
+from live_updates import hub, LoopSubscriber, FormatEvent, LIVE_UPDATES_ENABLED, SSE_HEARTBEAT_SECONDS
+import write_behind
+from spool import SubmitOrInsert, spool
+from db_resilience import breaker, DB_CONNECT_TIMEOUT, DB_STATEMENT_TIMEOUT_MS
+from db_helpers import (
+    NewContactSubmission,
+    NewSupportTicket,
+    NewGameFeedback,
+    SubmissionEvent,
+    NOTIFY_CHANNEL,
+    NOTIFY_KINDS,
+    DB_SETTINGS,
+)
+
+# ============================================ ASGI DEPLOYMENT MODE ============================================
+# POST /contact, /support AND /review ARE HANDLED ON THE EVENT LOOP (asyncpg + aiosmtplib), SO ONE PROCESS
+# CAN HOLD THOUSANDS OF SLOW CLIENTS AND IN-FLIGHT SUBMISSIONS. GET /admin/events (SSE) IS SERVED HERE TOO, FED BY
+# THE live_updates HUB, SO AN OPEN DASHBOARD TAB COSTS A QUEUE RATHER THAN A THREAD. EVERYTHING ELSE IS THE REGULAR
+# FLASK APP, RUN ON A POOL OF ASGI_WSGI_THREADS THREADS - asgiref's DEFAULT PUTS EVERY WSGI REQUEST ON ONE SHARED
+# THREAD, SO A SINGLE SLOW /convert OR ADMIN PAGE WOULD STALL THE WHOLE PROCESS.
+#   uvicorn asgi:application --host 0.0.0.0 --port 5000
+
+ASYNC_DB_POOL_MIN = int(os.environ.get("ASYNC_DB_POOL_MIN", 2))
+ASYNC_DB_POOL_MAX = int(os.environ.get("ASYNC_DB_POOL_MAX", 20))
+ASGI_WSGI_THREADS = int(os.environ.get("ASGI_WSGI_THREADS", 16))   # FLASK REQUESTS IN FLIGHT AT ONCE
+MAX_FORM_BYTES = int(os.environ.get("MAX_FORM_BYTES", 64 * 1024))
+
+wsgi_executor = ThreadPoolExecutor(max_workers=ASGI_WSGI_THREADS, thread_name_prefix="wsgi")
+
+
+def WsgiRunner():
+    """The plain function under asgiref's @sync_to_async run_wsgi_app - an asgiref internal (see requirements-async.txt)"""
+    runner = getattr(WsgiToAsgiInstance.__dict__.get("run_wsgi_app"), "func", None)
+    if not callable(runner):
+        raise ImportError(f"asgiref {asgiref.__version__} has no sync_to_async WsgiToAsgiInstance.run_wsgi_app - "
+                          "asgi.py needs asgiref>=3.8.1,<3.13")
+    return runner
+
+
+class PooledWsgiInstance(WsgiToAsgiInstance):
+    """asgiref's per-request WSGI runner, moved off its single thread-sensitive thread onto wsgi_executor"""
+    run_wsgi_app = sync_to_async(WsgiRunner(), thread_sensitive=False, executor=wsgi_executor)
+
+
+class PooledWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        # duplicate_header_limit ONLY EXISTS FROM asgiref 3.9
+        limit = getattr(self, "duplicate_header_limit", None)
+        instance = PooledWsgiInstance(self.wsgi_application, *(() if limit is None else (limit,)))
+        await instance(scope, receive, send)
+
+
+wsgi_app = PooledWsgiToAsgi(flask_app)
+db_pool = None
+email_tasks = set()
+
+
+# ============================================ DATABASE ============================================
+async def OpenPool():
+    global db_pool
+    if asyncpg is None:
+        print("⚠️ asyncpg not installed - form inserts will run in a thread")
+        return
+    try:
+        db_pool = await asyncpg.create_pool(
+            **DB_SETTINGS,
+            password=os.getenv("POSTGRES_PASSWORD"),
+            min_size=ASYNC_DB_POOL_MIN,
+            max_size=ASYNC_DB_POOL_MAX,
+            timeout=DB_CONNECT_TIMEOUT,
+            command_timeout=DB_STATEMENT_TIMEOUT_MS / 1000,
+        )
+        print("✅ Async database pool ready")
+    except Exception as e:
+        print(f"❌ Async database pool failed: {e}")
+
+async def ClosePool():
+    if db_pool is not None:
+        await db_pool.close()
+
+async def InsertRow(query, fields, fallback, data, label, table):
+    """Run an INSERT ... RETURNING id, status, timestamp on the pool, or the sync helper in a thread without one"""
+    if write_behind.buffer is not None and write_behind.buffer.Submit(table, data):
+        return True
+    if db_pool is None:
+        return await asyncio.to_thread(SubmitOrInsert, table, data, fallback)
+    if breaker.IsOpen():
+        return await asyncio.to_thread(spool.Append, table, data)
+    try:
+        async with db_pool.acquire(timeout=DB_CONNECT_TIMEOUT) as conn:
+            async with conn.transaction():
+                row = await conn.fetchrow(query, *fields.values())
+                event = SubmissionEvent(NOTIFY_KINDS[table], tuple(row), fields)
+                await conn.execute("SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, json.dumps(event, default=str))
+        breaker.Success()
+        print(f"✅ {label} {row['id']} saved to database")
+        return True
+    except (OSError, asyncio.TimeoutError, asyncpg.PostgresConnectionError, asyncpg.QueryCanceledError,
+            asyncpg.InterfaceError) as e:
+        print(f"❌ Database unavailable saving {label}: {e}")
+        breaker.Failure()
+        return await asyncio.to_thread(spool.Append, table, data)
+    except Exception as e:
+        print(f"❌ Error saving {label}: {e}")
+        return False
+
+async def NewContactSubmissionAsync(data):
+    return await InsertRow("""
+        INSERT INTO contact_me (name, email, message)
+        VALUES ($1, $2, $3)
+        RETURNING id, status, timestamp
+    """, {'name': data.get('HumanName'), 'email': data.get('EmailAddy'), 'message': data.get('message')},
+        NewContactSubmission, data, "Contact submission", "contact_me")
+
+async def NewSupportTicketAsync(data):
+    return await InsertRow("""
+        INSERT INTO support (name, email, page, issue)
+        VALUES ($1, $2, $3, $4)
+        RETURNING id, status, timestamp
+    """, {'name': data.get('name'), 'email': data.get('email'), 'page': data.get('page'), 'issue': data.get('issue')},
+        NewSupportTicket, data, "Support ticket", "support")
+
+async def NewGameFeedbackAsync(data):
+    return await InsertRow("""
+        INSERT INTO game_feedback (name, email, stars, review)
+        VALUES ($1, $2, $3, $4)
+        RETURNING id, status, timestamp
+    """, {'name': data.get('name'), 'email': data.get('email'), 'stars': data.get('stars'), 'review': data.get('review')},
+        NewGameFeedback, data, "Game feedback", "game_feedback")
+
+
+# ============================================ EMAIL ============================================
+async def SendSMTPAsync(email):
+    """Send a pre-rendered OutgoingEmail - the same bytes are reused for the SSL fallback"""
+    if aiosmtplib is None:
+        return await asyncio.to_thread(SendSMTP, email)
+    try:
+        await aiosmtplib.send(email.payload, sender=email.sender, recipients=[email.recipient],
+                              hostname=SMTP_HOST, port=SMTP_PORT, start_tls=SMTP_STARTTLS,
+                              username=SENDER_EMAIL, password=EMAIL_PASSWORD, timeout=10)
+        return True, None
+    except Exception as e1:
+        try:
+            await aiosmtplib.send(email.payload, sender=email.sender, recipients=[email.recipient],
+                                  hostname=SMTP_HOST, port=SMTP_SSL_PORT, use_tls=True,
+                                  username=SENDER_EMAIL, password=EMAIL_PASSWORD, timeout=10)
+            return True, None
+        except Exception as e2:
+            return False, f"587 error: {e1}; 465 error: {e2}"
+
+async def SendEmailTask(kind, data, label):
+    try:
+        if not SENDER_EMAIL or not EMAIL_PASSWORD:
+            raise RuntimeError("Email settings not configured")
+        ok, err = await SendSMTPAsync(BuildEmail(kind, data))
+        if ok:
+            print(f"✅ {label} email sent successfully")
+        else:
+            print(f"❌ {label} Email Error: {err}")
+    except Exception as e:
+        print(f"❌ {label} Email Error: {type(e).__name__}: {e}")
+
+def SendEmailInBackground(kind, data, label):
+    if digest and digest.Add(kind, data):  # DIGEST MODE - SENT LATER FROM THE SCHEDULER THREAD
+        return
+    task = asyncio.create_task(SendEmailTask(kind, data, label))
+    email_tasks.add(task)  # KEEP A REFERENCE UNTIL THE TASK FINISHES
+    task.add_done_callback(email_tasks.discard)
+
+
+# ============================================ FLASK SESSION (FLASH MESSAGES, ADMIN CHECK) ============================================
+def LoadSession(headers):
+    """The Flask session carried by the request's cookie - {} when missing, tampered with or expired"""
+    interface = flask_app.session_interface
+    serializer = interface.get_signing_serializer(flask_app)
+    cookies = SimpleCookie()
+    cookies.load(headers.get(b"cookie", b"").decode("latin-1"))
+    cookie_name = interface.get_cookie_name(flask_app)
+    if serializer is None or cookie_name not in cookies:
+        return {}
+    try:
+        max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+        return serializer.loads(cookies[cookie_name].value, max_age=max_age)
+    except Exception:
+        return {}
+
+def FlashCookie(headers, category, message):
+    """Append a flash message to the Flask session cookie and return the Set-Cookie header value"""
+    interface = flask_app.session_interface
+    serializer = interface.get_signing_serializer(flask_app)
+    if serializer is None:  # NO SECRET_KEY - FLASHING IS NOT POSSIBLE
+        return None
+
+    cookie_name = interface.get_cookie_name(flask_app)
+    data = LoadSession(headers)
+    data.setdefault("_flashes", []).append((category, message))
+    return dump_cookie(
+        cookie_name,
+        serializer.dumps(data),
+        path=interface.get_cookie_path(flask_app),
+        domain=interface.get_cookie_domain(flask_app),
+        secure=interface.get_cookie_secure(flask_app),
+        httponly=interface.get_cookie_httponly(flask_app),
+        samesite=interface.get_cookie_samesite(flask_app),
+    )
+
+
+# ============================================ FORM HANDLERS ============================================
+FORM_ROUTES = {
+    "/contact": ("contact", "EmailAddy", ContactFromForm, NewContactSubmissionAsync, "Contact",
+                 ("Message sent successfully!", "Error saving contact submission")),
+    "/support": ("support", "email", SupportFromForm, NewSupportTicketAsync, "Support",
+                 ("Support request submitted! We'll get back to you soon.", "Error submitting support request")),
+    "/review": ("review", "email", FeedbackFromForm, NewGameFeedbackAsync, "Game Feedback",
+                ("⭐ Thanks for your feedback! You're pawsome!", "❌ Error submitting feedback. Please try again.")),
+}
+
+async def ReadBody(receive):
+    body = b""
+    while True:
+        event = await receive()
+        if event["type"] == "http.disconnect":
+            return None
+        body += event.get("body", b"")
+        if len(body) > MAX_FORM_BYTES:
+            return None
+        if not event.get("more_body"):
+            return body
+
+async def HandleForm(scope, receive, send):
+    kind, email_key, from_form, insert, label, (success_msg, error_msg) = FORM_ROUTES[scope["path"]]
+    headers = dict(scope["headers"])
+
+    body = await ReadBody(receive)
+    if body is None:
+        await send({"type": "http.response.start", "status": 413, "headers": [(b"content-length", b"0")]})
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    form = dict(parse_qsl(body.decode("utf-8", "replace"), keep_blank_values=True))
+    try:
+        data = from_form(form)
+    except (TypeError, ValueError) as e:
+        print(f"❌ Invalid {label} submission: {e}")
+        data = None
+
+    if data is None:
+        cookie = FlashCookie(headers, "error", error_msg)
+    else:
+        forwarded = headers.get(b"x-forwarded-for", b"").decode("latin-1")
+        ip = ClientIP((scope.get("client") or ("unknown",))[0], forwarded)
+        verdict, content_hash = CheckSubmission(kind, ip, data.get(email_key), data)
+        if verdict == RATE_LIMITED:
+            cookie = FlashCookie(headers, "error", RATE_LIMIT_MESSAGE)
+        elif verdict == DUPLICATE:
+            cookie = FlashCookie(headers, "success", success_msg)
+        elif await insert(data):
+            SendEmailInBackground(kind, data, label)
+            cookie = FlashCookie(headers, "success", success_msg)
+        else:
+            ForgetSubmission(content_hash)
+            cookie = FlashCookie(headers, "error", error_msg)
+
+    response_headers = [(b"location", scope["path"].encode()), (b"content-length", b"0")]
+    if cookie:
+        response_headers.append((b"set-cookie", cookie.encode("latin-1")))
+    await send({"type": "http.response.start", "status": 303, "headers": response_headers})
+    await send({"type": "http.response.body", "body": b""})
+
+
+# ============================================ LIVE UPDATES (SSE) ============================================
+async def WaitForDisconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+async def HandleEvents(scope, receive, send):
+    """Same stream as app.py's admin_events, but each subscriber is an asyncio queue instead of a blocked thread"""
+    async def Respond(status, headers=(), body=b""):
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-length", str(len(body)).encode()), *headers]})
+        await send({"type": "http.response.body", "body": body})
+
+    if not ValidSession(LoadSession(dict(scope["headers"]))):
+        return await Respond(302, [(b"location", b"/admin/login")])
+    if not LIVE_UPDATES_ENABLED:
+        return await Respond(204)
+
+    subscriber = LoopSubscriber(asyncio.get_running_loop())
+    hub.Subscribe(subscriber)
+    disconnected = asyncio.create_task(WaitForDisconnect(receive))
+    try:
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"text/event-stream; charset=utf-8"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no"),
+        ]})
+        chunk = "retry: 5000\n\n"
+        while not disconnected.done():
+            await send({"type": "http.response.body", "body": chunk.encode(), "more_body": True})
+            event = asyncio.ensure_future(subscriber.queue.get())
+            await asyncio.wait({event, disconnected}, timeout=SSE_HEARTBEAT_SECONDS,
+                               return_when=asyncio.FIRST_COMPLETED)
+            if event.done():
+                chunk = FormatEvent(event.result())
+            else:
+                event.cancel()
+                chunk = ": keep-alive\n\n"
+    finally:
+        hub.Unsubscribe(subscriber)
+        disconnected.cancel()
+
+
+# ============================================ APPLICATION ============================================
+async def Lifespan(receive, send):
+    while True:
+        event = await receive()
+        if event["type"] == "lifespan.startup":
+            await OpenPool()
+            await send({"type": "lifespan.startup.complete"})
+        elif event["type"] == "lifespan.shutdown":
+            await ClosePool()
+            if email_tasks:
+                await asyncio.gather(*email_tasks, return_exceptions=True)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await Lifespan(receive, send)
+    if scope["type"] == "http" and scope["method"] == "POST" and scope["path"] in FORM_ROUTES:
+        return await HandleForm(scope, receive, send)
+    if scope["type"] == "http" and scope["method"] == "GET" and scope["path"] == "/admin/events":
+        return await HandleEvents(scope, receive, send)
+    return await wsgi_app(scope, receive, send)
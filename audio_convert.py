@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import subprocess
+from collections import OrderedDict, namedtuple
+
+# ============================================ AUDIO CONVERSION ============================================
+# EVERY UPLOAD IS PROBED WITH ffprobe BEFORE ffmpeg RUNS:
+#   - NO AUDIO STREAM / UNREADABLE -> REJECTED WITHOUT STARTING ffmpeg
+#   - LONGER THAN CONVERT_MAX_SECONDS -> REJECTED
+#   - CODEC/CHANNELS/BITRATE PICK THE ENCODER SETTINGS (MONO STAYS MONO AT A LOWER BITRATE, SURROUND IS DOWNMIXED,
+#     LOSSY SOURCES AREN'T UPSAMPLED TO A HIGHER BITRATE THAN THEY HAVE)
+#   - DURATION / LEARNED SPEED = ESTIMATED RUN TIME, WHICH SETS THE WATCHDOG DEADLINE FOR THAT JOB
+# PROBES ARE CACHED BY CONTENT HASH, SO RE-UPLOADING THE SAME FILE SKIPS ffprobe.
+# THE WATCHDOG READS ffmpeg's -progress OUTPUT AND KILLS THE PROCESS IF IT PASSES ITS DEADLINE OR STOPS MOVING.
+
+FFMPEG_BIN = os.environ.get("FFMPEG_BIN", "ffmpeg")
+FFPROBE_BIN = os.environ.get("FFPROBE_BIN", "ffprobe")
+ALLOWED_EXTENSIONS = ['.m4a', '.wav', '.flac', '.ogg', '.aac', '.wma']
+CONVERT_BITRATE = os.environ.get("CONVERT_BITRATE", "192k")
+CONVERT_MONO_BITRATE = os.environ.get("CONVERT_MONO_BITRATE", "96k")
+CONVERT_MAX_SECONDS = float(os.environ.get("CONVERT_MAX_SECONDS", 3 * 3600))   # INPUT DURATION LIMIT
+CONVERT_SPEED = float(os.environ.get("CONVERT_SPEED", 50))          # STARTING GUESS: AUDIO SECONDS PER WALL SECOND
+CONVERT_TIMEOUT_FACTOR = float(os.environ.get("CONVERT_TIMEOUT_FACTOR", 4))   # DEADLINE = ESTIMATE x THIS
+CONVERT_TIMEOUT_MIN = float(os.environ.get("CONVERT_TIMEOUT_MIN", 30))
+CONVERT_STALL_SECONDS = float(os.environ.get("CONVERT_STALL_SECONDS", 20))    # NO PROGRESS FOR THIS LONG = KILL
+PROBE_TIMEOUT = float(os.environ.get("PROBE_TIMEOUT", 15))
+PROBE_CACHE_SIZE = int(os.environ.get("PROBE_CACHE_SIZE", 512))
+
+LOSSY_CODECS = {"aac", "vorbis", "opus", "wmav1", "wmav2", "mp3", "mp2"}
+
+AudioInfo = namedtuple("AudioInfo", "duration codec channels sample_rate bit_rate")
+
+
+class ConversionError(Exception):
+    """A conversion that should fail with a message for the user rather than a 500"""
+
+
+def HasAllowedExtension(filename):
+    return any(filename.lower().endswith(ext) for ext in ALLOWED_EXTENSIONS)
+
+
+def HashFile(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ---------- PROBE ----------
+probe_cache = OrderedDict()
+probe_lock = threading.Lock()
+
+
+def Probe(path):
+    """Run ffprobe on the first audio stream - raises ConversionError if there isn't a readable one"""
+    try:
+        result = subprocess.run([
+            FFPROBE_BIN, "-v", "error", "-select_streams", "a:0",
+            "-show_entries", "format=duration,bit_rate:stream=codec_name,channels,sample_rate,bit_rate,duration",
+            "-of", "json", path,
+        ], capture_output=True, timeout=PROBE_TIMEOUT, check=True)
+        data = json.loads(result.stdout or b"{}")
+    except subprocess.TimeoutExpired:
+        raise ConversionError("Could not read that file in time - is it really audio?")
+    except (subprocess.CalledProcessError, ValueError):
+        raise ConversionError("Could not read that file - it may be corrupt or not audio.")
+
+    streams = data.get("streams") or []
+    if not streams:
+        raise ConversionError("That file has no audio in it.")
+    stream, container = streams[0], data.get("format", {})
+
+    def Number(*values):
+        for value in values:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                continue
+        return None
+
+    return AudioInfo(
+        duration=Number(container.get("duration"), stream.get("duration")),
+        codec=stream.get("codec_name"),
+        channels=int(stream.get("channels") or 2),
+        sample_rate=int(Number(stream.get("sample_rate")) or 44100),
+        bit_rate=Number(stream.get("bit_rate"), container.get("bit_rate")),
+    )
+
+
+def ProbeCached(path, digest=None):
+    """Probe by content hash, reusing an earlier result for identical bytes"""
+    digest = digest or HashFile(path)
+    with probe_lock:
+        if digest in probe_cache:
+            probe_cache.move_to_end(digest)
+            return probe_cache[digest]
+    info = Probe(path)
+    with probe_lock:
+        probe_cache[digest] = info
+        while len(probe_cache) > PROBE_CACHE_SIZE:
+            probe_cache.popitem(last=False)
+    return info
+
+
+def CheckLimits(info):
+    if info.duration is not None and info.duration > CONVERT_MAX_SECONDS:
+        raise ConversionError(
+            f"That file is {info.duration / 60:.0f} minutes long - the limit is {CONVERT_MAX_SECONDS / 60:.0f} minutes."
+        )
+
+
+# ---------- ENCODER SETTINGS ----------
+def Kbps(rate):
+    return int(rate.rstrip("kK"))
+
+
+def EncoderSettings(info):
+    """ffmpeg output arguments for this input"""
+    if info.channels == 1:
+        channels, bitrate = 1, Kbps(CONVERT_MONO_BITRATE)
+    else:
+        channels, bitrate = 2, Kbps(CONVERT_BITRATE)  # SURROUND IS DOWNMIXED - MP3 IS STEREO AT MOST
+    if info.codec in LOSSY_CODECS and info.bit_rate:
+        # RE-ENCODING A 96k AAC AT 192k ONLY MAKES THE FILE BIGGER
+        bitrate = max(64, min(bitrate, int(info.bit_rate / 1000)))
+    args = ["-vn", "-ac", str(channels), "-c:a", "libmp3lame", "-b:a", f"{bitrate}k"]
+    if info.sample_rate > 48000:  # MP3 TOPS OUT AT 48 kHz
+        args += ["-ar", "48000"]
+    return args
+
+
+def SettingsSignature():
+    """Changes whenever the encoder configuration does - bulk outputs made under other settings are redone"""
+    config = f"{CONVERT_BITRATE}|{CONVERT_MONO_BITRATE}|libmp3lame|48000"
+    return hashlib.sha256(config.encode()).hexdigest()[:12]
+
+
+# ---------- ESTIMATES ----------
+speed_lock = threading.Lock()
+learned_speed = CONVERT_SPEED
+
+
+def EstimateSeconds(info):
+    """Expected wall time for this job, from its duration and how fast recent jobs ran in this worker"""
+    duration = info.duration if info.duration is not None else CONVERT_MAX_SECONDS
+    return duration / learned_speed + 0.5  # + PROCESS START-UP
+
+
+def RecordSpeed(info, elapsed):
+    global learned_speed
+    if not info.duration or elapsed <= 0.5:
+        return
+    with speed_lock:
+        learned_speed = 0.8 * learned_speed + 0.2 * (info.duration / elapsed)
+
+
+def Deadline(info):
+    return max(CONVERT_TIMEOUT_MIN, EstimateSeconds(info) * CONVERT_TIMEOUT_FACTOR)
+
+
+# ---------- RUN WITH WATCHDOG ----------
+def RunFFmpeg(input_path, output_path, info):
+    """Encode with a per-job watchdog: killed past its deadline or after CONVERT_STALL_SECONDS without progress"""
+    deadline = Deadline(info)
+    command = [FFMPEG_BIN, "-nostdin", "-v", "error", "-y", "-i", input_path,
+               *EncoderSettings(info), "-f", "mp3", "-progress", "pipe:1", "-nostats", output_path]
+    start = time.monotonic()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+    progress = {"at": start, "out_seconds": 0.0}
+    errors = []
+
+    def ReadProgress():
+        for line in process.stdout:
+            key, _, value = line.strip().partition("=")
+            if key == "out_time_us" and value.isdigit():
+                progress["out_seconds"] = int(value) / 1e6
+                progress["at"] = time.monotonic()
+
+    def ReadErrors():
+        errors.append(process.stderr.read())
+
+    readers = [threading.Thread(target=ReadProgress, daemon=True), threading.Thread(target=ReadErrors, daemon=True)]
+    for reader in readers:
+        reader.start()
+
+    reason = None
+    while process.poll() is None:
+        now = time.monotonic()
+        if now - start > deadline:
+            reason = f"took longer than {deadline:.0f}s"
+        elif now - progress["at"] > CONVERT_STALL_SECONDS:
+            reason = f"made no progress for {CONVERT_STALL_SECONDS:.0f}s"
+        if reason:
+            process.kill()
+            process.wait()
+            break
+        try:
+            process.wait(timeout=0.5)
+        except subprocess.TimeoutExpired:
+            pass
+    for reader in readers:
+        reader.join(timeout=1)
+
+    elapsed = time.monotonic() - start
+    if reason:
+        print(f"❌ Killed ffmpeg on {os.path.basename(input_path)}: {reason} "
+              f"({progress['out_seconds']:.0f}s of {info.duration or 0:.0f}s done)")
+        raise ConversionError("Conversion stalled or ran too long and was stopped. Try a shorter file.")
+    if process.returncode != 0:
+        print(f"❌ ffmpeg failed on {os.path.basename(input_path)}: {''.join(errors).strip()[-500:]}")
+        raise ConversionError("Conversion failed - the file may be corrupt.")
+
+    RecordSpeed(info, elapsed)
+    return elapsed
+
+
+def ConvertFile(input_path, output_path, digest=None):
+    """Probe, check limits and encode one file to MP3 - returns (AudioInfo, estimated seconds, actual seconds)"""
+    info = ProbeCached(input_path, digest)
+    CheckLimits(info)
+    estimate = EstimateSeconds(info)
+    elapsed = RunFFmpeg(input_path, output_path, info)
+    return info, estimate, elapsed
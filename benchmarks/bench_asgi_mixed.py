@@ -0,0 +1,115 @@
+"""Latency of light pages while heavy Flask routes are in flight under the ASGI entrypoint (asgi.py).
+
+Seeds --rows rows into a throwaway Postgres and starts uvicorn once per --wsgi-threads value. For each one it times
+GET --light alone, then again while --heavy-clients connections loop over the heavy admin pages. With one WSGI
+thread (asgiref's default) every light request queues behind the heavy ones, so the "under load" percentiles
+blow up; with a pool they should stay close to the idle numbers.
+
+Usage:
+  python benchmarks/bench_asgi_mixed.py --rows 100000 --wsgi-threads 1 16 --heavy-clients 8 --out mixed.json
+Needs PostgreSQL server binaries (initdb/pg_ctl) and uvicorn.
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+
+from harness import ThrowawayPostgres, SMTPSink, FreePort, WaitForPort, Login, CheckLoggedIn, Drive, Client, ROOT
+from bench_routes import Seed, AppEnv, ADMIN_PASSWORD
+
+HEAVY_PAGES = [
+    "/admin/messages-suggestions?stream=1",
+    "/admin/support?stream=1",
+    "/admin/game-feedback?stream=1",
+    "/admin/search?q=broken+level",
+]
+
+
+def StartAsgi(port, env, threads):
+    command = [sys.executable, "-m", "uvicorn", "asgi:application", "--port", str(port), "--log-level", "warning"]
+    server = subprocess.Popen(command, cwd=ROOT, env=dict(env, ASGI_WSGI_THREADS=str(threads)),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if not WaitForPort(port, timeout=60):
+        server.kill()
+        raise RuntimeError("asgi server did not start")
+    return server
+
+
+def Hammer(port, cookie, clients, stop):
+    """Keep `clients` connections busy on the heavy pages until stop is set - returns a list of completed counts"""
+    done = [0] * clients
+
+    def Loop(index):
+        client = Client(port, cookie)
+        while not stop.is_set():
+            client.Request("GET", HEAVY_PAGES[done[index] % len(HEAVY_PAGES)])
+            done[index] += 1
+
+    threads = [threading.Thread(target=Loop, args=(i,), daemon=True) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    return threads, done
+
+
+def Main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--wsgi-threads", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--heavy-clients", type=int, default=8)
+    parser.add_argument("--light", default="/resume")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--out", help="also write the JSON here")
+    args = parser.parse_args()
+
+    pg = ThrowawayPostgres().Start()
+    smtp = SMTPSink().Start()
+    env = AppEnv(pg, smtp)
+    results = {}
+    try:
+        Seed(pg, args.rows)
+        for threads in args.wsgi_threads:
+            port = FreePort()
+            server = StartAsgi(port, env, threads)
+            try:
+                cookie = Login(port, ADMIN_PASSWORD)
+                CheckLoggedIn(port, cookie)
+                idle = Drive(port, "GET", args.light, args.requests, args.concurrency)
+
+                stop = threading.Event()
+                hammers, done = Hammer(port, cookie, args.heavy_clients, stop)
+                time.sleep(1)  # LET THE HEAVY PAGES FILL THE THREADS FIRST
+                loaded = Drive(port, "GET", args.light, args.requests, args.concurrency)
+                stop.set()
+                for hammer in hammers:
+                    hammer.join()
+
+                results[f"wsgi_threads_{threads}"] = {
+                    "idle": idle,
+                    "under_heavy_load": loaded,
+                    "heavy_requests_completed": sum(done),
+                    "p95_slowdown": round(loaded["p95_ms"] / idle["p95_ms"], 1) if idle["p95_ms"] else None,
+                }
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        smtp.shutdown()
+        pg.Stop()
+
+    output = json.dumps({
+        "rows": args.rows,
+        "light_route": args.light,
+        "heavy_clients": args.heavy_clients,
+        "results": results,
+    }, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,152 @@
+"""Requests/sec and latency percentiles for the public form POSTs: sync gunicorn vs. the ASGI mode.
+
+Starts each server in turn, fires --requests POSTs at --concurrency, and can hold --slow-clients
+connections open that trickle their body one byte at a time (the case that pins sync workers).
+
+Usage:
+  python benchmarks/bench_async_forms.py --requests 2000 --concurrency 200 --slow-clients 500
+Needs Postgres for the inserts. Leave SENDER_EMAIL unset so no mail is sent during the run.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FORMS = {
+    "/contact": {"HumanName": "Bench", "EmailAddy": "bench@example.com", "message": "benchmark message"},
+    "/support": {"name": "Bench", "email": "bench@example.com", "page": "Home", "issue": "benchmark issue"},
+    "/review": {"name": "Bench", "email": "bench@example.com", "stars": "5", "review": "benchmark review"},
+}
+
+SERVERS = {
+    "sync": lambda port, workers: [sys.executable, "-m", "gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{port}", "app:app"],
+    "async": lambda port, workers: [sys.executable, "-m", "uvicorn", "asgi:application", "--port", str(port), "--log-level", "warning"],
+}
+
+
+def WaitForPort(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def BuildRequest(path, port):
+    body = urlencode(FORMS[path]).encode()
+    head = (
+        f"POST {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nConnection: close\r\n"
+        f"Content-Type: application/x-www-form-urlencoded\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode()
+    return head, body
+
+
+async def OnePost(path, port):
+    head, body = BuildRequest(path, port)
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head + body)
+    await writer.drain()
+    status = (await reader.readline()).split()[1]
+    await reader.read()
+    writer.close()
+    return int(status), (time.perf_counter() - start) * 1000
+
+
+async def SlowClient(port, stop):
+    """Send headers, then one body byte per second until told to stop"""
+    head, body = BuildRequest("/contact", port)
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(head)
+        for byte in body:
+            if stop.is_set():
+                break
+            writer.write(bytes([byte]))
+            await writer.drain()
+            await asyncio.sleep(1)
+        writer.close()
+    except OSError:
+        pass
+
+
+async def Drive(port, total, concurrency, slow_clients):
+    stop = asyncio.Event()
+    slow = [asyncio.create_task(SlowClient(port, stop)) for _ in range(slow_clients)]
+    await asyncio.sleep(1 if slow_clients else 0)
+
+    paths = list(FORMS)
+    latencies, errors = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def Worker(i):
+        nonlocal errors
+        async with semaphore:
+            try:
+                status, ms = await OnePost(paths[i % len(paths)], port)
+                latencies.append(ms)
+                if status >= 400:
+                    errors += 1
+            except OSError:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(Worker(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await asyncio.gather(*slow, return_exceptions=True)
+
+    latencies.sort()
+    pick = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 2) if latencies else None
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+    }
+
+
+def Main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--slow-clients", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn sync workers")
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--only", choices=list(SERVERS))
+    args = parser.parse_args()
+
+    env = dict(os.environ, SENDER_EMAIL="", TEMPLATE_WARMUP="0", RATE_LIMIT_ENABLED="0")
+    results = {}
+    for name, command in SERVERS.items():
+        if args.only and name != args.only:
+            continue
+        server = subprocess.Popen(command(args.port, args.workers), cwd=ROOT, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if not WaitForPort(args.port):
+                results[name] = {"error": "server did not start"}
+                continue
+            results[name] = asyncio.run(Drive(args.port, args.requests, args.concurrency, args.slow_clients))
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(json.dumps({"concurrency": args.concurrency, "slow_clients": args.slow_clients, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    Main()
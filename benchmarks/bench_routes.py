@@ -0,0 +1,277 @@
+"""Load test every route in app.py against a throwaway Postgres and a stub SMTP server.
+
+For each seeded size (--rows) a fresh gunicorn is started and driven with --requests at --concurrency:
+public pages, the three form POSTs (which send mail to the stub), and every admin page (plain and ?stream=1).
+/convert is timed separately with generated WAV files of --audio-mb sizes. Output is one JSON document with
+throughput, p50/p95/p99 latency and server RSS per route, for regression tracking.
+
+Usage:
+  python benchmarks/bench_routes.py --rows 1000 10000 100000 --requests 500 --concurrency 20 --out bench.json
+Needs PostgreSQL server binaries (initdb/pg_ctl) and gunicorn; /convert also needs ffmpeg.
+"""
+import os
+import io
+import sys
+import json
+import time
+import wave
+import math
+import shutil
+import struct
+import argparse
+import platform
+import subprocess
+from urllib.parse import urlencode
+
+from harness import ThrowawayPostgres, SMTPSink, StartApp, FreePort, Login, CheckLoggedIn, Drive, Client, RSSMegabytes
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ADMIN_PASSWORD = "bench"
+
+PUBLIC_PAGES = ["/", "/resume", "/contact", "/support", "/review", "/audio-converter", "/admin/login"]
+
+ADMIN_PAGES = [
+    "/admin",
+    "/admin/messages-suggestions",
+    "/admin/messages-suggestions?stream=1",
+    "/admin/support",
+    "/admin/support?stream=1",
+    "/admin/game-feedback",
+    "/admin/game-feedback?stream=1",
+    "/admin/wishlist",
+    "/admin/wishlist?stream=1",
+    "/admin/app_requests",
+    "/admin/app_requests?page=2",
+    "/admin/search?q=broken+level",
+    "/admin/history",
+]
+
+FORMS = {
+    "/contact": lambda i: {"HumanName": f"Bench {i}", "EmailAddy": f"bench{i}@example.com", "message": f"benchmark message {i}"},
+    "/support": lambda i: {"name": f"Bench {i}", "email": f"bench{i}@example.com", "page": "Home", "issue": f"benchmark issue {i}"},
+    "/review": lambda i: {"name": f"Bench {i}", "email": f"bench{i}@example.com", "stars": "5", "review": f"benchmark review {i}"},
+}
+
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# ROWS PER SEEDED SIZE - generate_series KEEPS SEEDING INSIDE POSTGRES SO 100K ROWS TAKE SECONDS
+SEED_SQL = {
+    "contact_me": """
+        INSERT INTO contact_me (name, email, message, status, timestamp)
+        SELECT 'Person ' || g, 'person' || g || '@example.com',
+               'Hello, I saw your portfolio and the level editor is broken on mobile ' || g,
+               (ARRAY['unread', 'read'])[1 + (g % 4 = 0)::int],
+               NOW() - make_interval(mins => g)
+        FROM generate_series(1, %(rows)s) g
+    """,
+    "support": """
+        INSERT INTO support (name, email, page, issue, status, timestamp)
+        SELECT 'Person ' || g, 'person' || g || '@example.com',
+               (ARRAY['Home', 'Resume', 'Audio Converter', 'CATastrophe'])[1 + g % 4],
+               'The page will not load past the second level when I ' || g,
+               (ARRAY['new', 'in_progress', 'resolved', 'resolved'])[1 + g % 4],
+               NOW() - make_interval(mins => g)
+        FROM generate_series(1, %(rows)s) g
+    """,
+    "game_feedback": """
+        INSERT INTO game_feedback (name, email, stars, review, status, timestamp)
+        SELECT 'Person ' || g, 'person' || g || '@example.com', 1 + g % 5,
+               'Fun game but the boss level is too hard ' || g,
+               (ARRAY['new', 'read'])[1 + (g % 3 = 0)::int],
+               NOW() - make_interval(mins => g)
+        FROM generate_series(1, %(rows)s) g
+    """,
+    "app_requests": """
+        INSERT INTO app_requests (name, email, phone, type, project_timeline, project_details, status, time_submitted)
+        SELECT 'Person ' || g, 'person' || g || '@example.com', '555-0100',
+               (ARRAY['website', 'mobile app', 'game'])[1 + g % 3], '1-3 months',
+               'I need a site for my bakery with online ordering ' || g,
+               (ARRAY['new', 'reviewing', 'in_progress', 'completed', 'declined'])[1 + g % 5],
+               NOW() - make_interval(mins => g)
+        FROM generate_series(1, %(rows)s) g
+    """,
+    "wishlist": """
+        INSERT INTO wishlist (source, enhancement_type, details, status, created_at, updated_at)
+        SELECT 'Review ' || g, (ARRAY['bug', 'feature', 'content'])[1 + g % 3],
+               'Add a level select screen ' || g,
+               (ARRAY['not_started', 'in_progress', 'completed', 'revisiting'])[1 + g % 4],
+               NOW() - make_interval(mins => g), NOW() - make_interval(mins => g)
+        FROM generate_series(1, %(rows)s) g
+    """,
+}
+
+
+def Seed(pg, rows, realistic=False):
+    conn = pg.Connect()
+    cursor = conn.cursor()
+    cursor.execute(f"TRUNCATE {', '.join(SEED_SQL)}, archive_history RESTART IDENTITY")
+    conn.commit()
+    if realistic:  # SKEWED STATUSES/TIMESTAMPS FROM seed_data.py (SLOWER TO LOAD)
+        subprocess.run([sys.executable, os.path.join(BENCH_DIR, "seed_data.py"), "--rows", str(rows)],
+                       env=dict(os.environ, **pg.Env()), check=True, stdout=subprocess.DEVNULL)
+    else:
+        for sql in SEED_SQL.values():
+            cursor.execute(sql, {"rows": rows})
+        cursor.execute("SELECT refresh_wishlist_counts()")
+        conn.commit()
+    conn.autocommit = True
+    cursor.execute("VACUUM ANALYZE")
+    conn.close()
+
+
+def AppEnv(pg, smtp):
+    return dict(
+        os.environ,
+        **pg.Env(),
+        **smtp.Env(),
+        SECRET_KEY="bench",
+        ADMIN_PASSWORD=ADMIN_PASSWORD,
+        SENDER_EMAIL="bench@example.com",
+        EMAIL_PASSWORD="bench",
+        RECEIVE_EMAIL="inbox@example.com",
+        RATE_LIMIT_ENABLED="0",
+        LIVE_UPDATES_ENABLED="0",
+        ARCHIVE_INTERVAL_HOURS="0",
+        EMAIL_DIGEST_WINDOW="0",
+    )
+
+
+def Record(results, server, route, method, rows, concurrency, stats):
+    results.append({
+        "route": route,
+        "method": method,
+        "rows": rows,
+        "concurrency": concurrency,
+        **stats,
+        "rss_mb": RSSMegabytes(server.pid),
+    })
+
+
+# ============================================ AUDIO CONVERSION ============================================
+def MakeWav(size_mb, rate=44100, channels=2):
+    """A 16-bit stereo 440 Hz tone of roughly size_mb megabytes"""
+    second = b"".join(
+        struct.pack("<h", int(12000 * math.sin(2 * math.pi * 440 * i / rate))) * channels for i in range(rate)
+    )
+    seconds = max(1, int(size_mb * 1024 * 1024 / len(second)))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(second * seconds)
+    return buffer.getvalue()
+
+
+def Multipart(field, filename, payload):
+    boundary = "----redeuxbench"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: audio/wav\r\n\r\n"
+    ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+    return body, {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+
+def BenchConvert(port, server, sizes, repeats):
+    if not shutil.which("ffmpeg"):
+        return {"skipped": "ffmpeg not found"}
+
+    results = []
+    for size_mb in sizes:
+        body, headers = Multipart("audio", f"bench_{size_mb}mb.wav", MakeWav(size_mb))
+        timings, output_bytes, peak_rss = [], 0, 0
+        for _ in range(repeats):
+            client = Client(port)
+            start = time.perf_counter()
+            response, data = client.Request("POST", "/convert", body, headers)
+            timings.append(time.perf_counter() - start)
+            output_bytes = len(data) if response.status == 200 else 0
+            peak_rss = max(peak_rss, RSSMegabytes(server.pid))
+        actual_mb = len(body) / (1024 * 1024)
+        mean = sum(timings) / len(timings)
+        results.append({
+            "input_mb": round(actual_mb, 2),
+            "repeats": repeats,
+            "seconds_mean": round(mean, 3),
+            "seconds_min": round(min(timings), 3),
+            "seconds_per_mb": round(mean / actual_mb, 4),
+            "output_bytes": output_bytes,
+            "rss_mb": peak_rss,
+        })
+    return results
+
+
+def Main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--worker-class", default="sync")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--audio-mb", type=float, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--convert-repeats", type=int, default=3)
+    parser.add_argument("--realistic", action="store_true", help="seed with seed_data.py instead of generate_series")
+    parser.add_argument("--out", help="also write the JSON here")
+    args = parser.parse_args()
+
+    pg = ThrowawayPostgres().Start()
+    smtp = SMTPSink().Start()
+    env = AppEnv(pg, smtp)
+    routes, convert = [], None
+
+    try:
+        for index, rows in enumerate(args.rows):
+            Seed(pg, rows, args.realistic)
+            port = FreePort()
+            server = StartApp(port, env, args.workers, args.worker_class, args.threads)
+            try:
+                Record(routes, server, "(idle)", "-", rows, 0, {})
+                if index == 0:  # PUBLIC PAGES DON'T DEPEND ON TABLE SIZE
+                    for path in PUBLIC_PAGES:
+                        Record(routes, server, path, "GET", rows, args.concurrency,
+                               Drive(port, "GET", path, args.requests, args.concurrency))
+
+                for path, make in FORMS.items():
+                    Record(routes, server, path, "POST", rows, args.concurrency,
+                           Drive(port, "POST", path, args.requests, args.concurrency,
+                                 body_for=lambda i, make=make: urlencode(make(i)), headers=FORM_HEADERS,
+                                 expect=(302,)))  # POST-REDIRECT-GET BACK TO THE FORM
+
+                cookie = Login(port, ADMIN_PASSWORD)
+                for path in ADMIN_PAGES:
+                    CheckLoggedIn(port, cookie)  # A REJECTED SESSION WOULD TIME 302s TO /admin/login
+                    Record(routes, server, path, "GET", rows, args.concurrency,
+                           Drive(port, "GET", path, args.requests, args.concurrency, cookie=cookie))
+
+                if index == 0:
+                    convert = BenchConvert(port, server, args.audio_mb, args.convert_repeats)
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        smtp.shutdown()
+        pg.Stop()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "workers": args.workers,
+            "worker_class": args.worker_class,
+            "requests_per_route": args.requests,
+            "concurrency": args.concurrency,
+            "emails_received": smtp.messages,
+        },
+        "routes": routes,
+        "convert": convert,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,121 @@
+"""Memory, allocation and GC cost of admin list reads: RealDictCursor + SELECT * versus the compact row types.
+
+Seeds --rows rows per table into a throwaway Postgres, then for each list helper in db_helpers compares the old
+read (SELECT *, one dict per row) with the current one (only displayed columns, one named tuple per row):
+wall time, memory retained by the result, peak memory during the fetch, allocated blocks, and how long a full
+gc.collect() takes while the result is alive.
+
+Usage:
+  python benchmarks/bench_rows.py --rows 100000 --repeats 3 --out rows.json
+Needs PostgreSQL server binaries (initdb/pg_ctl).
+"""
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+from psycopg2.extras import RealDictCursor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness import ThrowawayPostgres
+from bench_routes import Seed
+
+# THE PRE-COMPACT QUERIES, AS THE HELPERS USED TO RUN THEM
+LEGACY_SQL = {
+    "contact_me": "SELECT * FROM contact_me ORDER BY timestamp DESC",
+    "support": "SELECT * FROM support ORDER BY timestamp DESC",
+    "game_feedback": "SELECT * FROM game_feedback ORDER BY timestamp DESC",
+    "app_requests": "SELECT * FROM app_requests WHERE archived = FALSE ORDER BY time_submitted DESC",
+    "wishlist": "SELECT * FROM wishlist WHERE archived = FALSE ORDER BY created_at DESC",
+}
+
+
+def LegacyRead(pg, sql):
+    def Read():
+        conn = pg.Connect()
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+        conn.close()
+        return rows
+    return Read
+
+
+def Measure(read, repeats):
+    """Best-of-N wall time untraced, then one traced run for memory/allocations and a GC pass"""
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        rows = read()
+        timings.append(time.perf_counter() - start)
+        del rows
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    rows = read()
+    retained, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    gc.collect()
+    gc_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "rows": len(rows),
+        "seconds_min": round(min(timings), 3),
+        "retained_mb": round((retained - before) / 1024 / 1024, 1),
+        "peak_mb": round((peak - before) / 1024 / 1024, 1),
+        "blocks": blocks,
+        "gc_full_ms": round(gc_ms, 1),
+    }
+
+
+def Main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--out", help="also write the JSON here")
+    args = parser.parse_args()
+
+    pg = ThrowawayPostgres().Start()
+    try:
+        Seed(pg, args.rows)
+        os.environ.update(pg.Env())  # BEFORE db_helpers READS DB_SETTINGS
+        import db_helpers
+        compact = {
+            "contact_me": db_helpers.GetContactSubmissions,
+            "support": db_helpers.GetSupportTickets,
+            "game_feedback": db_helpers.GetGameFeedback,
+            "app_requests": db_helpers.get_all_app_requests,
+            "wishlist": lambda: db_helpers.GetWishlistSummary()["items"],
+        }
+
+        results = {}
+        for table, sql in LEGACY_SQL.items():
+            print(f"measuring {table}...", file=sys.stderr)
+            dicts = Measure(LegacyRead(pg, sql), args.repeats)
+            rows = Measure(compact[table], args.repeats)
+            results[table] = {
+                "dict_select_star": dicts,
+                "compact": rows,
+                "retained_ratio": round(rows["retained_mb"] / dicts["retained_mb"], 2) if dicts["retained_mb"] else None,
+            }
+    finally:
+        pg.Stop()
+
+    output = json.dumps({"rows_per_table": args.rows, "results": results}, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,101 @@
+"""First-request latency per route on cold vs. warm workers.
+
+Each scenario runs in a fresh interpreter (like a freshly forked/recycled gunicorn worker):
+  cold      - empty bytecode cache, no warm-up (templates compiled from source on first hit)
+  bytecode  - bytecode cache populated by a previous worker, no warm-up
+  warm      - warm-up at boot (templates already loaded when the first request arrives)
+
+Usage: python benchmarks/bench_template_warmup.py [--runs 5]
+Admin routes are hit with an admin session; without a reachable Postgres the DB helpers fail fast
+and return empty lists, which is fine for measuring template cost.
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROUTES = [
+    ("/", False),
+    ("/resume", False),
+    ("/contact", False),
+    ("/support", False),
+    ("/review", False),
+    ("/audio-converter", False),
+    ("/admin/login", False),
+    ("/admin", True),
+    ("/admin/messages-suggestions", True),
+    ("/admin/support", True),
+    ("/admin/game-feedback", True),
+    ("/admin/wishlist", True),
+]
+
+CHILD = r"""
+import os, sys, json, time, io, contextlib
+sys.path.insert(0, os.environ["BENCH_ROOT"])
+with contextlib.redirect_stdout(io.StringIO()):
+    import app as site
+site.app.config["TESTING"] = True
+client = site.app.test_client()
+routes = json.loads(os.environ["BENCH_ROUTES"])
+timings = {}
+for path, admin in routes:
+    with client.session_transaction() as sess:
+        sess.clear()
+        if admin:
+            site.StartSession(sess)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.get(path)
+    timings[path] = (time.perf_counter() - start) * 1000
+print(json.dumps(timings))
+"""
+
+
+def RunWorker(cache_dir, warmup):
+    env = dict(os.environ)
+    env.update({
+        "BENCH_ROOT": ROOT,
+        "BENCH_ROUTES": json.dumps(ROUTES),
+        "TEMPLATE_CACHE_DIR": cache_dir,
+        "TEMPLATE_WARMUP": "1" if warmup else "0",
+        "PAGE_CACHE_ENABLED": "0",
+        "SECRET_KEY": env.get("SECRET_KEY", "bench"),
+        "ADMIN_PASSWORD": env.get("ADMIN_PASSWORD", "bench"),
+    })
+    out = subprocess.run([sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def Main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {"cold": [], "bytecode": [], "warm": []}
+    for _ in range(args.runs):
+        cache_dir = tempfile.mkdtemp(prefix="jinja_bench_")
+        try:
+            results["cold"].append(RunWorker(cache_dir, warmup=False))
+            results["bytecode"].append(RunWorker(cache_dir, warmup=False))
+            results["warm"].append(RunWorker(cache_dir, warmup=True))
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    report = {}
+    for scenario, runs in results.items():
+        report[scenario] = {
+            path: round(statistics.median(run[path] for run in runs), 3)
+            for path, _ in ROUTES
+        }
+
+    print(json.dumps({"unit": "ms", "runs": args.runs, "median_first_request": report}, indent=2))
+
+
+if __name__ == "__main__":
+    Main()
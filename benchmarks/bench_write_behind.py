@@ -0,0 +1,100 @@
+"""Insert throughput for public form submissions: direct INSERT/commit vs. the write-behind buffer.
+
+Runs 1, 10 and 100 concurrent posters (threads) against the real Postgres configured for db_helpers.
+Rows are written to contact_me with a recognizable name and deleted at the end.
+
+Usage: python benchmarks/bench_write_behind.py [--rows 2000] [--wal /tmp/wb_wal] [--fsync always]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_helpers import ConnectToDB, NewContactSubmission
+from write_behind import WriteBehindBuffer
+
+BENCH_NAME = "__bench_write_behind__"
+
+
+def Submission(i):
+    return {"HumanName": BENCH_NAME, "EmailAddy": "bench@example.com", "message": f"message {i}"}
+
+
+def RunPosters(post, rows, posters):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=posters) as pool:
+        ok = sum(pool.map(post, range(rows)))
+    return ok, time.perf_counter() - start
+
+
+def BenchDirect(rows, posters):
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok, elapsed = RunPosters(lambda i: NewContactSubmission(Submission(i)), rows, posters)
+    return {"rows": ok, "seconds": round(elapsed, 3), "rows_per_sec": round(ok / elapsed, 1)}
+
+
+def BenchWriteBehind(rows, posters, args):
+    buffer = WriteBehindBuffer(wal_dir=args.wal, max_rows=args.batch, max_delay_ms=args.delay_ms,
+                               queue_size=rows + 1, fsync=args.fsync)
+    with contextlib.redirect_stdout(io.StringIO()):
+        buffer.Start()
+        ok, accept_seconds = RunPosters(lambda i: buffer.Submit("contact_me", Submission(i)), rows, posters)
+        while buffer.pending:  # WAIT UNTIL EVERYTHING IS COMMITTED
+            time.sleep(0.001)
+        buffer.Shutdown()
+    return ok, accept_seconds, buffer
+
+
+def Cleanup():
+    conn = ConnectToDB()
+    if conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM contact_me WHERE name = %s", (BENCH_NAME,))
+        conn.commit()
+        conn.close()
+
+
+def Main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--posters", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--delay-ms", type=int, default=20)
+    parser.add_argument("--wal", default="")
+    parser.add_argument("--fsync", choices=["never", "always"], default="never")
+    args = parser.parse_args()
+
+    results = []
+    try:
+        for posters in args.posters:
+            direct = BenchDirect(args.rows, posters)
+
+            start = time.perf_counter()
+            ok, accept_seconds, buffer = BenchWriteBehind(args.rows, posters, args)
+            committed_seconds = time.perf_counter() - start
+
+            results.append({
+                "posters": posters,
+                "direct": direct,
+                "write_behind": {
+                    "rows": buffer.stats["flushed"],
+                    "batches": buffer.stats["batches"],
+                    "accept_seconds": round(accept_seconds, 3),
+                    "committed_seconds": round(committed_seconds, 3),
+                    "rows_per_sec": round(buffer.stats["flushed"] / committed_seconds, 1),
+                },
+            })
+    finally:
+        Cleanup()
+
+    print(json.dumps({"durability": {"wal": bool(args.wal), "fsync": args.fsync}, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    Main()
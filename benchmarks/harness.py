@@ -0,0 +1,278 @@
+"""Shared pieces for the benchmark scripts: a throwaway Postgres, a stub SMTP server, an app server
+launcher, an HTTP load driver and RSS sampling. Standard library + psycopg2 only.
+"""
+import os
+import sys
+import glob
+import time
+import shutil
+import socket
+import tempfile
+import threading
+import subprocess
+import socketserver
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg2
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA = os.path.join(ROOT, "benchmarks", "schema.sql")
+MIGRATIONS = sorted(glob.glob(os.path.join(ROOT, "migrations", "*.sql")))
+
+
+def FreePort():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def WaitForPort(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def Percentiles(latencies):
+    latencies = sorted(latencies)
+    pick = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 2) if latencies else None
+    return {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+
+# ============================================ THROWAWAY POSTGRES ============================================
+def FindPostgresBin(name):
+    found = shutil.which(name)
+    if found:
+        return found
+    candidates = sorted(glob.glob(f"/usr/lib/postgresql/*/bin/{name}"))
+    if candidates:
+        return candidates[-1]
+    raise FileNotFoundError(f"{name} not found - install PostgreSQL server binaries")
+
+
+class ThrowawayPostgres:
+    """A private cluster in a temp dir on a free port, with the app schema and every migration applied"""
+
+    def __init__(self, database="portfolio_site"):
+        self.database = database
+        self.port = FreePort()
+        self.data_dir = tempfile.mkdtemp(prefix="redeux_bench_pg_")
+        self.pg_ctl = FindPostgresBin("pg_ctl")
+
+    def Env(self):
+        return {
+            "POSTGRES_HOST": "127.0.0.1",
+            "POSTGRES_PORT": str(self.port),
+            "POSTGRES_DB": self.database,
+            "POSTGRES_USER": "postgres",
+            "POSTGRES_PASSWORD": "",
+        }
+
+    def Connect(self, database=None):
+        return psycopg2.connect(host="127.0.0.1", port=self.port, user="postgres",
+                                database=database or self.database)
+
+    def Start(self):
+        subprocess.run([FindPostgresBin("initdb"), "-D", self.data_dir, "-U", "postgres",
+                        "--auth=trust", "-E", "UTF8"], check=True, capture_output=True)
+        options = f"-p {self.port} -k {self.data_dir} -c listen_addresses=127.0.0.1"
+        subprocess.run([self.pg_ctl, "-D", self.data_dir, "-o", options, "-l",
+                        os.path.join(self.data_dir, "server.log"), "-w", "start"],
+                       check=True, capture_output=True)
+
+        conn = self.Connect("postgres")
+        conn.autocommit = True
+        conn.cursor().execute(f"CREATE DATABASE {self.database}")
+        conn.close()
+
+        conn = self.Connect()
+        cursor = conn.cursor()
+        for path in [SCHEMA] + MIGRATIONS:
+            with open(path) as f:
+                cursor.execute(f.read())
+        conn.commit()
+        conn.close()
+        return self
+
+    def Stop(self):
+        subprocess.run([self.pg_ctl, "-D", self.data_dir, "-m", "fast", "-w", "stop"], capture_output=True)
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+
+# ============================================ STUB SMTP ============================================
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib/aiosmtplib without TLS: accepts any AUTH and counts messages"""
+
+    def Reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.Reply("220 bench-smtp ready")
+        in_data = False
+        for line in self.rfile:
+            if in_data:
+                if line.rstrip(b"\r\n") == b".":
+                    in_data = False
+                    with self.server.lock:
+                        self.server.messages += 1
+                    self.Reply("250 OK queued")
+                continue
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.Reply("250-bench-smtp")
+                self.Reply("250 AUTH PLAIN LOGIN")
+            elif command == b"AUTH":
+                self.Reply("235 Authentication successful")
+            elif command == b"DATA":
+                in_data = True
+                self.Reply("354 End data with <CR><LF>.<CR><LF>")
+            elif command == b"QUIT":
+                self.Reply("221 Bye")
+                return
+            else:
+                self.Reply("250 OK")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", FreePort()), SMTPSinkHandler)
+        self.port = self.server_address[1]
+        self.lock = threading.Lock()
+        self.messages = 0
+
+    def Start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def Env(self):
+        return {"SMTP_HOST": "127.0.0.1", "SMTP_PORT": str(self.port), "SMTP_STARTTLS": "0"}
+
+
+# ============================================ APP SERVER ============================================
+def StartApp(port, env, workers=4, worker_class="sync", threads=1):
+    command = [sys.executable, "-m", "gunicorn", "-w", str(workers), "-k", worker_class,
+               "--threads", str(threads), "-b", f"127.0.0.1:{port}", "--timeout", "300", "app:app"]
+    server = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if not WaitForPort(port, timeout=60):
+        server.kill()
+        raise RuntimeError("app server did not start")
+    return server
+
+
+def ProcessTree(pid):
+    pids = [pid]
+    for task in glob.glob(f"/proc/{pid}/task/*/children"):
+        try:
+            with open(task) as f:
+                for child in f.read().split():
+                    pids.extend(ProcessTree(int(child)))
+        except OSError:
+            pass
+    return pids
+
+
+def RSSMegabytes(pid):
+    """Resident memory of a process and all its children (gunicorn master + workers), from /proc"""
+    total_kb = 0
+    for member in ProcessTree(pid):
+        try:
+            with open(f"/proc/{member}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+        except OSError:
+            pass
+    return round(total_kb / 1024, 1)
+
+
+# ============================================ LOAD DRIVER ============================================
+class Client:
+    """One keep-alive connection carrying a session cookie"""
+
+    def __init__(self, port, cookie=None):
+        self.port = port
+        self.cookie = cookie
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+
+    def Request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.cookie:
+            headers["Cookie"] = self.cookie
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            self.conn.close()
+            self.conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=300)
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+        data = response.read()
+        if response.getheader("Connection", "").lower() == "close":
+            self.conn.close()
+        return response, data
+
+
+def Login(port, password):
+    response, _ = Client(port).Request(
+        "POST", "/admin/login", body=f"password={password}",
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    cookie = response.getheader("Set-Cookie", "")
+    if "session=" not in cookie:
+        raise RuntimeError("admin login failed - check ADMIN_PASSWORD/SECRET_KEY")
+    return cookie.split(";", 1)[0]
+
+
+def CheckLoggedIn(port, cookie, tries=8):
+    """Raise unless the admin cookie is accepted - several requests so each worker behind the port gets asked"""
+    for _ in range(tries):
+        response, _ = Client(port, cookie).Request("GET", "/admin")
+        if response.status != 200:
+            raise RuntimeError(f"admin session rejected ({response.status} {response.getheader('Location', '')})"
+                               " - timings would measure the login redirect")
+
+
+def Drive(port, method, path, total, concurrency, cookie=None, body_for=None, headers=None, expect=(200, 304)):
+    """Fire `total` requests over `concurrency` keep-alive connections; body_for(i) makes per-request bodies.
+    Any status outside `expect` (a redirect to the login page, a 429, a 5xx) counts as an error."""
+    local = threading.local()
+    latencies, errors, statuses = [], [0], {}
+    lock = threading.Lock()
+
+    def One(i):
+        if not hasattr(local, "client"):
+            local.client = Client(port, cookie)
+        start = time.perf_counter()
+        try:
+            response, _ = local.client.Request(method, path, body_for(i) if body_for else None, headers)
+            status = response.status
+        except Exception:
+            status = "exception"
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            errors[0] += status not in expect
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(One, range(total)))
+    elapsed = time.perf_counter() - start
+
+    if errors[0]:
+        print(f"⚠️ {method} {path}: {errors[0]}/{total} unexpected responses {statuses}", file=sys.stderr)
+    return {
+        "requests": total,
+        "errors": errors[0],
+        "statuses": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        "rps": round(total / elapsed, 1),
+        **Percentiles(latencies),
+    }
@@ -0,0 +1,58 @@
+-- ============================================ BENCHMARK BASE SCHEMA ============================================
+-- The tables db_helpers reads and writes, for a throwaway benchmark database.
+-- migrations/*.sql are applied on top of this by benchmarks/harness.py.
+
+CREATE TABLE IF NOT EXISTS contact_me (
+    id          SERIAL PRIMARY KEY,
+    name        TEXT,
+    email       TEXT,
+    message     TEXT,
+    status      TEXT      DEFAULT 'unread',
+    timestamp   TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS support (
+    id          SERIAL PRIMARY KEY,
+    name        TEXT,
+    email       TEXT,
+    page        TEXT,
+    issue       TEXT,
+    status      TEXT      DEFAULT 'new',
+    timestamp   TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS game_feedback (
+    id          SERIAL PRIMARY KEY,
+    name        TEXT,
+    email       TEXT,
+    stars       INTEGER,
+    review      TEXT,
+    status      TEXT      DEFAULT 'new',
+    timestamp   TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS app_requests (
+    id                SERIAL PRIMARY KEY,
+    name              TEXT,
+    email             TEXT,
+    phone             TEXT,
+    type              TEXT,
+    project_timeline  TEXT,
+    project_details   TEXT,
+    status            TEXT      DEFAULT 'new',
+    notes             TEXT,
+    archived          BOOLEAN   DEFAULT FALSE,
+    time_submitted    TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS wishlist (
+    wishlist_id       SERIAL PRIMARY KEY,
+    source            TEXT,
+    enhancement_type  TEXT,
+    details           TEXT,
+    status            TEXT      DEFAULT 'not_started',
+    notes             TEXT      DEFAULT '',
+    archived          BOOLEAN   DEFAULT FALSE,
+    created_at        TIMESTAMP DEFAULT NOW(),
+    updated_at        TIMESTAMP DEFAULT NOW()
+);
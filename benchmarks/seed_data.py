@@ -0,0 +1,254 @@
+"""Bulk-load synthetic rows into contact_me, support, game_feedback, wishlist and app_requests.
+
+Rows are generated in chunks across worker processes and streamed in with COPY, one transaction per chunk.
+Distributions aim to look like production: traffic grows toward the present and peaks in the daytime,
+older rows are mostly handled/archived, a few senders write many times, star ratings skew high and text
+lengths are long-tailed. Targets whatever POSTGRES_* points at (see db_helpers.DB_SETTINGS).
+
+Usage:
+  python benchmarks/seed_data.py --rows 1000000                      # 1M rows in every table
+  python benchmarks/seed_data.py --rows 100000 --table support=2000000 --truncate --processes 8
+"""
+import os
+import io
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_helpers import ConnectToDB
+
+CHUNK_ROWS = 50000
+
+FIRST_NAMES = ["Ava", "Liam", "Maya", "Noah", "Zoe", "Ethan", "Ivy", "Lucas", "Nora", "Owen", "Ruby", "Kai",
+               "Elena", "Mateo", "Aria", "Leo", "Chloe", "Jin", "Priya", "Omar", "Sofia", "Dev", "Hana", "Sam"]
+LAST_NAMES = ["Nguyen", "Smith", "Garcia", "Kim", "Patel", "Johnson", "Lopez", "Brown", "Singh", "Chen",
+              "Martin", "Davis", "Khan", "Rossi", "Muller", "Silva", "Cohen", "Ali", "Novak", "Sato"]
+DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "icloud.com", "proton.me", "hotmail.com"]
+
+WORDS = {
+    "contact": "hi love your portfolio site question about hiring freelance project collaboration resume "
+               "available work design game music art commission rates timeline email back thanks".split(),
+    "support": "page broken error loading slow mobile button click nothing happens level stuck crash audio "
+               "converter upload failed file download blank screen safari chrome firefox after update".split(),
+    "review": "fun game cat levels boss hard easy music art cute love controls jump bug replay short long "
+              "favorite great awesome frustrating addictive more please sequel".split(),
+    "wishlist": "add level select screen save progress dark mode sound toggle leaderboard mobile controls "
+                "tutorial skip cutscene faster loading accessibility colorblind settings menu".split(),
+    "app_requests": "need website app bakery shop online ordering booking portfolio store small business "
+                    "landing page mobile ios android payments calendar members login blog gallery".split(),
+}
+
+PAGES = [("Home", 30), ("CATastrophe", 35), ("Audio Converter", 20), ("Resume", 10), ("Contact", 5)]
+STARS = [(1, 5), (2, 7), (3, 15), (4, 30), (5, 43)]
+REQUEST_TYPES = [("website", 55), ("mobile app", 25), ("game", 12), ("other", 8)]
+TIMELINES = [("ASAP", 20), ("1-3 months", 45), ("3-6 months", 25), ("flexible", 10)]
+ENHANCEMENT_TYPES = [("feature", 45), ("bug", 35), ("content", 20)]
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 3, 5, 7, 8, 9, 9, 9, 9, 9, 9, 8, 8, 7, 6, 5, 4, 3, 2]
+
+
+def Weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+class RowMaker:
+    """Per-chunk generator: deterministic for a given seed"""
+
+    def __init__(self, seed, days, total_rows):
+        self.rng = random.Random(seed)
+        self.now = datetime.now()
+        self.days = days
+        self.sender_pool = max(100, total_rows // 3)
+
+    def Timestamp(self):
+        """Density grows linearly toward now; hour of day follows HOUR_WEIGHTS"""
+        age_days = self.days * (1 - self.rng.random() ** 0.5)
+        day = self.now - timedelta(days=int(age_days))
+        hour = self.rng.choices(range(24), HOUR_WEIGHTS)[0]
+        stamp = day.replace(hour=hour, minute=self.rng.randrange(60), second=self.rng.randrange(60), microsecond=0)
+        return min(stamp, self.now), age_days
+
+    def Person(self):
+        """Zipf-ish sender choice, so some people write many times"""
+        sender = int(self.sender_pool ** self.rng.random())
+        rng = random.Random(sender)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        return f"{first} {last}", f"{first.lower()}.{last.lower()}{sender}@{rng.choice(DOMAINS)}"
+
+    def Text(self, kind, median_words=25):
+        words = max(3, int(self.rng.lognormvariate(0, 0.8) * median_words))
+        text = " ".join(self.rng.choice(WORDS[kind]) for _ in range(words))
+        return text[0].upper() + text[1:] + "."
+
+    def Handled(self, age_days, fresh, stale):
+        """Probability-of-handled rises with age: `fresh` under a week old, `stale` past a month"""
+        if age_days < 7:
+            return self.rng.random() < fresh
+        if age_days < 30:
+            return self.rng.random() < (fresh + stale) / 2
+        return self.rng.random() < stale
+
+    def contact_me(self):
+        stamp, age = self.Timestamp()
+        name, email = self.Person()
+        status = "read" if self.Handled(age, 0.4, 0.97) else "unread"
+        return (name, email, self.Text("contact"), status, stamp)
+
+    def support(self):
+        stamp, age = self.Timestamp()
+        name, email = self.Person()
+        if self.Handled(age, 0.2, 0.92):
+            status = "resolved"
+        else:
+            status = "in_progress" if self.rng.random() < 0.35 else "new"
+        return (name, email, Weighted(self.rng, PAGES), self.Text("support", 35), status, stamp)
+
+    def game_feedback(self):
+        stamp, age = self.Timestamp()
+        name, email = self.Person()
+        status = "read" if self.Handled(age, 0.5, 0.98) else "new"
+        return (name, email, Weighted(self.rng, STARS), self.Text("review", 20), status, stamp)
+
+    def app_requests(self):
+        stamp, age = self.Timestamp()
+        name, email = self.Person()
+        if self.Handled(age, 0.1, 0.9):
+            status = Weighted(self.rng, [("completed", 40), ("declined", 60)])
+            archived = self.rng.random() < 0.7
+        else:
+            status = Weighted(self.rng, [("new", 50), ("reviewing", 30), ("in_progress", 20)])
+            archived = False
+        phone = f"555-{self.rng.randrange(10000):04d}"
+        return (name, email, phone, Weighted(self.rng, REQUEST_TYPES), Weighted(self.rng, TIMELINES),
+                self.Text("app_requests", 60), status, archived, stamp)
+
+    def wishlist(self):
+        stamp, age = self.Timestamp()
+        if self.Handled(age, 0.1, 0.8):
+            status = Weighted(self.rng, [("completed", 75), ("revisiting", 25)])
+        else:
+            status = Weighted(self.rng, [("not_started", 65), ("in_progress", 35)])
+        archived = status == "completed" and self.rng.random() < 0.5
+        updated = min(stamp + timedelta(days=self.rng.random() * 30), self.now)
+        notes = self.Text("wishlist", 8) if self.rng.random() < 0.3 else ""
+        return (f"Review {self.rng.randrange(1, 10 ** 6)}", Weighted(self.rng, ENHANCEMENT_TYPES),
+                self.Text("wishlist", 15), status, notes, archived, stamp, updated)
+
+
+COLUMNS = {
+    "contact_me": ("name", "email", "message", "status", "timestamp"),
+    "support": ("name", "email", "page", "issue", "status", "timestamp"),
+    "game_feedback": ("name", "email", "stars", "review", "status", "timestamp"),
+    "app_requests": ("name", "email", "phone", "type", "project_timeline", "project_details",
+                     "status", "archived", "time_submitted"),
+    "wishlist": ("source", "enhancement_type", "details", "status", "notes", "archived", "created_at", "updated_at"),
+}
+
+
+def CopyValue(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).replace("\\", "\\\\").replace("\t", " ").replace("\n", " ")
+
+
+def LoadChunk(job):
+    """Generate one chunk and COPY it in - runs in a worker process"""
+    table, count, seed, days, total_rows = job
+    maker = RowMaker(seed, days, total_rows)
+    make_row = getattr(maker, table)
+    buffer = io.StringIO()
+    for _ in range(count):
+        buffer.write("\t".join(CopyValue(v) for v in make_row()) + "\n")
+    buffer.seek(0)
+
+    conn = ConnectToDB()
+    if not conn:
+        raise RuntimeError("no database connection")
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SET statement_timeout = 0")  # A BIG CHUNK CAN OUTLAST THE APP'S DEFAULT
+        cursor.copy_expert(f"COPY {table} ({', '.join(COLUMNS[table])}) FROM STDIN", buffer)
+        conn.commit()
+    finally:
+        conn.close()
+    return table, count
+
+
+def Plan(targets, seed, days, chunk_rows):
+    jobs = []
+    for table, rows in targets.items():
+        for index, start in enumerate(range(0, rows, chunk_rows)):
+            jobs.append((table, min(chunk_rows, rows - start), f"{seed}:{table}:{index}", days, rows))
+    random.Random(seed).shuffle(jobs)  # INTERLEAVE TABLES SO EVERY PROCESS ISN'T FIGHTING OVER ONE
+    return jobs
+
+
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000, help="rows per table")
+    parser.add_argument("--table", action="append", default=[], metavar="TABLE=ROWS",
+                        help="override the row count for one table (repeatable); 0 skips it")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--days", type=int, default=730, help="how far back timestamps go")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--truncate", action="store_true", help="empty the tables first")
+    args = parser.parse_args()
+
+    targets = {table: args.rows for table in COLUMNS}
+    for override in args.table:
+        table, _, rows = override.partition("=")
+        if table not in COLUMNS:
+            parser.error(f"unknown table {table} (choose from {', '.join(COLUMNS)})")
+        targets[table] = int(rows)
+    targets = {table: rows for table, rows in targets.items() if rows > 0}
+
+    conn = ConnectToDB()
+    if not conn:
+        sys.exit(1)
+    if args.truncate:
+        cursor = conn.cursor()
+        cursor.execute(f"TRUNCATE {', '.join(targets)} RESTART IDENTITY")
+        cursor.execute("SELECT to_regclass('archive_history')")
+        if cursor.fetchone()[0]:  # RESTARTED IDS WOULD COLLIDE WITH THE OLD ROWS' HISTORY, SO THAT GOES TOO
+            cursor.execute("DELETE FROM archive_history WHERE source = ANY(%s)", (list(targets),))
+        conn.commit()
+
+    loaded = {table: 0 for table in targets}
+    start = time.perf_counter()
+    with Pool(args.processes) as pool:
+        for table, count in pool.imap_unordered(LoadChunk, Plan(targets, args.seed, args.days, args.chunk)):
+            loaded[table] += count
+            done = sum(loaded.values())
+            print(f"\r{done:,} / {sum(targets.values()):,} rows", end="", file=sys.stderr, flush=True)
+    load_seconds = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    conn.autocommit = True
+    cursor = conn.cursor()
+    if "wishlist" in targets:  # COPY BYPASSES THE HELPERS THAT KEEP wishlist_status_counts CURRENT
+        cursor.execute("SELECT to_regproc('refresh_wishlist_counts') IS NOT NULL")
+        if cursor.fetchone()[0]:
+            cursor.execute("SELECT refresh_wishlist_counts()")
+    cursor.execute(f"ANALYZE {', '.join(targets)}")
+    conn.close()
+
+    total = sum(loaded.values())
+    print(json.dumps({
+        "rows": loaded,
+        "processes": args.processes,
+        "seconds": round(load_seconds, 2),
+        "rows_per_sec": round(total / load_seconds, 1) if load_seconds else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,117 @@
+import os
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # BROTLI IS OPTIONAL - GZIP ONLY WITHOUT IT
+    brotli = None
+
+# ============================================ RESPONSE COMPRESSION ============================================
+# NEGOTIATES br/gzip ON Accept-Encoding. ONLY TEXT-LIKE TYPES ARE COMPRESSED, SO THE MP3 FROM /convert,
+# FONTS AND IMAGES GO OUT UNTOUCHED. STREAMED RESPONSES ARE COMPRESSED CHUNK BY CHUNK WITH A SYNC FLUSH
+# SO THE BROWSER STILL SEES ROWS AS SOON AS THEY ARE RENDERED.
+
+COMPRESS_ENABLED = os.environ.get("COMPRESS_ENABLED", "1") != "0"
+COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", 6))                  # GZIP 1-9
+COMPRESS_BROTLI_QUALITY = int(os.environ.get("COMPRESS_BROTLI_QUALITY", 5))  # BROTLI 0-11
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))        # BYTES
+COMPRESS_MIMETYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/xml",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+}
+
+
+def ChooseEncoding():
+    """Pick the best encoding the client accepts: br if available, then gzip"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"] > 0:
+        return "br"
+    if accepted["gzip"] > 0:
+        return "gzip"
+    return None
+
+
+def NewCompressor(encoding):
+    if encoding == "br":
+        return brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+    return zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)  # WBITS 31 = GZIP CONTAINER
+
+
+def CompressBytes(data, encoding):
+    compressor = NewCompressor(encoding)
+    if encoding == "br":
+        return compressor.process(data) + compressor.finish()
+    return compressor.compress(data) + compressor.flush()
+
+
+def CompressStream(chunks, encoding):
+    """Compress an iterable of chunks, flushing after each so partial output reaches the client"""
+    compressor = NewCompressor(encoding)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if not chunk:
+                continue
+            if encoding == "br":
+                out = compressor.process(chunk) + compressor.flush()
+            else:
+                out = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if out:
+                yield out
+        yield compressor.finish() if encoding == "br" else compressor.flush()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def ShouldCompress(response):
+    if request.method == "HEAD" or response.status_code != 200:
+        return False
+    if "Content-Encoding" in response.headers or "Content-Range" in response.headers:
+        return False
+    if response.mimetype not in COMPRESS_MIMETYPES:
+        return False
+    if "no-transform" in response.headers.get("Cache-Control", ""):
+        return False
+    return True
+
+
+def CompressResponse(response):
+    """after_request hook - compress eligible responses in place"""
+    if not COMPRESS_ENABLED or not ShouldCompress(response):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = ChooseEncoding()
+    if not encoding:
+        return response
+
+    if response.is_streamed or response.direct_passthrough:
+        response.response = CompressStream(response.response, encoding)
+        response.direct_passthrough = False
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(CompressBytes(data, encoding))
+
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:  # SAME CONTENT, DIFFERENT BYTES - ETAG BECOMES WEAK
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def Compress(app):
+    """Register response compression on a Flask app"""
+    app.after_request(CompressResponse)
+    return app
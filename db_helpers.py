@@ -1,18 +1,27 @@
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import os
+import json
+from collections import namedtuple
 from dotenv import load_dotenv
 from datetime import datetime
 
 load_dotenv()
 
+from db_resilience import Connect  # AFTER load_dotenv() - READS DB_* SETTINGS AT IMPORT
+
+DB_SETTINGS = {
+    "host": os.getenv("POSTGRES_HOST", "localhost"),
+    "port": int(os.getenv("POSTGRES_PORT", 5432)),
+    "database": os.getenv("POSTGRES_DB", "portfolio_site"),
+    "user": os.getenv("POSTGRES_USER", "postgres"),
+}
+
 def ConnectToDB():
-    """Connect to PostgreSQL database"""
+    """Connect to PostgreSQL database (timeouts, retries and circuit breaker in db_resilience)"""
     try:
-        conn = psycopg2.connect(
-            host="localhost",
-            database="portfolio_site",
-            user="postgres",
+        conn = Connect(
+            **DB_SETTINGS,
             password=os.getenv("POSTGRES_PASSWORD")
         )
         return conn
@@ -20,6 +29,65 @@ def ConnectToDB():
         print(f"❌ Database connection failed: {e}")
         return None
 
+# ============================================ ROW TYPES ============================================
+# LIST HELPERS RETURN NAMED TUPLES OF JUST THE COLUMNS THE ADMIN TEMPLATES SHOW, NOT RealDictCursor DICTS OF
+# SELECT *: NO PER-ROW DICT OR REPEATED KEY STRINGS (namedtuple IS __slots__ = ()), AND THE search_vector
+# COLUMNS NEVER LEAVE POSTGRES. JINJA READS row.field AND row['field'] THE SAME WAY, SO TEMPLATES DON'T CHANGE.
+# BENCHMARK: benchmarks/bench_rows.py
+ContactRow = namedtuple("ContactRow", "id name email message status timestamp")
+SupportRow = namedtuple("SupportRow", "id name email page issue status timestamp")
+FeedbackRow = namedtuple("FeedbackRow", "id name email stars review status timestamp")
+AppRequestRow = namedtuple("AppRequestRow",
+                           "id name email phone type project_timeline project_details status notes time_submitted")
+WishlistRow = namedtuple("WishlistRow", "wishlist_id source enhancement_type details status notes created_at updated_at")
+
+def Columns(row_type, alias=None):
+    """SELECT list for a row type, in field order"""
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(prefix + field for field in row_type._fields)
+
+def FetchRows(cursor, row_type):
+    """Materialize a plain (tuple) cursor's result as row_type, one row at a time"""
+    make = row_type._make
+    return [make(row) for row in cursor]
+
+# ============================================ LIVE NOTIFICATIONS ============================================
+# INSERTS AND STATUS CHANGES pg_notify() A SMALL JSON EVENT ON NOTIFY_CHANNEL INSIDE THE SAME TRANSACTION, SO
+# LISTENERS (live_updates.py) ONLY HEAR ABOUT COMMITTED ROWS. PAYLOADS CARRY DASHBOARD PREVIEWS, NOT FULL ROWS,
+# TO STAY WELL UNDER POSTGRES' 8000 BYTE NOTIFY LIMIT.
+NOTIFY_CHANNEL = "submissions"
+
+NOTIFY_KINDS = {'contact_me': 'contact', 'support': 'support', 'game_feedback': 'review'}
+PREVIEW_FIELDS = {'contact': 'message', 'support': 'issue', 'review': 'review'}
+PREVIEW_LENGTH = 50
+
+def SubmissionEvent(kind, row, fields):
+    """Build the 'new' event for a freshly inserted row - row is (id, status, timestamp), fields are column values"""
+    row_id, status, timestamp = row
+    text = fields.get(PREVIEW_FIELDS[kind]) or ''
+    event = {
+        'type': 'new',
+        'kind': kind,
+        'id': row_id,
+        'status': status,
+        'date': timestamp.strftime('%m-%d-%Y') if timestamp else '',
+        'name': fields.get('name'),
+        'email': fields.get('email'),
+        'preview': text[:PREVIEW_LENGTH] + ('...' if len(text) > PREVIEW_LENGTH else '')
+    }
+    if kind == 'support':
+        event['page'] = fields.get('page')
+    elif kind == 'review':
+        event['stars'] = fields.get('stars')
+    return event
+
+def StatusEvent(kind, row_id, old_status, new_status):
+    return {'type': 'status', 'kind': kind, 'id': row_id, 'old': old_status, 'new': new_status}
+
+def NotifySubmission(cursor, event):
+    """Queue a notification on the current transaction - delivered to listeners on commit"""
+    cursor.execute("SELECT pg_notify(%s, %s)", (NOTIFY_CHANNEL, json.dumps(event, default=str)))
+
 # ============================================ CONTACT SUBMISSIONS ============================================
 def NewContactSubmission(data):
     """Add a new contact form submission"""
@@ -28,18 +96,21 @@ def NewContactSubmission(data):
         return False
     
     try:
+        fields = {
+            'name': data.get('HumanName'),
+            'email': data.get('EmailAddy'),
+            'message': data.get('message')
+        }
         cursor = conn.cursor()
         cursor.execute("""
             INSERT INTO contact_me 
             (name, email, message)
-            VALUES (%s, %s, %s)
-            RETURNING id
-        """, (
-            data.get('HumanName'),
-            data.get('EmailAddy'),
-            data.get('message')
-        ))
-        submission_id = cursor.fetchone()[0]
+            VALUES (%(name)s, %(email)s, %(message)s)
+            RETURNING id, status, timestamp
+        """, fields)
+        row = cursor.fetchone()
+        submission_id = row[0]
+        NotifySubmission(cursor, SubmissionEvent('contact', row, fields))
         conn.commit()
         cursor.close()
         conn.close()
@@ -53,19 +124,20 @@ def NewContactSubmission(data):
         return False
 
 
-def GetContactSubmissions():
-    """Get all contact submissions (for dashboard)"""
+def GetContactSubmissions(limit=None):
+    """Get contact submissions, newest first (limit=None for all)"""
     conn = ConnectToDB()
     if not conn:
         return []
     
     try:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("""
-            SELECT * FROM contact_me 
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT {Columns(ContactRow)} FROM contact_me 
             ORDER BY timestamp DESC
-        """)
-        results = cursor.fetchall()
+            LIMIT %s
+        """, (limit,))
+        results = FetchRows(cursor, ContactRow)
         cursor.close()
         conn.close()
         return results
@@ -82,11 +154,15 @@ def UpdateContactStatus(submission_id, new_status):
     
     try:
         cursor = conn.cursor()
+        cursor.execute("SELECT status FROM contact_me WHERE id = %s FOR UPDATE", (submission_id,))
+        old = cursor.fetchone()
         cursor.execute("""
             UPDATE contact_me 
             SET status = %s 
             WHERE id = %s
         """, (new_status, submission_id))
+        if old:
+            NotifySubmission(cursor, StatusEvent('contact', submission_id, old[0], new_status))
         conn.commit()
         cursor.close()
         conn.close()
@@ -107,18 +183,21 @@ def NewSupportTicket(data):
         return False
     
     try:
+        fields = {
+            'name': data.get('name'),
+            'email': data.get('email'),
+            'page': data.get('page'),
+            'issue': data.get('issue')
+        }
         cursor = conn.cursor()
         cursor.execute("""
             INSERT INTO support (name, email, page, issue)
-            VALUES (%s, %s, %s, %s)
-            RETURNING id
-        """, (
-            data.get('name'),
-            data.get('email'),
-            data.get('page'),
-            data.get('issue')
-        ))
-        ticket_id = cursor.fetchone()[0]
+            VALUES (%(name)s, %(email)s, %(page)s, %(issue)s)
+            RETURNING id, status, timestamp
+        """, fields)
+        row = cursor.fetchone()
+        ticket_id = row[0]
+        NotifySubmission(cursor, SubmissionEvent('support', row, fields))
         conn.commit()
         cursor.close()
         conn.close()
@@ -130,19 +209,20 @@ def NewSupportTicket(data):
         conn.close()
         return False
 
-def GetSupportTickets():
-    """Get all support tickets (for dashboard)"""
+def GetSupportTickets(limit=None):
+    """Get support tickets, newest first (limit=None for all)"""
     conn = ConnectToDB()
     if not conn:
         return []
     
     try:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("""
-            SELECT * FROM support 
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT {Columns(SupportRow)} FROM support 
             ORDER BY timestamp DESC
-        """)
-        results = cursor.fetchall()
+            LIMIT %s
+        """, (limit,))
+        results = FetchRows(cursor, SupportRow)
         cursor.close()
         conn.close()
         return results
@@ -161,8 +241,9 @@ def update_support_status(ticket_id, new_status):
     try:
         cursor = conn.cursor()
         # First check if the ticket exists
-        cursor.execute("SELECT id FROM support WHERE id = %s", (ticket_id,))
-        if not cursor.fetchone():
+        cursor.execute("SELECT status FROM support WHERE id = %s FOR UPDATE", (ticket_id,))
+        old = cursor.fetchone()
+        if not old:
             print(f"❌ Support ticket {ticket_id} not found")
             cursor.close()
             conn.close()
@@ -176,6 +257,7 @@ def update_support_status(ticket_id, new_status):
         """, (new_status, ticket_id))
         
         rows_affected = cursor.rowcount
+        NotifySubmission(cursor, StatusEvent('support', ticket_id, old[0], new_status))
         conn.commit()
         cursor.close()
         conn.close()
@@ -203,19 +285,22 @@ def NewGameFeedback(data):
         return False
 
     try:
+        fields = {
+            "name": data.get("name"),
+            "email": data.get("email"),
+            "stars": data.get("stars"),
+            "review": data.get("review")
+        }
         cursor = conn.cursor()
         cursor.execute("""
             INSERT INTO game_feedback (name, email, stars, review)
-            VALUES (%s, %s, %s, %s)
-            RETURNING id
-        """, (
-            data.get("name"),
-            data.get("email"),
-            data.get("stars"),
-            data.get("review")
-        ))
+            VALUES (%(name)s, %(email)s, %(stars)s, %(review)s)
+            RETURNING id, status, timestamp
+        """, fields)
 
-        feedback_id = cursor.fetchone()[0]
+        row = cursor.fetchone()
+        feedback_id = row[0]
+        NotifySubmission(cursor, SubmissionEvent('review', row, fields))
         conn.commit()
         cursor.close()
         conn.close()
@@ -230,23 +315,23 @@ def NewGameFeedback(data):
         return False
 
 
-def GetGameFeedback():
-    """Get all game feedback (admin/dashboard use)"""
+def GetGameFeedback(limit=None):
+    """Get game feedback, newest first (limit=None for all)"""
     conn = ConnectToDB()
     if not conn:
         return []
-
+    
     try:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("""
-            SELECT * FROM game_feedback
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT {Columns(FeedbackRow)} FROM game_feedback 
             ORDER BY timestamp DESC
-        """)
-        results = cursor.fetchall()
+            LIMIT %s
+        """, (limit,))
+        results = FetchRows(cursor, FeedbackRow)
         cursor.close()
         conn.close()
         return results
-
     except Exception as e:
         print(f"❌ Error fetching game feedback: {e}")
         conn.close()
@@ -260,11 +345,15 @@ def update_feedback_status(feedback_id, new_status):
     
     try:
         cursor = conn.cursor()
+        cursor.execute("SELECT status FROM game_feedback WHERE id = %s FOR UPDATE", (feedback_id,))
+        old = cursor.fetchone()
         cursor.execute("""
             UPDATE game_feedback 
             SET status = %s 
             WHERE id = %s
         """, (new_status, feedback_id))
+        if old:
+            NotifySubmission(cursor, StatusEvent('review', feedback_id, old[0], new_status))
         conn.commit()
         cursor.close()
         conn.close()
@@ -326,6 +415,9 @@ def submit_app_request(name, email, phone, request_type, timeline, budget, addit
         conn.close()
         return False
 
+APP_REQUEST_STATUSES = ('new', 'reviewing', 'in_progress', 'completed', 'declined')
+APP_REQUESTS_PER_PAGE = int(os.getenv("APP_REQUESTS_PER_PAGE", 25))
+
 def get_all_app_requests():
     """Get all app/website requests"""
     conn = ConnectToDB()
@@ -333,14 +425,14 @@ def get_all_app_requests():
         return []
     
     try:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("""
-            SELECT * FROM app_requests 
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT {Columns(AppRequestRow)} FROM app_requests 
             WHERE archived = FALSE
             ORDER BY time_submitted DESC
         """)
         
-        requests = cursor.fetchall()
+        requests = FetchRows(cursor, AppRequestRow)
         cursor.close()
         conn.close()
         return requests
@@ -349,41 +441,61 @@ def get_all_app_requests():
         conn.close()
         return []
 
+def get_app_requests_page(filter_status=None, page=1, per_page=APP_REQUESTS_PER_PAGE):
+    """Get one page of live app requests, newest first, optionally filtered by status"""
+    conn = ConnectToDB()
+    if not conn:
+        return []
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT {Columns(AppRequestRow)} FROM app_requests
+            WHERE archived = FALSE
+              AND (%(status)s IS NULL OR status = %(status)s)
+            ORDER BY time_submitted DESC, id DESC
+            LIMIT %(limit)s OFFSET %(offset)s
+        """, {
+            'status': filter_status or None,
+            'limit': per_page,
+            'offset': (page - 1) * per_page
+        })
+        requests = FetchRows(cursor, AppRequestRow)
+        cursor.close()
+        conn.close()
+        return requests
+    except Exception as e:
+        print(f"❌ Error fetching app requests page: {e}")
+        conn.close()
+        return []
+
 def get_app_request_stats():
-    """Get statistics for app requests"""
+    """Get total, per-status and this-week counts for live app requests in one scan"""
+    empty = {'total_requests': 0, 'this_week': 0, **{f'{status}_requests': 0 for status in APP_REQUEST_STATUSES}}
     conn = ConnectToDB()
     if not conn:
-        return {'total_requests': 0, 'new_requests': 0, 'recent_requests': []}
+        return empty
     
     try:
         cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cursor.execute("SELECT COUNT(*) as total FROM app_requests WHERE archived = FALSE")
-        total = cursor.fetchone()['total']
-        
-        cursor.execute("SELECT COUNT(*) as new FROM app_requests WHERE status = 'new' AND archived = FALSE")
-        new = cursor.fetchone()['new']
-        
-        cursor.execute("""
-            SELECT * FROM app_requests 
+        by_status = ",\n".join(
+            f"COUNT(*) FILTER (WHERE status = '{status}') AS {status}_requests" for status in APP_REQUEST_STATUSES
+        )
+        cursor.execute(f"""
+            SELECT COUNT(*) AS total_requests,
+                   COUNT(*) FILTER (WHERE time_submitted > NOW() - INTERVAL '7 days') AS this_week,
+                   {by_status}
+            FROM app_requests
             WHERE archived = FALSE
-            ORDER BY time_submitted DESC 
-            LIMIT 5
         """)
-        recent = cursor.fetchall()
-        
+        stats = cursor.fetchone()
         cursor.close()
         conn.close()
-        
-        return {
-            'total_requests': total,
-            'new_requests': new,
-            'recent_requests': recent
-        }
+        return stats
     except Exception as e:
         print(f"❌ Error fetching app request stats: {e}")
         conn.close()
-        return {'total_requests': 0, 'new_requests': 0, 'recent_requests': []}
+        return empty
 
 def update_app_request_status(request_id, status):
     """Update the status of an app request"""
@@ -457,7 +569,115 @@ def archive_app_request_db(request_id):
         conn.close()
         return False
 
+def bulk_update_app_requests(request_ids, status=None, archive=False):
+    """Set a status on (or archive) many app requests in one statement - returns rows changed"""
+    conn = ConnectToDB()
+    if not conn:
+        return 0
+
+    try:
+        cursor = conn.cursor()
+        if archive:
+            cursor.execute("""
+                UPDATE app_requests
+                SET archived = TRUE
+                WHERE id = ANY(%s) AND archived = FALSE
+            """, (list(request_ids),))
+        else:
+            cursor.execute("""
+                UPDATE app_requests
+                SET status = %s
+                WHERE id = ANY(%s) AND status IS DISTINCT FROM %s
+            """, (status, list(request_ids), status))
+        changed = cursor.rowcount
+        conn.commit()
+        cursor.close()
+        conn.close()
+        print(f"✅ Bulk {'archived' if archive else f'set {status} on'} {changed} app requests")
+        return changed
+    except Exception as e:
+        print(f"❌ Error bulk updating app requests: {e}")
+        conn.rollback()
+        conn.close()
+        return 0
+
 # ============================================ WISHLIST ============================================
+# LIVE ITEM COUNTS PER STATUS ARE KEPT IN wishlist_status_counts (migrations/004) BY THE WRITE HELPERS BELOW,
+# IN THE SAME TRANSACTION AS THE ROW CHANGE, SO THE ADMIN SUMMARY NEVER COUNTS THE TABLE.
+WISHLIST_STATUSES = ('not_started', 'in_progress', 'completed', 'revisiting')
+
+wishlist_counts_ready = False
+
+def WishlistCountsReady(cursor):
+    """Has migration 004 been applied? Checked until it has, then remembered"""
+    global wishlist_counts_ready
+    if not wishlist_counts_ready:
+        check = cursor.connection.cursor()  # PLAIN TUPLE CURSOR, SAME TRANSACTION
+        check.execute("SELECT to_regclass('wishlist_status_counts') IS NOT NULL")
+        wishlist_counts_ready = check.fetchone()[0]
+        check.close()
+    return wishlist_counts_ready
+
+def AdjustWishlistCount(cursor, old_status, new_status):
+    """Move one live item between status counters (None = not live) inside the caller's transaction"""
+    if old_status == new_status or not WishlistCountsReady(cursor):
+        return
+    if old_status is not None:
+        cursor.execute("""
+            UPDATE wishlist_status_counts SET item_count = item_count - 1 WHERE status = %s
+        """, (old_status,))
+    if new_status is not None:
+        cursor.execute("""
+            INSERT INTO wishlist_status_counts (status, item_count) VALUES (%s, 1)
+            ON CONFLICT (status) DO UPDATE SET item_count = wishlist_status_counts.item_count + 1
+        """, (new_status,))
+
+def WishlistCounts(cursor):
+    """Per-status live counts plus 'total' - counter table, or one GROUP BY if migration 004 hasn't run"""
+    if WishlistCountsReady(cursor):
+        cursor.execute("SELECT status, item_count AS count FROM wishlist_status_counts")
+    else:
+        cursor.execute("""
+            SELECT status, COUNT(*) AS count FROM wishlist
+            WHERE archived = FALSE
+            GROUP BY status
+        """)
+    counts = {status: 0 for status in WISHLIST_STATUSES}
+    counts.update({row['status']: row['count'] for row in cursor.fetchall()})
+    counts['total'] = sum(counts.values())
+    return counts
+
+def WishlistCountsEmpty():
+    counts = {status: 0 for status in WISHLIST_STATUSES}
+    counts['total'] = 0
+    return counts
+
+def GetWishlistSummary(filter_status=None, include_items=True):
+    """Status counts and the (optionally filtered) live items on one connection"""
+    conn = ConnectToDB()
+    if not conn:
+        return {'counts': WishlistCountsEmpty(), 'items': []}
+    try:
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        counts = WishlistCounts(cursor)
+        items = []
+        if include_items:
+            rows = conn.cursor()
+            rows.execute(f"""
+                SELECT {Columns(WishlistRow)} FROM wishlist 
+                WHERE archived = FALSE AND (%(status)s::text IS NULL OR status = %(status)s)
+                ORDER BY created_at DESC
+            """, {'status': filter_status or None})
+            items = FetchRows(rows, WishlistRow)
+            rows.close()
+        cursor.close()
+        conn.close()
+        return {'counts': counts, 'items': items}
+    except Exception as e:
+        print(f"❌ Error fetching wishlist summary: {e}")
+        conn.close()
+        return {'counts': WishlistCountsEmpty(), 'items': []}
+
 def NewWishlistItem(data):
     """Add a new enhancement/improvement to wishlist"""
     conn = ConnectToDB()
@@ -478,6 +698,7 @@ def NewWishlistItem(data):
             data.get('notes', '')
         ))
         wishlist_id = cursor.fetchone()[0]
+        AdjustWishlistCount(cursor, None, data.get('status', 'not_started'))
         conn.commit()
         cursor.close()
         conn.close()
@@ -489,36 +710,6 @@ def NewWishlistItem(data):
         conn.close()
         return False
 
-def GetWishlist(filter_status=None):
-    """Get all wishlist items, optionally filtered by status"""
-    conn = ConnectToDB()
-    if not conn:
-        return []
-    try:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        if filter_status:
-            cursor.execute("""
-                SELECT * FROM wishlist 
-                WHERE status = %s AND archived = FALSE
-                ORDER BY created_at DESC
-            """, (filter_status,))
-        else:
-            cursor.execute("""
-                SELECT * FROM wishlist 
-                WHERE archived = FALSE
-                ORDER BY created_at DESC
-            """)
-        
-        results = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return results
-    except Exception as e:
-        print(f"❌ Error fetching wishlist: {e}")
-        conn.close()
-        return []
-
 def update_wishlist_status(wishlist_id, new_status):
     """Update the status of a wishlist item"""
     conn = ConnectToDB()
@@ -528,11 +719,16 @@ def update_wishlist_status(wishlist_id, new_status):
     try:
         cursor = conn.cursor()
         cursor.execute("""
-            UPDATE wishlist 
+            UPDATE wishlist w
             SET status = %s,
                 updated_at = CURRENT_TIMESTAMP
-            WHERE wishlist_id = %s
+            FROM (SELECT wishlist_id, status, archived FROM wishlist WHERE wishlist_id = %s FOR UPDATE) prev
+            WHERE w.wishlist_id = prev.wishlist_id
+            RETURNING prev.status, prev.archived
         """, (new_status, wishlist_id))
+        old = cursor.fetchone()
+        if old and not old[1]:
+            AdjustWishlistCount(cursor, old[0], new_status)
         conn.commit()
         cursor.close()
         conn.close()
@@ -580,8 +776,12 @@ def archive_wishlist_item_db(wishlist_id):
         cursor.execute("""
             UPDATE wishlist 
             SET archived = TRUE, updated_at = NOW()
-            WHERE wishlist_id = %s
+            WHERE wishlist_id = %s AND archived = FALSE
+            RETURNING status
         """, (wishlist_id,))
+        row = cursor.fetchone()
+        if row:
+            AdjustWishlistCount(cursor, row[0], None)
         conn.commit()
         cursor.close()
         conn.close()
@@ -604,7 +804,11 @@ def delete_wishlist_item_db(wishlist_id):
         cursor.execute("""
             DELETE FROM wishlist 
             WHERE wishlist_id = %s
+            RETURNING status, archived
         """, (wishlist_id,))
+        row = cursor.fetchone()
+        if row and not row[1]:
+            AdjustWishlistCount(cursor, row[0], None)
         conn.commit()
         cursor.close()
         conn.close()
@@ -614,4 +818,291 @@ def delete_wishlist_item_db(wishlist_id):
         print(f"❌ Error deleting wishlist item: {e}")
         conn.rollback()
         conn.close()
-        return False
\ No newline at end of file
+        return False
+
+# ============================================ STREAMING READS (SERVER-SIDE CURSORS) ============================================
+STREAM_ITERSIZE = int(os.getenv("STREAM_ITERSIZE", 500))
+
+def StreamRows(query, row_type, params=None, label="rows"):
+    """Yield row_type tuples one at a time from a named (server-side) cursor so memory stays flat"""
+    conn = ConnectToDB()
+    if not conn:
+        return
+
+    try:
+        cursor = conn.cursor(name=f"stream_{label}")
+        cursor.itersize = STREAM_ITERSIZE
+        cursor.execute(query, params)
+        make = row_type._make
+        for row in cursor:
+            yield make(row)
+        cursor.close()
+    except Exception as e:
+        print(f"❌ Error streaming {label}: {e}")
+    finally:
+        conn.close()
+
+def CountByStatus(table, where="TRUE"):
+    """Get total and per-status counts for a table in one query"""
+    conn = ConnectToDB()
+    if not conn:
+        return {'total': 0}
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT status, COUNT(*) FROM {table}
+            WHERE {where}
+            GROUP BY status
+        """)
+        counts = {status: count for status, count in cursor.fetchall()}
+        counts['total'] = sum(counts.values())
+        cursor.close()
+        conn.close()
+        return counts
+    except Exception as e:
+        print(f"❌ Error counting {table}: {e}")
+        conn.close()
+        return {'total': 0}
+
+def StreamContactSubmissions():
+    """Stream all contact submissions, newest first"""
+    return StreamRows(f"""
+        SELECT {Columns(ContactRow)} FROM contact_me
+        ORDER BY timestamp DESC
+    """, ContactRow, label="contacts")
+
+def StreamSupportTickets():
+    """Stream all support tickets: new/in progress first, then resolved"""
+    return StreamRows(f"""
+        SELECT {Columns(SupportRow)} FROM support
+        WHERE status IS NULL OR status IN ('new', 'in_progress', 'resolved')
+        ORDER BY (status = 'resolved') IS TRUE, timestamp DESC
+    """, SupportRow, label="support")
+
+def StreamGameFeedback():
+    """Stream all game feedback: new/added to wishlist first, then read"""
+    return StreamRows(f"""
+        SELECT {Columns(FeedbackRow)} FROM game_feedback
+        WHERE status IS NULL OR status IN ('new', 'added_to_wishlist', 'read')
+        ORDER BY (status = 'read') IS TRUE, timestamp DESC
+    """, FeedbackRow, label="feedback")
+
+def StreamWishlist(filter_status=None):
+    """Stream non-archived wishlist items, optionally filtered by status"""
+    return StreamRows(f"""
+        SELECT {Columns(WishlistRow)} FROM wishlist
+        WHERE archived = FALSE AND (%(status)s::text IS NULL OR status = %(status)s)
+        ORDER BY created_at DESC
+    """, WishlistRow, {'status': filter_status or None}, label="wishlist")
+
+
+# ============================================ FULL-TEXT SEARCH ============================================
+# BACKED BY THE search_vector COLUMNS + GIN INDEXES FROM migrations/001_full_text_search.sql
+SEARCH_HIGHLIGHT_START = "[[hl]]"
+SEARCH_HIGHLIGHT_STOP = "[[/hl]]"
+
+def SearchSubmissions(query, page=1, per_page=25):
+    """Ranked, paginated search across contacts, support tickets, game reviews and the wishlist"""
+    empty = {'results': [], 'total': 0, 'page': page, 'per_page': per_page}
+    if not query or not query.strip():
+        return empty
+
+    conn = ConnectToDB()
+    if not conn:
+        return empty
+
+    try:
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor.execute("""
+            WITH q AS (
+                SELECT websearch_to_tsquery('english', %(query)s) || websearch_to_tsquery('simple', %(query)s) AS query
+            ),
+            hits AS (
+                SELECT 'contact' AS source, c.id, c.name AS title, c.message AS body, c.status,
+                       c.timestamp AS created_at, ts_rank(c.search_vector, q.query) AS rank
+                FROM contact_me c, q WHERE c.search_vector @@ q.query
+                UNION ALL
+                SELECT 'support', s.id, s.name, s.issue, s.status,
+                       s.timestamp, ts_rank(s.search_vector, q.query)
+                FROM support s, q WHERE s.search_vector @@ q.query
+                UNION ALL
+                SELECT 'review', g.id, g.name, g.review, g.status,
+                       g.timestamp, ts_rank(g.search_vector, q.query)
+                FROM game_feedback g, q WHERE g.search_vector @@ q.query
+                UNION ALL
+                SELECT 'wishlist', w.wishlist_id, w.source, concat_ws(E'\n', w.details, w.notes), w.status,
+                       w.created_at, ts_rank(w.search_vector, q.query)
+                FROM wishlist w, q WHERE w.search_vector @@ q.query
+            ),
+            page AS (
+                SELECT *, COUNT(*) OVER () AS total
+                FROM hits
+                ORDER BY rank DESC, created_at DESC
+                LIMIT %(limit)s OFFSET %(offset)s
+            )
+            SELECT page.source, page.id, page.title, page.status, page.created_at, page.rank, page.total,
+                   ts_headline('english', page.body, q.query, %(headline)s) AS snippet
+            FROM page, q
+            ORDER BY page.rank DESC, page.created_at DESC
+        """, {
+            'query': query,
+            'limit': per_page,
+            'offset': (page - 1) * per_page,
+            'headline': f"MaxFragments=2, MaxWords=30, MinWords=10, "
+                        f"StartSel={SEARCH_HIGHLIGHT_START}, StopSel={SEARCH_HIGHLIGHT_STOP}",
+        })
+        results = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return {
+            'results': results,
+            'total': results[0]['total'] if results else 0,
+            'page': page,
+            'per_page': per_page
+        }
+    except Exception as e:
+        print(f"❌ Error searching submissions: {e}")
+        conn.close()
+        return empty
+
+# ============================================ ARCHIVE HISTORY (COLD TIER) ============================================
+def ArchiveRows(table, id_column, created_column, where, params=None, batch_size=1000):
+    """Move rows matching `where` from a hot table into archive_history in batches - returns how many moved"""
+    conn = ConnectToDB()
+    if not conn:
+        return 0
+
+    moved = conflicts = 0
+    after = None  # KEYSET - ROWS LEFT BEHIND ON CONFLICT ARE NOT PICKED AGAIN IN THE SAME RUN
+    try:
+        cursor = conn.cursor()
+        while True:
+            # INSERT FIRST, THEN DELETE ONLY WHAT HISTORY ACCEPTED. A (source, source_id) ALREADY IN HISTORY (IDS
+            # REUSED AFTER TRUNCATE ... RESTART IDENTITY) STAYS IN THE HOT TABLE RATHER THAN BEING DELETED UNSAVED.
+            cursor.execute(f"""
+                WITH batch AS (
+                    SELECT * FROM {table}
+                    WHERE ({where}) AND (%(after)s::bigint IS NULL OR {id_column} > %(after)s)
+                    ORDER BY {id_column}
+                    LIMIT %(batch_size)s
+                    FOR UPDATE SKIP LOCKED
+                ),
+                kept AS (
+                    INSERT INTO archive_history (source, source_id, status, created_at, data)
+                    SELECT %(source)s, batch.{id_column}, batch.status, batch.{created_column},
+                           to_jsonb(batch) - 'search_vector'
+                    FROM batch
+                    ON CONFLICT (source, source_id) DO NOTHING
+                    RETURNING source_id
+                ),
+                removed AS (
+                    DELETE FROM {table} t
+                    USING kept
+                    WHERE t.{id_column} = kept.source_id
+                    RETURNING t.{id_column}
+                )
+                SELECT (SELECT COUNT(*) FROM batch), (SELECT MAX({id_column}) FROM batch), (SELECT COUNT(*) FROM removed)
+            """, {**(params or {}), 'batch_size': batch_size, 'source': table, 'after': after})
+            selected, after, deleted = cursor.fetchone()
+            conn.commit()
+            moved += deleted
+            conflicts += selected - deleted
+            if selected < batch_size:
+                break
+        if conflicts:
+            print(f"⚠️ {conflicts} {table} rows left in place - history already has rows with the same id")
+        cursor.close()
+        conn.close()
+        return moved
+    except Exception as e:
+        print(f"❌ Error archiving {table}: {e}")
+        conn.rollback()
+        conn.close()
+        return moved
+
+def PurgeHistory(source, retention_days):
+    """Delete history rows for one source that have outlived their retention period"""
+    conn = ConnectToDB()
+    if not conn:
+        return 0
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            DELETE FROM archive_history
+            WHERE source = %s AND archived_at < NOW() - make_interval(days => %s)
+        """, (source, retention_days))
+        purged = cursor.rowcount
+        conn.commit()
+        cursor.close()
+        conn.close()
+        return purged
+    except Exception as e:
+        print(f"❌ Error purging {source} history: {e}")
+        conn.rollback()
+        conn.close()
+        return 0
+
+def GetHistoryCounts():
+    """Rows, oldest and newest archive time per source"""
+    conn = ConnectToDB()
+    if not conn:
+        return []
+
+    try:
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor.execute("""
+            SELECT source, COUNT(*) AS total, MIN(archived_at) AS oldest, MAX(archived_at) AS newest
+            FROM archive_history
+            GROUP BY source
+            ORDER BY source
+        """)
+        results = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return results
+    except Exception as e:
+        print(f"❌ Error counting archive history: {e}")
+        conn.close()
+        return []
+
+def GetHistory(source=None, query='', page=1, per_page=25):
+    """Page through archived rows, newest first, optionally for one source and/or matching text"""
+    empty = {'rows': [], 'total': 0, 'page': page, 'per_page': per_page}
+    conn = ConnectToDB()
+    if not conn:
+        return empty
+
+    try:
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor.execute("""
+            SELECT source, source_id, status, created_at, archived_at,
+                   coalesce(data->>'name', data->>'source', '') AS title,
+                   coalesce(data->>'email', '') AS email,
+                   coalesce(data->>'message', data->>'issue', data->>'details', data->>'project_details', '') AS body,
+                   COUNT(*) OVER () AS total
+            FROM archive_history
+            WHERE (%(source)s IS NULL OR source = %(source)s)
+              AND (%(pattern)s IS NULL OR data::text ILIKE %(pattern)s)
+            ORDER BY archived_at DESC, source_id DESC
+            LIMIT %(limit)s OFFSET %(offset)s
+        """, {
+            'source': source or None,
+            'pattern': f"%{query}%" if query else None,
+            'limit': per_page,
+            'offset': (page - 1) * per_page,
+        })
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return {
+            'rows': rows,
+            'total': rows[0]['total'] if rows else 0,
+            'page': page,
+            'per_page': per_page
+        }
+    except Exception as e:
+        print(f"❌ Error fetching archive history: {e}")
+        conn.close()
+        return empty
@@ -0,0 +1,242 @@
+import os
+import time
+import random
+import threading
+import psycopg2
+import psycopg2.extensions
+from psycopg2 import sql
+
+# ============================================ DATABASE RESILIENCE ============================================
+# EVERY CONNECTION GETS A CONNECT TIMEOUT AND A STATEMENT TIMEOUT, SO A STALLED POSTGRES COSTS A REQUEST SECONDS,
+# NOT A WORKER. CONNECTS ARE RETRIED A BOUNDED NUMBER OF TIMES WITH FULL JITTER. A PER-WORKER CIRCUIT BREAKER
+# OPENS AFTER DB_BREAKER_FAILURES CONSECUTIVE CONNECTION/TIMEOUT ERRORS; WHILE OPEN, ConnectToDB FAILS FAST
+# (NO NETWORK) AND PUBLIC FORMS SPOOL TO DISK (spool.py). AFTER DB_BREAKER_COOLDOWN SECONDS ONE PROBE IS LET
+# THROUGH - IF IT SUCCEEDS THE BREAKER CLOSES.
+
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", 2))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 5000))
+DB_RETRY_ATTEMPTS = int(os.getenv("DB_RETRY_ATTEMPTS", 2))
+DB_RETRY_BASE_MS = int(os.getenv("DB_RETRY_BASE_MS", 100))
+DB_BREAKER_FAILURES = int(os.getenv("DB_BREAKER_FAILURES", 5))
+DB_BREAKER_COOLDOWN = float(os.getenv("DB_BREAKER_COOLDOWN", 10))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, failures=DB_BREAKER_FAILURES, cooldown=DB_BREAKER_COOLDOWN):
+        self.max_failures = failures
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.listeners = []  # CALLED (OUTSIDE THE LOCK) WHEN THE BREAKER CLOSES AGAIN
+
+    def Allow(self):
+        """May we touch the database right now?"""
+        if self.state == CLOSED:
+            return True
+        with self.lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True  # ONE PROBE AT A TIME
+                return True
+            return False
+
+    def Success(self):
+        if self.state == CLOSED and self.failures == 0:
+            return
+        with self.lock:
+            recovered = self.state != CLOSED
+            self.state = CLOSED
+            self.failures = 0
+            self.probing = False
+        if recovered:
+            print("✅ Database reachable again - circuit closed")
+            for listener in self.listeners:
+                listener()
+
+    def Failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if self.state == HALF_OPEN or self.failures >= self.max_failures:
+                if self.state != OPEN:
+                    print(f"⚠️ Database circuit open for {self.cooldown:.0f}s after {self.failures} failures")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def EndProbe(self):
+        """The probe ended without telling us anything about the database - let the next caller try"""
+        with self.lock:
+            self.probing = False
+
+    def IsOpen(self):
+        return self.state != CLOSED
+
+    def OnRecovery(self, listener):
+        self.listeners.append(listener)
+
+
+breaker = CircuitBreaker()
+
+
+def Retry(operation, attempts=DB_RETRY_ATTEMPTS, base_ms=DB_RETRY_BASE_MS, transient=(psycopg2.OperationalError,)):
+    """Run operation(), retrying transient errors with full-jitter exponential backoff"""
+    for attempt in range(attempts):
+        try:
+            return operation()
+        except transient:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(random.uniform(0, base_ms * (2 ** attempt)) / 1000)
+
+
+# ---------- QUERY TIMING ----------
+# OFF BY DEFAULT (ONE ATTRIBUTE CHECK PER QUERY). profiling.py TURNS IT ON AT RUNTIME FOR A TOP-N SLOW-QUERY REPORT.
+# QUERIES ARE GROUPED BY THEIR WHITESPACE-NORMALISED TEXT - PARAMETERS ARE BOUND SEPARATELY, SO ONE HELPER = ONE ROW.
+# A NAMED (SERVER-SIDE) CURSOR'S execute() ONLY SENDS THE DECLARE; THE REAL WORK HAPPENS IN ITS FETCHES, SO THOSE ARE
+# TIMED TOO AND ADDED TO THE SAME QUERY'S TOTAL (calls STILL COUNTS EXECUTES; max IS THE SLOWEST EXECUTE OR STREAM).
+QUERY_TEXT_LIMIT = 300
+
+
+class QueryStats:
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.since = None
+        self.queries = {}
+
+    def Start(self):
+        with self.lock:
+            self.enabled = True
+            self.since = self.since or time.time()
+
+    def Stop(self):
+        self.enabled = False
+
+    def Reset(self):
+        with self.lock:
+            self.queries = {}
+            self.since = time.time() if self.enabled else None
+
+    def Record(self, query, seconds, calls=1):
+        """query is the SQL text (str or bytes) - Composed queries are rendered by the cursor first"""
+        text = query.decode(errors="replace") if isinstance(query, bytes) else query
+        key = " ".join(text.split())[:QUERY_TEXT_LIMIT]
+        with self.lock:
+            stats = self.queries.setdefault(key, [0, 0.0, 0.0])  # CALLS, TOTAL, MAX
+            stats[0] += calls
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def Top(self, n=20):
+        with self.lock:
+            rows = [
+                {"query": query, "calls": calls, "total_ms": round(total * 1000, 2),
+                 "mean_ms": round(total / max(calls, 1) * 1000, 2), "max_ms": round(longest * 1000, 2)}
+                for query, (calls, total, longest) in self.queries.items()
+            ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)[:n]
+
+
+query_stats = QueryStats()
+
+
+# ---------- CONNECTIONS THAT REPORT TO THE BREAKER ----------
+# OperationalError COVERS DROPPED CONNECTIONS AND statement_timeout (QueryCanceled); DATA ERRORS DON'T COUNT.
+guarded_cursors = {}
+
+def GuardedCursor(factory):
+    if factory not in guarded_cursors:
+        class Guarded(factory):
+            timed_query = None  # SQL TEXT OF THE LAST EXECUTE, SET ONLY WHILE QUERY TIMING IS ON
+
+            def execute(self, query, vars=None):
+                start = None
+                if query_stats.enabled:
+                    self.timed_query = query.as_string(self) if isinstance(query, sql.Composable) else query
+                    start = time.perf_counter()
+                try:
+                    result = super().execute(query, vars)
+                except psycopg2.OperationalError:
+                    breaker.Failure()
+                    raise
+                finally:
+                    if start is not None:
+                        query_stats.Record(self.timed_query, time.perf_counter() - start)
+                breaker.Success()
+                return result
+
+            # ---------- NAMED CURSORS: EACH FETCH IS A ROUND TRIP THAT RUNS PART OF THE QUERY ----------
+            def Fetch(self, fetch, *args, **kwargs):
+                if not (self.name and self.timed_query):
+                    return fetch(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fetch(*args, **kwargs)
+                finally:
+                    query_stats.Record(self.timed_query, time.perf_counter() - start, calls=0)
+
+            def fetchone(self):
+                return self.Fetch(super().fetchone)
+
+            def fetchmany(self, *args, **kwargs):
+                return self.Fetch(super().fetchmany, *args, **kwargs)
+
+            def fetchall(self):
+                return self.Fetch(super().fetchall)
+
+            def __iter__(self):
+                rows = super().__iter__()
+                if not (self.name and self.timed_query):
+                    return rows
+                return self.TimedRows(rows)
+
+            def TimedRows(self, rows):
+                """Iterate, summing the time spent inside next() - recorded once, when the loop ends or is abandoned"""
+                spent = 0.0
+                try:
+                    while True:
+                        start = time.perf_counter()
+                        try:
+                            row = next(rows)
+                        except StopIteration:
+                            return
+                        finally:
+                            spent += time.perf_counter() - start
+                        yield row
+                finally:
+                    query_stats.Record(self.timed_query, spent, calls=0)
+        guarded_cursors[factory] = Guarded
+    return guarded_cursors[factory]
+
+
+class GuardedConnection(psycopg2.extensions.connection):
+    def cursor(self, *args, cursor_factory=None, **kwargs):
+        factory = cursor_factory or self.cursor_factory or psycopg2.extensions.cursor
+        return super().cursor(*args, cursor_factory=GuardedCursor(factory), **kwargs)
+
+
+def Connect(**settings):
+    """psycopg2.connect with timeouts, retries and the circuit breaker - raises when it can't connect"""
+    if not breaker.Allow():
+        raise psycopg2.OperationalError("database circuit open")
+    try:
+        conn = Retry(lambda: psycopg2.connect(
+            **settings,
+            connect_timeout=DB_CONNECT_TIMEOUT,
+            options=f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}",
+            connection_factory=GuardedConnection,
+        ))
+    except psycopg2.OperationalError:
+        breaker.Failure()
+        raise
+    except BaseException:  # ANY OTHER ERROR MUST NOT LEAVE A HALF-OPEN BREAKER WAITING ON A PROBE THAT'S GONE
+        breaker.EndProbe()
+        raise
+    breaker.Success()
+    return conn
@@ -0,0 +1,64 @@
+import os
+import atexit
+import threading
+
+# ============================================ EMAIL DIGEST SCHEDULER ============================================
+# NOTIFICATIONS ARRIVING WITHIN EMAIL_DIGEST_WINDOW SECONDS OF THE FIRST ONE ARE COLLAPSED INTO A SINGLE SUMMARY
+# EMAIL (ONE SMTP SESSION). A LONE NOTIFICATION STILL GOES OUT AS THE NORMAL EMAIL. LATENCY IS BOUNDED BY THE
+# WINDOW, OR BY EMAIL_DIGEST_MAX_ITEMS IF A SPIKE FILLS THE DIGEST FIRST. KINDS LISTED IN EMAIL_DIGEST_IMMEDIATE
+# BYPASS THE DIGEST. EACH WORKER KEEPS ITS OWN DIGEST, SO N WORKERS SEND AT MOST N EMAILS PER WINDOW.
+#   EMAIL_DIGEST_WINDOW=0 (DEFAULT) TURNS DIGEST MODE OFF.
+
+EMAIL_DIGEST_WINDOW = float(os.environ.get("EMAIL_DIGEST_WINDOW", 0))
+EMAIL_DIGEST_MAX_ITEMS = int(os.environ.get("EMAIL_DIGEST_MAX_ITEMS", 200))
+EMAIL_DIGEST_IMMEDIATE = {
+    kind.strip() for kind in os.environ.get("EMAIL_DIGEST_IMMEDIATE", "support").split(",") if kind.strip()
+}
+
+
+class DigestScheduler:
+    def __init__(self, send_single, send_digest, window=EMAIL_DIGEST_WINDOW,
+                 max_items=EMAIL_DIGEST_MAX_ITEMS, immediate=EMAIL_DIGEST_IMMEDIATE):
+        self.send_single = send_single    # (kind, data) -> None
+        self.send_digest = send_digest    # [(kind, data), ...] -> None
+        self.window = window
+        self.max_items = max_items
+        self.immediate = set(immediate)
+        self.lock = threading.Lock()
+        self.items = []
+        self.timer = None
+        self.stats = {"notifications": 0, "emails": 0}
+        atexit.register(self.Flush)
+
+    def Add(self, kind, data):
+        """Queue a notification - False means the caller should send it right away"""
+        if kind in self.immediate:
+            return False
+
+        with self.lock:
+            self.items.append((kind, data))
+            self.stats["notifications"] += 1
+            full = len(self.items) >= self.max_items
+            if self.timer is None and not full:
+                self.timer = threading.Timer(self.window, self.Flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+        if full:
+            threading.Thread(target=self.Flush, daemon=True).start()
+        return True
+
+    def Flush(self):
+        with self.lock:
+            items, self.items = self.items, []
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        if not items:
+            return
+
+        self.stats["emails"] += 1
+        if len(items) == 1:
+            self.send_single(*items[0])
+        else:
+            self.send_digest(items)
@@ -0,0 +1,85 @@
+import os
+import re
+import email.policy
+from collections import namedtuple
+from email.message import EmailMessage
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+# ============================================ EMAIL RENDERING ============================================
+# NOTIFICATION EMAILS ARE JINJA TEMPLATES IN templates/email/ (<kind>.txt + <kind>.html). THEY ARE COMPILED ONCE
+# AT IMPORT, AND EACH MESSAGE IS SERIALIZED EXACTLY ONCE - THE SAME BYTES GO TO EVERY RETRY AND FALLBACK TRANSPORT.
+# THE BYTES USE THE SMTP POLICY (CRLF LINE ENDINGS) - smtplib ONLY FIXES LINE ENDINGS FOR str PAYLOADS, NOT bytes.
+
+EMAIL_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "email")
+
+LINE_BREAKS = re.compile(r"[\r\n]+")
+
+OutgoingEmail = namedtuple("OutgoingEmail", ["sender", "recipient", "subject", "payload"])
+
+email_env = Environment(
+    loader=FileSystemLoader(EMAIL_TEMPLATE_DIR),
+    autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+    trim_blocks=True,
+    keep_trailing_newline=True,
+)
+
+SUBJECTS = {
+    "contact": email_env.from_string("📬 CONTACT FORM: {{ data.HumanName }}"),
+    "support": email_env.from_string("🆘 SUPPORT REQUEST: {{ data.page or 'Unknown Page' }}"),
+    "review": email_env.from_string("🎮 GAME REVIEW: {{ '⭐' * (data.stars or 0) }} from {{ data.name }}"),
+    "digest": email_env.from_string("📨 DIGEST: {{ items|length }} new notifications ({{ summary }})"),
+}
+KIND_LABELS = {"contact": "📬 Contact", "support": "🆘 Support", "review": "🎮 Game Review"}
+
+
+def WarmEmailTemplates():
+    """Compile every email template up front"""
+    for name in email_env.list_templates(extensions=["txt", "html"]):
+        email_env.get_template(name)
+
+
+def HeaderValue(value):
+    """Fold user-supplied text onto one line - headers refuse CR/LF (ValueError) and the email would be lost"""
+    return LINE_BREAKS.sub(" ", value).strip()
+
+
+def Serialize(sender, recipient, subject, text, html):
+    subject = HeaderValue(subject)
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = HeaderValue(sender)
+    message["To"] = HeaderValue(recipient)
+    message.set_content(text)
+    message.add_alternative(html, subtype="html")
+    return OutgoingEmail(sender, recipient, subject, message.as_bytes(policy=email.policy.SMTP))
+
+
+def RenderEmail(kind, data, sender, recipient):
+    """Render a single notification ('contact', 'support' or 'review') to its final bytes"""
+    context = {"data": data}
+    return Serialize(
+        sender, recipient,
+        SUBJECTS[kind].render(context),
+        email_env.get_template(f"{kind}.txt").render(context),
+        email_env.get_template(f"{kind}.html").render(context),
+    )
+
+
+def RenderDigest(items, sender, recipient):
+    """Render a batch of (kind, data) notifications as one summary email"""
+    counts = {}
+    for kind, _ in items:
+        counts[kind] = counts.get(kind, 0) + 1
+    context = {
+        "items": [{"kind": kind, "data": data} for kind, data in items],
+        "summary": ", ".join(f"{count} {KIND_LABELS[kind]}" for kind, count in counts.items()),
+    }
+    return Serialize(
+        sender, recipient,
+        SUBJECTS["digest"].render(context),
+        email_env.get_template("digest.txt").render(context),
+        email_env.get_template("digest.html").render(context),
+    )
+
+
+WarmEmailTemplates()
@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import queue
+import select
+import asyncio
+import threading
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from db_helpers import ConnectToDB, NOTIFY_CHANNEL
+
+# ============================================ LIVE DASHBOARD UPDATES ============================================
+# EACH WORKER HOLDS ONE LISTEN CONNECTION ON NOTIFY_CHANNEL (STARTED ON THE FIRST /admin/events SUBSCRIBER) AND FANS
+# EVERY EVENT OUT TO THE OPEN DASHBOARDS IN THAT WORKER. UNDER GUNICORN AN SSE CLIENT OCCUPIES A THREAD FOR AS LONG
+# AS THE TAB IS OPEN, SO RUN IT WITH --worker-class gthread RATHER THAN PLAIN SYNC WORKERS. THE ASGI ENTRYPOINT SERVES
+# /admin/events ON THE EVENT LOOP INSTEAD (LoopSubscriber) - NO THREAD PER TAB, AND NEVER ONE OF ITS WSGI THREADS.
+#   LIVE_UPDATES_ENABLED=0 TURNS THE STREAM OFF (DASHBOARDS FALL BACK TO MANUAL REFRESH).
+
+LIVE_UPDATES_ENABLED = os.environ.get("LIVE_UPDATES_ENABLED", "1") != "0"
+SSE_HEARTBEAT_SECONDS = float(os.environ.get("SSE_HEARTBEAT_SECONDS", 15))
+SSE_CLIENT_QUEUE = int(os.environ.get("SSE_CLIENT_QUEUE", 100))
+LISTEN_RECONNECT_MAX = 30
+
+
+class NotificationHub:
+    def __init__(self, channel=NOTIFY_CHANNEL):
+        self.channel = channel
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        self.thread = None
+        self.stats = {"events": 0, "dropped": 0, "reconnects": 0}
+
+    def Subscribe(self, client=None):
+        client = client or queue.Queue(maxsize=SSE_CLIENT_QUEUE)
+        with self.lock:
+            self.subscribers.add(client)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.Run, name="live-updates", daemon=True)
+                self.thread.start()
+        return client
+
+    def Unsubscribe(self, client):
+        with self.lock:
+            self.subscribers.discard(client)
+
+    def Broadcast(self, payload):
+        self.stats["events"] += 1
+        with self.lock:
+            clients = list(self.subscribers)
+        for client in clients:
+            try:
+                client.put_nowait(payload)
+            except queue.Full:  # A STALLED TAB LOSES EVENTS INSTEAD OF BACKING UP THE LISTENER
+                self.stats["dropped"] += 1
+
+    def Listen(self):
+        conn = ConnectToDB()
+        if not conn:
+            raise ConnectionError("no database connection")
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        cursor = conn.cursor()
+        cursor.execute(f"LISTEN {self.channel}")
+        print(f"✅ Listening for {self.channel} notifications")
+        try:
+            while True:
+                if select.select([conn], [], [], SSE_HEARTBEAT_SECONDS) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self.Broadcast(conn.notifies.pop(0).payload)
+        finally:
+            conn.close()
+
+    def Run(self):
+        backoff = 1
+        while True:
+            started = time.monotonic()
+            try:
+                self.Listen()
+            except Exception as e:
+                print(f"❌ Live updates listener failed: {e}")
+            if time.monotonic() - started > LISTEN_RECONNECT_MAX:
+                backoff = 1
+            self.stats["reconnects"] += 1
+            time.sleep(backoff)
+            backoff = min(backoff * 2, LISTEN_RECONNECT_MAX)
+
+
+hub = NotificationHub()
+
+
+class LoopSubscriber:
+    """A hub subscriber that lives on an asyncio loop - Broadcast() calls put_nowait from the listener thread"""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SSE_CLIENT_QUEUE)
+
+    def put_nowait(self, payload):
+        if self.queue.full():
+            raise queue.Full
+        self.loop.call_soon_threadsafe(self.Put, payload)
+
+    def Put(self, payload):
+        if not self.queue.full():
+            self.queue.put_nowait(payload)
+
+
+def FormatEvent(payload):
+    event_type = json.loads(payload).get("type", "message")
+    return f"event: {event_type}\ndata: {payload}\n\n"
+
+
+def EventStream():
+    """Yield server-sent events for one dashboard until the client disconnects"""
+    client = hub.Subscribe()
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                payload = client.get(timeout=SSE_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ": keep-alive\n\n"  # ALSO HOW A CLOSED TAB IS NOTICED AND ITS THREAD RELEASED
+                continue
+            yield FormatEvent(payload)
+    finally:
+        hub.Unsubscribe(client)
@@ -0,0 +1,33 @@
+-- ============================================ FULL-TEXT SEARCH ============================================
+-- Stored tsvector columns + GIN indexes backing /admin/search (db_helpers.SearchSubmissions).
+-- Generated columns stay current on every INSERT/UPDATE without triggers (PostgreSQL 12+).
+-- Run once: psql -d portfolio_site -f migrations/001_full_text_search.sql
+
+ALTER TABLE contact_me ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(message, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(email, '')), 'B')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS contact_me_search_idx ON contact_me USING GIN (search_vector);
+
+ALTER TABLE support ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(issue, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(email, '') || ' ' || coalesce(page, '')), 'B')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS support_search_idx ON support USING GIN (search_vector);
+
+ALTER TABLE game_feedback ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(review, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(email, '')), 'B')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS game_feedback_search_idx ON game_feedback USING GIN (search_vector);
+
+ALTER TABLE wishlist ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(details, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(notes, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(source, '') || ' ' || coalesce(enhancement_type, '')), 'C')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS wishlist_search_idx ON wishlist USING GIN (search_vector);
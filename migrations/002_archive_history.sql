@@ -0,0 +1,24 @@
+-- ============================================ ARCHIVE HISTORY (COLD TIER) ============================================
+-- Archived wishlist items / app requests and old handled contacts / support tickets are moved here by archive.py,
+-- so the hot tables (and their indexes) only hold live rows. One LIST partition per source table: retention is a
+-- DELETE on a single small partition, and history queries for one source never touch the others.
+-- Each row keeps the full original record as JSONB, so the hot tables can change shape without migrating history.
+-- Run once: psql -d portfolio_site -f migrations/002_archive_history.sql
+
+CREATE TABLE IF NOT EXISTS archive_history (
+    source       TEXT        NOT NULL,
+    source_id    INTEGER     NOT NULL,
+    status       TEXT,
+    created_at   TIMESTAMP,
+    archived_at  TIMESTAMP   NOT NULL DEFAULT NOW(),
+    data         JSONB       NOT NULL,
+    PRIMARY KEY (source, source_id)
+) PARTITION BY LIST (source);
+
+CREATE TABLE IF NOT EXISTS archive_history_wishlist PARTITION OF archive_history FOR VALUES IN ('wishlist');
+CREATE TABLE IF NOT EXISTS archive_history_app_requests PARTITION OF archive_history FOR VALUES IN ('app_requests');
+CREATE TABLE IF NOT EXISTS archive_history_contact_me PARTITION OF archive_history FOR VALUES IN ('contact_me');
+CREATE TABLE IF NOT EXISTS archive_history_support PARTITION OF archive_history FOR VALUES IN ('support');
+CREATE TABLE IF NOT EXISTS archive_history_other PARTITION OF archive_history DEFAULT;
+
+CREATE INDEX IF NOT EXISTS archive_history_archived_idx ON archive_history (source, archived_at DESC);
@@ -0,0 +1,9 @@
+-- ============================================ APP REQUESTS INDEXES ============================================
+-- Partial indexes over live (archived = FALSE) rows backing /admin/app_requests:
+-- the newest-first page walks the first index; status filters and the FILTER stats use the second.
+-- Run once: psql -d portfolio_site -f migrations/003_app_requests_indexes.sql
+
+CREATE INDEX IF NOT EXISTS app_requests_live_recent_idx
+    ON app_requests (time_submitted DESC, id DESC) WHERE archived = FALSE;
+CREATE INDEX IF NOT EXISTS app_requests_live_status_idx
+    ON app_requests (status, time_submitted DESC) WHERE archived = FALSE;
@@ -0,0 +1,26 @@
+-- ============================================ WISHLIST STATUS COUNTS ============================================
+-- One row per status holding the number of live (archived = FALSE) wishlist items, so the /admin/wishlist summary
+-- reads a handful of rows instead of counting the table. The db_helpers write helpers (NewWishlistItem,
+-- update_wishlist_status, archive_wishlist_item_db, delete_wishlist_item_db) adjust it in the same transaction.
+-- Writes that bypass them (COPY seeding, hand-written SQL) must call refresh_wishlist_counts() afterwards.
+-- Run once: psql -d portfolio_site -f migrations/004_wishlist_status_counts.sql
+
+CREATE TABLE IF NOT EXISTS wishlist_status_counts (
+    status      TEXT    PRIMARY KEY,
+    item_count  BIGINT  NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION refresh_wishlist_counts() RETURNS void AS $$
+BEGIN
+    LOCK TABLE wishlist IN SHARE MODE;  -- NO WRITES SLIP IN BETWEEN THE COUNT AND THE SWAP
+    DELETE FROM wishlist_status_counts;
+    INSERT INTO wishlist_status_counts (status, item_count)
+        SELECT status, COUNT(*) FROM wishlist WHERE archived = FALSE GROUP BY status;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT refresh_wishlist_counts();
+
+-- BACKS THE FILTERED LIST (AND THE GROUP BY FALLBACK WHEN THIS MIGRATION HASN'T RUN)
+CREATE INDEX IF NOT EXISTS wishlist_live_status_idx
+    ON wishlist (status, created_at DESC) WHERE archived = FALSE;
@@ -0,0 +1,88 @@
+import os
+import hashlib
+from threading import Lock
+from datetime import datetime, timezone
+from functools import wraps
+from flask import current_app, request, session, make_response
+
+# ============================================ RENDERED PAGE CACHE ============================================
+# PUBLIC PAGES ARE STATIC APART FROM FLASHED MESSAGES, SO ANONYMOUS GETS ARE SERVED FROM MEMORY.
+# ENTRIES ARE KEYED BY ENDPOINT + TEMPLATE MTIMES, SO EDITING A TEMPLATE INVALIDATES ITS PAGE.
+
+PAGE_CACHE = {}
+PAGE_CACHE_LOCK = Lock()
+PAGE_CACHE_ENABLED = os.environ.get("PAGE_CACHE_ENABLED", "1") != "0"
+
+
+def TemplateMtimes(template_name):
+    """Get mtimes for a template and the base layout it extends"""
+    folder = os.path.join(current_app.root_path, current_app.template_folder)
+    mtimes = []
+    for name in (template_name, "base.html"):
+        try:
+            mtimes.append(os.path.getmtime(os.path.join(folder, name)))
+        except OSError:
+            mtimes.append(0)
+    return tuple(mtimes)
+
+
+def CanUseCache():
+    """Only anonymous GETs with no pending flash messages are cacheable"""
+    if not PAGE_CACHE_ENABLED or request.method not in ("GET", "HEAD"):
+        return False
+    if session.get('admin_logged_in') or session.get('_flashes'):
+        return False
+    return True
+
+
+def BuildResponse(body, etag, last_modified):
+    response = make_response(body)
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
+
+
+def CachedPage(template_name):
+    """Serve a route's GET from the rendered page cache, with ETag/Last-Modified revalidation"""
+    def Decorator(f):
+        @wraps(f)
+        def Decorated(*args, **kwargs):
+            if not CanUseCache():
+                return f(*args, **kwargs)
+
+            mtimes = TemplateMtimes(template_name)
+            key = (request.endpoint, mtimes)
+            etag = hashlib.sha1(repr(key).encode()).hexdigest()
+            last_modified = datetime.fromtimestamp(int(max(mtimes)), tz=timezone.utc)
+
+            # CONDITIONAL REQUESTS ARE ANSWERED FROM THE KEY ALONE - NO JINJA, NO CACHE LOOKUP
+            if request.if_none_match.contains_weak(etag) or (
+                not request.if_none_match and request.if_modified_since
+                and request.if_modified_since >= last_modified
+            ):
+                response = BuildResponse(b"", etag, last_modified)
+                response.status_code = 304
+                return response
+
+            with PAGE_CACHE_LOCK:
+                body = PAGE_CACHE.get(key)
+
+            if body is None:
+                rendered = make_response(f(*args, **kwargs))
+                if rendered.status_code != 200:
+                    return rendered
+                body = rendered.get_data()
+                with PAGE_CACHE_LOCK:
+                    for stale in [k for k in PAGE_CACHE if k[0] == request.endpoint]:
+                        del PAGE_CACHE[stale]
+                    PAGE_CACHE[key] = body
+
+            return BuildResponse(body, etag, last_modified)
+        return Decorated
+    return Decorator
+
+
+def ClearPageCache():
+    with PAGE_CACHE_LOCK:
+        PAGE_CACHE.clear()
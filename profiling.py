@@ -0,0 +1,204 @@
+import os
+import io
+import re
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from flask import request, session, g
+
+from admin_auth import ValidSession
+from db_resilience import query_stats
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+except ImportError:  # pyinstrument IS OPTIONAL - cProfile ONLY WITHOUT IT
+    SamplingProfiler = None
+
+# ============================================ RUNTIME PROFILING (ADMIN ONLY) ============================================
+# NOTHING RUNS UNTIL AN ADMIN ASKS, SO THE COST WHEN IDLE IS ONE HEADER LOOKUP PER REQUEST:
+#   - PER REQUEST: SEND `X-Profile: cprofile` (OR `pyinstrument`) WITH AN ADMIN SESSION COOKIE. THE RESULT IS SAVED
+#     TO PROFILE_DIR AND NAMED IN THE X-Profile-Id RESPONSE HEADER. ONE PROFILED REQUEST AT A TIME PER WORKER.
+#   - MEMORY: tracemalloc START/STOP, SNAPSHOTS DUMPED TO PROFILE_DIR, AND DIFFS BETWEEN ANY TWO SNAPSHOTS
+#   - QUERIES: db_resilience.query_stats TIMES EVERY db_helpers QUERY WHILE ON - TOP N BY TOTAL TIME
+# tracemalloc AND QUERY TIMING ARE PER WORKER PROCESS (EACH RESULT IS TAGGED WITH ITS PID); FILES IN PROFILE_DIR ARE
+# SHARED, SO ANY WORKER CAN SERVE A DOWNLOAD. STREAMED RESPONSES ARE PROFILED UP TO THE FIRST BYTE ONLY.
+
+PROFILE_HEADER = os.environ.get("PROFILE_HEADER", "X-Profile")
+PROFILE_DIR = os.path.abspath(os.environ.get("PROFILE_DIR", "profiles"))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", 100))              # NEWEST FILES KEPT IN PROFILE_DIR
+PROFILE_TOP_N = int(os.environ.get("PROFILE_TOP_N", 40))             # ROWS IN TEXT REPORTS
+TRACEMALLOC_FRAMES = int(os.environ.get("TRACEMALLOC_FRAMES", 10))
+
+SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+profile_lock = threading.Lock()  # cProfile CAN'T NEST (sys.monitoring) - ONE PROFILED REQUEST PER WORKER
+
+
+def ProfilePath(name):
+    return os.path.join(PROFILE_DIR, name)
+
+
+def NewName(label, extension):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    now = time.time()
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"{int(now * 1000) % 1000:03d}"
+    return f"{stamp}-{os.getpid()}-{SAFE_NAME.sub('_', label)}{extension}"
+
+
+def PruneProfiles():
+    names = sorted(os.listdir(PROFILE_DIR))
+    for name in names[:-PROFILE_KEEP] if len(names) > PROFILE_KEEP else []:
+        os.remove(ProfilePath(name))
+
+
+def ListProfiles():
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    files = []
+    for name in sorted(os.listdir(PROFILE_DIR), reverse=True):
+        stat = os.stat(ProfilePath(name))
+        files.append({"name": name, "size_kb": round(stat.st_size / 1024, 1), "modified": stat.st_mtime})
+    return files
+
+
+def Snapshots():
+    return [f["name"] for f in ListProfiles() if f["name"].endswith(".snapshot")]
+
+
+# ---------- PER-REQUEST PROFILES ----------
+def StartRequestProfile():
+    """before_request hook"""
+    mode = request.headers.get(PROFILE_HEADER)
+    if not mode or not ValidSession(session):
+        return None
+    if not profile_lock.acquire(blocking=False):
+        g.profile_skipped = "busy"
+        return None
+    if mode == "pyinstrument" and SamplingProfiler is not None:
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+    else:
+        mode, profiler = "cprofile", cProfile.Profile()
+        profiler.enable()
+    g.profile = (mode, profiler, time.perf_counter())
+    return None
+
+
+def StopProfiler(mode, profiler):
+    if mode == "pyinstrument":
+        profiler.stop()
+    else:
+        profiler.disable()
+    profile_lock.release()
+
+
+def SaveRequestProfile(mode, profiler, seconds):
+    label = f"{request.method}-{request.endpoint or 'unknown'}"
+    if mode == "pyinstrument":
+        name = NewName(label, ".html")
+        with open(ProfilePath(name), "w", encoding="utf-8") as f:
+            f.write(profiler.output_html())
+        return name
+
+    name = NewName(label, ".prof")  # LOAD WITH snakeviz / pstats
+    profiler.dump_stats(ProfilePath(name))
+    report = io.StringIO()
+    report.write(f"{request.method} {request.full_path}  {seconds * 1000:.1f} ms  pid {os.getpid()}\n\n")
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+    with open(ProfilePath(name[:-len(".prof")] + ".txt"), "w", encoding="utf-8") as f:
+        f.write(report.getvalue())
+    return name
+
+
+def FinishRequestProfile(response):
+    """after_request hook"""
+    if "profile_skipped" in g:
+        response.headers["X-Profile-Skipped"] = g.profile_skipped
+    profile = g.pop("profile", None)
+    if profile is None:
+        return response
+    mode, profiler, start = profile
+    StopProfiler(mode, profiler)
+    try:
+        response.headers["X-Profile-Id"] = SaveRequestProfile(mode, profiler, time.perf_counter() - start)
+        PruneProfiles()
+    except OSError as e:
+        print(f"❌ Could not save profile: {e}")
+    return response
+
+
+def AbandonRequestProfile(error=None):
+    """teardown hook - a request that raised never reached after_request"""
+    profile = g.pop("profile", None)
+    if profile is not None:
+        StopProfiler(*profile[:2])
+
+
+# ---------- TRACEMALLOC ----------
+def TracemallocStatus():
+    current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    return {"tracing": tracemalloc.is_tracing(), "current_mb": round(current / 1024 / 1024, 1),
+            "peak_mb": round(peak / 1024 / 1024, 1), "frames": tracemalloc.get_traceback_limit()}
+
+
+def TracemallocStart():
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+
+def TracemallocStop():
+    tracemalloc.stop()  # FREES THE TRACES - SNAPSHOTS ALREADY ON DISK ARE KEPT
+
+
+def IgnoreProfilerFrames(snapshot):
+    return snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ])
+
+
+def TracemallocSnapshot():
+    """Dump a snapshot plus a readable top-N; returns the snapshot's name, or None if tracemalloc is off"""
+    if not tracemalloc.is_tracing():
+        return None
+    snapshot = IgnoreProfilerFrames(tracemalloc.take_snapshot())
+    name = NewName("memory", ".snapshot")
+    snapshot.dump(ProfilePath(name))
+    lines = [f"tracemalloc snapshot  pid {os.getpid()}  {TracemallocStatus()}\n"]
+    lines += [str(stat) for stat in snapshot.statistics("lineno")[:PROFILE_TOP_N]]
+    with open(ProfilePath(name[:-len(".snapshot")] + ".top.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    PruneProfiles()
+    return name
+
+
+def TracemallocDiff(base, head):
+    """What grew between two dumped snapshots (any worker's) - returns the report's name"""
+    older = tracemalloc.Snapshot.load(ProfilePath(os.path.basename(base)))
+    newer = tracemalloc.Snapshot.load(ProfilePath(os.path.basename(head)))
+    lines = [f"tracemalloc diff  {base} -> {head}\n"]
+    lines += [str(stat) for stat in newer.compare_to(older, "lineno")[:PROFILE_TOP_N]]
+    name = NewName("memory-diff", ".diff.txt")
+    with open(ProfilePath(name), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return name
+
+
+# ---------- SLOW QUERIES ----------
+def SlowQueryReport(n=PROFILE_TOP_N):
+    return {
+        "pid": os.getpid(),
+        "enabled": query_stats.enabled,
+        "since": query_stats.since,
+        "queries": query_stats.Top(n),
+    }
+
+
+def Profiling(app):
+    """Register the admin-triggered per-request profiler on a Flask app"""
+    app.before_request(StartRequestProfile)
+    app.after_request(FinishRequestProfile)
+    app.teardown_request(AbandonRequestProfile)
+    return app
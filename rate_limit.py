@@ -0,0 +1,203 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+
+# ============================================ FORM RATE LIMITING ============================================
+# EVERY PUBLIC FORM POST COSTS A DB CONNECTION, AN INSERT AND AN SMTP SESSION, SO BOTS ARE STOPPED HERE FIRST:
+#   - TOKEN BUCKET PER CLIENT IP AND PER SUBMITTED EMAIL
+#   - CONTENT HASH TO DROP REPEATS OF THE SAME SUBMISSION
+# THE DEFAULT BACKEND IS PER-PROCESS MEMORY. RATE_LIMIT_BACKEND=sqlite SHARES STATE ACROSS GUNICORN WORKERS.
+# BOTH SWEEP EXPIRED ENTRIES EVERY PRUNE_SECONDS: CONTENT HASHES PAST THEIR DUPLICATE WINDOW, AND BUCKETS IDLE LONG
+# ENOUGH TO HAVE REFILLED (DROPPING A FULL BUCKET CHANGES NOTHING).
+
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "1") != "0"
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_DB = os.environ.get("RATE_LIMIT_DB", "rate_limit.sqlite3")
+RATE_LIMIT_IP = os.environ.get("RATE_LIMIT_IP", "5/300")        # BURST/SECONDS TO FULLY REFILL
+RATE_LIMIT_EMAIL = os.environ.get("RATE_LIMIT_EMAIL", "3/600")
+DUPLICATE_WINDOW = int(os.environ.get("DUPLICATE_WINDOW", 24 * 3600))
+TRUST_PROXY = os.environ.get("TRUST_PROXY", "0") == "1"
+PRUNE_SECONDS = 60
+
+ALLOWED = "allowed"
+RATE_LIMITED = "rate_limited"
+DUPLICATE = "duplicate"
+
+
+def ParseLimit(spec):
+    """'5/300' -> (capacity 5, refill rate 5/300 tokens per second)"""
+    burst, seconds = spec.split("/")
+    return float(burst), float(burst) / float(seconds)
+
+
+class MemoryBackend:
+    """Buckets and content hashes in this process only"""
+    MAX_KEYS = 50000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.seen = {}
+        self.refill = 0.0  # LONGEST EMPTY-TO-FULL TIME OF ANY LIMIT USED SO FAR
+        self.next_prune = 0.0
+
+    def Take(self, key, capacity, rate, now):
+        with self.lock:
+            tokens, updated = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.buckets[key] = (tokens, now)
+            self.refill = max(self.refill, capacity / rate)
+            if now >= self.next_prune or len(self.buckets) > self.MAX_KEYS:
+                self.Prune(now)
+            return allowed
+
+    def Seen(self, digest, ttl, now):
+        with self.lock:
+            expires = self.seen.get(digest)
+            if expires and expires > now:
+                return True
+            self.seen[digest] = now + ttl
+            if now >= self.next_prune or len(self.seen) > self.MAX_KEYS:
+                self.Prune(now)
+            return False
+
+    def Forget(self, digest):
+        with self.lock:
+            self.seen.pop(digest, None)
+
+    def Prune(self, now):
+        """Caller holds the lock"""
+        self.seen = {d: e for d, e in self.seen.items() if e > now}
+        self.buckets = {k: v for k, v in self.buckets.items() if now - v[1] < self.refill}
+        self.next_prune = now + PRUNE_SECONDS
+
+
+class SQLiteBackend:
+    """Buckets and content hashes in a SQLite file shared by every worker on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        self.refill = 0.0
+        self.next_prune = 0.0  # PER PROCESS - ANY WORKER'S SWEEP CLEANS THE SHARED FILE
+        conn = self.Connection()
+        conn.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, updated REAL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS seen (digest TEXT PRIMARY KEY, expires REAL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS buckets_updated ON buckets (updated)")
+        conn.execute("CREATE INDEX IF NOT EXISTS seen_expires ON seen (expires)")
+
+    def Connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def Take(self, key, capacity, rate, now):
+        conn = self.Connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)", (key, tokens, now))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self.refill = max(self.refill, capacity / rate)
+        self.Prune(now)
+        return allowed
+
+    def Seen(self, digest, ttl, now):
+        conn = self.Connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT expires FROM seen WHERE digest = ?", (digest,)).fetchone()
+            if row and row[0] > now:
+                conn.execute("COMMIT")
+                return True
+            conn.execute("INSERT OR REPLACE INTO seen (digest, expires) VALUES (?, ?)", (digest, now + ttl))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self.Prune(now)
+        return False
+
+    def Forget(self, digest):
+        self.Connection().execute("DELETE FROM seen WHERE digest = ?", (digest,))
+
+    def Prune(self, now):
+        """At most once per PRUNE_SECONDS per process - each DELETE is its own (autocommit) transaction"""
+        if now < self.next_prune:
+            return
+        self.next_prune = now + PRUNE_SECONDS
+        conn = self.Connection()
+        conn.execute("DELETE FROM seen WHERE expires <= ?", (now,))
+        if self.refill:
+            conn.execute("DELETE FROM buckets WHERE updated <= ?", (now - self.refill,))
+
+
+backend = SQLiteBackend(RATE_LIMIT_DB) if RATE_LIMIT_BACKEND == "sqlite" else MemoryBackend()
+IP_LIMIT = ParseLimit(RATE_LIMIT_IP)
+EMAIL_LIMIT = ParseLimit(RATE_LIMIT_EMAIL)
+
+
+def ClientIP(remote_addr, forwarded_for=None):
+    """Client address, honouring X-Forwarded-For only when running behind a trusted proxy"""
+    if TRUST_PROXY and forwarded_for:
+        return forwarded_for.split(",")[0].strip()
+    return remote_addr or "unknown"
+
+
+def SubmissionDigest(kind, data):
+    """Hash the normalized content of a submission (timestamp excluded)"""
+    parts = [kind]
+    for key in sorted(data):
+        if key == "timestamp":
+            continue
+        value = re.sub(r"\s+", " ", str(data[key] or "")).strip().lower()
+        parts.append(f"{key}={value}")
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def CheckSubmission(kind, ip, email, data):
+    """Return (verdict, content_hash) - verdict is ALLOWED, RATE_LIMITED or DUPLICATE"""
+    content_hash = SubmissionDigest(kind, data)
+    if not RATE_LIMIT_ENABLED:
+        return ALLOWED, content_hash
+
+    try:
+        now = time.time()
+        if not backend.Take(f"ip:{ip}", *IP_LIMIT, now):
+            print(f"⚠️ Rate limited {kind} submission from {ip}")
+            return RATE_LIMITED, content_hash
+        if email and not backend.Take(f"email:{email.strip().lower()}", *EMAIL_LIMIT, now):
+            print(f"⚠️ Rate limited {kind} submission for {email}")
+            return RATE_LIMITED, content_hash
+        if backend.Seen(content_hash, DUPLICATE_WINDOW, now):
+            print(f"⚠️ Dropped duplicate {kind} submission from {ip}")
+            return DUPLICATE, content_hash
+    except Exception as e:
+        print(f"❌ Rate limiter error (allowing submission): {e}")
+    return ALLOWED, content_hash
+
+
+def ForgetSubmission(content_hash):
+    """Un-record a submission that failed to save, so the user can retry it"""
+    try:
+        backend.Forget(content_hash)
+    except Exception as e:
+        print(f"❌ Rate limiter error: {e}")
@@ -0,0 +1,178 @@
+import os
+import glob
+import json
+import time
+import threading
+
+try:
+    import fcntl
+except ImportError:  # NO fcntl (WINDOWS) - SINGLE-WORKER DEPLOYMENTS ONLY
+    fcntl = None
+
+import write_behind
+from write_behind import InsertRecords, Record
+from db_resilience import breaker
+
+# ============================================ SUBMISSION SPOOL (DEGRADED MODE) ============================================
+# WHEN POSTGRES IS DOWN (CIRCUIT OPEN, OR AN INSERT FAILS ON A CONNECTION/TIMEOUT ERROR) PUBLIC FORM POSTS ARE
+# APPENDED TO AN APPEND-ONLY FILE INSTEAD OF FAILING, AND THE USER GETS THE NORMAL SUCCESS MESSAGE. A REPLAYER
+# THREAD MOVES THE FILE ASIDE AND INSERTS IT BACK IN BATCHES WHEN THE DATABASE RECOVERS. RECORDS THE DATABASE
+# REFUSES EVEN WHEN HEALTHY GO TO rejected.jsonl FOR A HUMAN TO LOOK AT.
+#   SPOOL_DIR - SHARED BY ALL WORKERS ON THE HOST (flock KEEPS APPENDS AND REPLAYS FROM INTERLEAVING)
+#   SPOOL_FSYNC=always (DEFAULT) - fsync EVERY APPEND; OUTAGES ARE RARE, LOST SUBMISSIONS ARE NOT OK
+
+SPOOL_DIR = os.environ.get("SPOOL_DIR", "spool")
+SPOOL_FSYNC = os.environ.get("SPOOL_FSYNC", "always")
+SPOOL_REPLAY_SECONDS = float(os.environ.get("SPOOL_REPLAY_SECONDS", 30))
+SPOOL_REPLAY_BATCH = int(os.environ.get("SPOOL_REPLAY_BATCH", 500))
+
+ACTIVE_SPOOL = "submissions.spool"
+REJECTED = "rejected.jsonl"
+
+
+def Lock(f, flags=None):
+    if fcntl:
+        fcntl.flock(f, fcntl.LOCK_EX if flags is None else flags)
+
+
+class SubmissionSpool:
+    def __init__(self, spool_dir=SPOOL_DIR, fsync=SPOOL_FSYNC, replay_seconds=SPOOL_REPLAY_SECONDS):
+        self.spool_dir = spool_dir
+        self.fsync = fsync == "always"
+        self.replay_seconds = replay_seconds
+        self.replaying = threading.Lock()
+        self.thread = None
+        self.stats = {"spooled": 0, "replayed": 0, "rejected": 0}
+        breaker.OnRecovery(lambda: threading.Thread(target=self.Replay, daemon=True).start())
+
+    def Path(self, name):
+        return os.path.join(self.spool_dir, name)
+
+    # ---------- WRITE ----------
+    def Append(self, table, data):
+        """Durably record a submission for later replay - False only if the disk write itself fails"""
+        line = json.dumps(Record(table, data)) + "\n"
+        path = self.Path(ACTIVE_SPOOL)
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            while True:
+                with open(path, "a", encoding="utf-8") as f:
+                    Lock(f)
+                    # THE REPLAYER MAY HAVE RENAMED THE FILE WHILE WE WAITED FOR THE LOCK - START OVER ON THE NEW ONE
+                    if not os.path.exists(path) or os.stat(path).st_ino != os.fstat(f.fileno()).st_ino:
+                        continue
+                    f.write(line)
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                    break
+        except OSError as e:
+            print(f"❌ Could not spool {table} submission: {e}")
+            return False
+
+        self.stats["spooled"] += 1
+        print(f"⚠️ Database unavailable - spooled {table} submission to {path}")
+        self.StartReplayer()
+        return True
+
+    def Pending(self):
+        return bool(glob.glob(self.Path("*.spool")))
+
+    # ---------- REPLAY ----------
+    def Claim(self):
+        """Rename the active spool aside so new appends start a fresh file"""
+        active = self.Path(ACTIVE_SPOOL)
+        if not os.path.exists(active):
+            return
+        with open(active, "a", encoding="utf-8") as f:
+            Lock(f)  # WAIT OUT AN IN-FLIGHT APPEND
+            try:
+                os.rename(active, self.Path(f"replay-{os.getpid()}-{time.time_ns()}.spool"))
+            except FileNotFoundError:
+                pass
+
+    def Reject(self, record):
+        """Set aside a record the database refuses even when healthy (also used by the write-behind buffer)"""
+        self.stats["rejected"] += 1
+        os.makedirs(self.spool_dir, exist_ok=True)
+        with open(self.Path(REJECTED), "a", encoding="utf-8") as f:
+            Lock(f)
+            f.write(json.dumps(record) + "\n")
+        print(f"❌ {record[0]} submission rejected by the database - kept in {self.Path(REJECTED)}")
+
+    def ReplayRecords(self, records):
+        """Insert records in order - returns how many are done (inserted or rejected) before the DB gave out"""
+        done = 0
+        while done < len(records):
+            batch = records[done:done + SPOOL_REPLAY_BATCH]
+            result = InsertRecords(batch)
+            if result:
+                done += len(batch)
+                self.stats["replayed"] += len(batch)
+                continue
+            if result is False:  # UNREACHABLE AGAIN
+                return done
+            for record in batch:  # DATABASE IS UP BUT REFUSED THE BATCH - ISOLATE THE BAD ROWS
+                result = InsertRecords([record])
+                if result:
+                    self.stats["replayed"] += 1
+                elif result is False:
+                    return done
+                else:
+                    self.Reject(record)
+                done += 1
+        return done
+
+    def Replay(self):
+        if not self.replaying.acquire(blocking=False):
+            return
+        try:
+            self.Claim()
+            for path in sorted(glob.glob(self.Path("replay-*.spool"))):
+                with open(path, "r+", encoding="utf-8") as f:
+                    try:
+                        Lock(f, fcntl.LOCK_EX | fcntl.LOCK_NB if fcntl else None)
+                    except OSError:
+                        continue  # ANOTHER WORKER IS REPLAYING IT
+                    records = [json.loads(line) for line in f if line.strip()]
+                    done = self.ReplayRecords(records)
+                    if done < len(records):  # KEEP ONLY WHAT'S LEFT SO NOTHING IS INSERTED TWICE
+                        f.seek(0)
+                        f.truncate()
+                        f.writelines(json.dumps(record) + "\n" for record in records[done:])
+                        f.flush()
+                        os.fsync(f.fileno())
+                        return
+                os.remove(path)
+                print(f"✅ Replayed {len(records)} spooled submissions from {os.path.basename(path)}")
+        except Exception as e:
+            print(f"❌ Error replaying spool: {e}")
+        finally:
+            self.replaying.release()
+
+    def Run(self):
+        while True:
+            time.sleep(self.replay_seconds)
+            if self.Pending():
+                self.Replay()
+
+    def StartReplayer(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.Run, name="spool-replay", daemon=True)
+            self.thread.start()
+
+
+spool = SubmissionSpool()
+if spool.Pending():  # LEFT OVER FROM A PREVIOUS RUN
+    spool.StartReplayer()
+
+
+def SubmitOrInsert(table, data, direct_insert):
+    """Queue (write-behind) or insert a public form submission; spool it if the database is unreachable"""
+    if write_behind.buffer is not None and write_behind.buffer.Submit(table, data):
+        return True
+    if not breaker.IsOpen() and direct_insert(data):
+        return True
+    if breaker.IsOpen() or breaker.failures:  # CONNECTION/TIMEOUT TROUBLE, NOT BAD DATA
+        return spool.Append(table, data)
+    return False
@@ -0,0 +1,56 @@
+import os
+import stat
+import time
+from jinja2 import FileSystemBytecodeCache
+
+# ============================================ JINJA BYTECODE CACHE ============================================
+# COMPILED TEMPLATES ARE WRITTEN TO A SHARED DIRECTORY SO EVERY GUNICORN WORKER (AND EVERY RECYCLED ONE)
+# LOADS BYTECODE INSTEAD OF RE-COMPILING base.html + THE PAGE ON ITS FIRST REQUEST.
+# JINJA UNMARSHALS WHATEVER IS IN THAT DIRECTORY, SO IT MUST BE OURS ALONE: BY DEFAULT JINJA PICKS ITS OWN PER-USER
+# 0700 DIRECTORY (AND CHECKS ITS OWNER); A TEMPLATE_CACHE_DIR IS CREATED 0700 AND REFUSED IF ANYONE ELSE COULD WRITE IT.
+
+TEMPLATE_CACHE_DIR = os.environ.get("TEMPLATE_CACHE_DIR", "")
+TEMPLATE_WARMUP = os.environ.get("TEMPLATE_WARMUP", "1") != "0"
+
+
+def PrivateDirectory(path):
+    """Create path 0700 if missing - True only if it's a real directory owned by us that no one else can write"""
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        info = os.lstat(path)
+    except OSError as e:
+        print(f"❌ Template cache directory {path}: {e}")
+        return False
+    foreign = hasattr(os, "getuid") and (info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+    if not stat.S_ISDIR(info.st_mode) or foreign:
+        print(f"⚠️ Template cache directory {path} is not private to this user - bytecode cache disabled")
+        return False
+    return True
+
+
+def ConfigureTemplateCache(app, cache_dir=None):
+    """Attach a filesystem bytecode cache to the app's Jinja environment (call before the first render).
+    Returns the directory in use, or None if the configured one was unsafe and templates compile in memory only"""
+    cache_dir = cache_dir or TEMPLATE_CACHE_DIR
+    if cache_dir and not PrivateDirectory(cache_dir):
+        return None
+    bytecode_cache = FileSystemBytecodeCache(cache_dir or None, "%s.cache")
+    app.jinja_options = {**app.jinja_options, "bytecode_cache": bytecode_cache}
+    return bytecode_cache.directory
+
+
+def WarmTemplates(app):
+    """Compile every template once so the bytecode cache and the worker's in-memory cache are hot"""
+    start = time.perf_counter()
+    compiled = 0
+    for name in app.jinja_env.list_templates(extensions=["html"]):
+        if name.startswith("email/"):  # NOTIFICATION EMAILS HAVE THEIR OWN ENVIRONMENT (email_render.py)
+            continue
+        try:
+            app.jinja_env.get_template(name)
+            compiled += 1
+        except Exception as e:
+            print(f"❌ Template warm-up failed for {name}: {e}")
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✅ Warmed {compiled} templates in {elapsed:.1f} ms")
+    return compiled
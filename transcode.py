@@ -0,0 +1,260 @@
+"""Bulk-convert a directory tree of audio files to MP3 with the same checks and ffmpeg settings as /convert.
+
+Files are probed, limit-checked and encoded by audio_convert (exactly what the web route does), in parallel
+across a process pool. Outputs mirror the source tree. A manifest in the output directory records each
+source's checksum, so re-running skips files already converted under the current settings, copies outputs
+for duplicate sources instead of re-encoding them, and picks up where an interrupted run stopped.
+
+Usage:
+  python transcode.py /archive/raw --out /archive/mp3 --processes 8
+  python transcode.py /archive/raw --out /archive/mp3 --force      # redo everything
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+from multiprocessing import Pool
+
+from audio_convert import ConvertFile, ConversionError, HasAllowedExtension, HashFile, SettingsSignature
+
+MANIFEST = ".transcode-manifest.jsonl"
+PARTIAL = ".part"  # OUTPUTS ARE WRITTEN HERE, THEN RENAMED - A CRASH NEVER LEAVES A HALF FILE UNDER THE REAL NAME
+PROGRESS_SECONDS = 5
+
+
+# ============================================ MANIFEST ============================================
+# APPEND-ONLY JSON LINES, ONE PER FINISHED SOURCE; THE LAST LINE FOR A SOURCE WINS. A LINE IS ONLY WRITTEN AFTER
+# ITS OUTPUT HAS BEEN RENAMED INTO PLACE, SO AN INTERRUPTED RUN LOSES AT MOST THE JOBS THAT WERE IN FLIGHT.
+def LoadManifest(path):
+    entries = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # TORN LAST LINE FROM A KILLED RUN
+                entries[entry["source"]] = entry
+    return entries
+
+
+def AppendManifest(f, entry):
+    f.write(json.dumps(entry) + "\n")
+    f.flush()
+    os.fsync(f.fileno())
+
+
+# ============================================ PLAN ============================================
+def FindSources(source_dir):
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if HasAllowedExtension(name):
+                yield os.path.relpath(os.path.join(root, name), source_dir)
+
+
+def OutputFor(relative):
+    return os.path.splitext(relative)[0] + ".mp3"
+
+
+def Fingerprint(path):
+    stat = os.stat(path)
+    return stat.st_size, int(stat.st_mtime)
+
+
+def CleanPartials(out_dir):
+    for root, _, files in os.walk(out_dir):
+        for name in files:
+            if name.endswith(PARTIAL):
+                os.remove(os.path.join(root, name))
+
+
+def HashJob(job):
+    source_dir, relative = job
+    return relative, HashFile(os.path.join(source_dir, relative))
+
+
+def OutputIntact(out_dir, entry):
+    path = os.path.join(out_dir, entry["output"])
+    return os.path.exists(path) and os.path.getsize(path) == entry["output_size"]
+
+
+# ============================================ CONVERT (WORKER PROCESSES) ============================================
+def ConvertJob(job):
+    source_dir, out_dir, relative, output, digest = job
+    source = os.path.join(source_dir, relative)
+    output = os.path.join(out_dir, output)
+    partial = output + PARTIAL
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    try:
+        info, estimate, elapsed = ConvertFile(source, partial, digest)
+        os.replace(partial, output)
+    except (ConversionError, OSError) as e:
+        if os.path.exists(partial):
+            os.remove(partial)
+        return {"source": relative, "error": str(e)}
+    return {
+        "source": relative,
+        "duration": info.duration or 0,
+        "codec": info.codec,
+        "seconds": round(elapsed, 2),
+        "estimated_seconds": round(estimate, 2),
+    }
+
+
+# ============================================ THROUGHPUT ============================================
+class Throughput:
+    def __init__(self, total):
+        self.total = total
+        self.start = time.perf_counter()
+        self.last_print = 0
+        self.converted = self.failed = 0
+        self.audio_seconds = 0.0
+        self.input_bytes = 0
+
+    def Add(self, result, size):
+        if "error" in result:
+            self.failed += 1
+        else:
+            self.converted += 1
+            self.audio_seconds += result["duration"]
+            self.input_bytes += size
+        now = time.perf_counter()
+        if now - self.last_print >= PROGRESS_SECONDS:
+            self.last_print = now
+            print(f"\r{self.Line()}", end="", file=sys.stderr, flush=True)
+
+    def Line(self):
+        elapsed = time.perf_counter() - self.start
+        done = self.converted + self.failed
+        return (f"{done:,}/{self.total:,} files | {self.Rate(elapsed, self.converted):.1f} files/s | "
+                f"{self.Rate(elapsed, self.audio_seconds):.0f}x realtime | "
+                f"{self.Rate(elapsed, self.input_bytes) / 1024 / 1024:.1f} MB/s | {self.failed} failed")
+
+    @staticmethod
+    def Rate(elapsed, amount):
+        return amount / elapsed if elapsed else 0.0
+
+    def Summary(self):
+        elapsed = time.perf_counter() - self.start
+        return {
+            "converted": self.converted,
+            "failed": self.failed,
+            "seconds": round(elapsed, 2),
+            "files_per_sec": round(self.Rate(elapsed, self.converted), 2),
+            "audio_hours": round(self.audio_seconds / 3600, 2),
+            "realtime_factor": round(self.Rate(elapsed, self.audio_seconds), 1),
+            "input_mb_per_sec": round(self.Rate(elapsed, self.input_bytes) / 1024 / 1024, 2),
+        }
+
+
+# ============================================ MAIN ============================================
+def Main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="directory to walk")
+    parser.add_argument("--out", help="output directory (default: <source>_mp3)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true", help="ignore the manifest and convert everything")
+    args = parser.parse_args()
+
+    source_dir = os.path.abspath(args.source)
+    out_dir = os.path.abspath(args.out or source_dir.rstrip(os.sep) + "_mp3")
+    os.makedirs(out_dir, exist_ok=True)
+    CleanPartials(out_dir)
+
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    manifest = {} if args.force else LoadManifest(manifest_path)
+    settings = SettingsSignature()
+    sources = list(FindSources(source_dir))
+
+    with Pool(args.processes) as pool, open(manifest_path, "a", encoding="utf-8") as manifest_file:
+        # ---------- CHECKSUMS: REUSE THE MANIFEST'S WHEN SIZE + MTIME ARE UNCHANGED ----------
+        digests, to_hash = {}, []
+        for relative in sources:
+            entry = manifest.get(relative)
+            size, mtime = Fingerprint(os.path.join(source_dir, relative))
+            if entry and (entry["size"], entry["mtime"]) == (size, mtime):
+                digests[relative] = entry["sha256"]
+            else:
+                to_hash.append((source_dir, relative))
+        digests.update(pool.imap_unordered(HashJob, to_hash, chunksize=8))
+
+        # ---------- SKIP / COPY / CONVERT ----------
+        finished = {  # ANY INTACT OUTPUT PER CHECKSUM - THE SOURCE FOR DUPLICATE COPIES
+            entry["sha256"]: entry for entry in manifest.values()
+            if entry["settings"] == settings and OutputIntact(out_dir, entry)
+        }
+        jobs, duplicates, claimed, scheduled, skipped = [], [], set(), set(), 0
+        for relative in sources:
+            size, mtime = Fingerprint(os.path.join(source_dir, relative))
+            output = OutputFor(relative)
+            if output in claimed:  # song.wav AND song.flac IN ONE FOLDER
+                output = relative + ".mp3"
+            claimed.add(output)
+            entry = {"source": relative, "size": size, "mtime": mtime, "sha256": digests[relative],
+                     "output": output, "settings": settings}
+            own = manifest.get(relative)
+            if own and all(own[key] == entry[key] for key in ("sha256", "settings", "output")) \
+                    and OutputIntact(out_dir, own):
+                skipped += 1
+                if (own["size"], own["mtime"]) != (size, mtime):  # TOUCHED, NOT CHANGED - NO REHASH NEXT TIME
+                    AppendManifest(manifest_file, {**own, "size": size, "mtime": mtime})
+            elif entry["sha256"] in finished or entry["sha256"] in scheduled:
+                duplicates.append(entry)  # SAME BYTES UNDER ANOTHER NAME - COPY THE MP3 ONCE IT EXISTS
+            else:
+                jobs.append(entry)
+                scheduled.add(entry["sha256"])
+
+        print(f"{len(sources):,} sources: {skipped:,} up to date, {len(duplicates):,} duplicates to copy, "
+              f"{len(jobs):,} to convert with {args.processes} processes", file=sys.stderr)
+
+        throughput = Throughput(len(jobs))
+        pending = {entry["source"]: entry for entry in jobs}
+        failures = []
+        try:
+            work = [(source_dir, out_dir, entry["source"], entry["output"], entry["sha256"]) for entry in jobs]
+            for result in pool.imap_unordered(ConvertJob, work):
+                entry = pending.pop(result["source"])
+                throughput.Add(result, entry["size"])
+                if "error" in result:
+                    failures.append(result)
+                    print(f"\n❌ {result['source']}: {result['error']}", file=sys.stderr)
+                    continue
+                entry = {**entry, **result, "output_size": os.path.getsize(os.path.join(out_dir, entry["output"]))}
+                AppendManifest(manifest_file, entry)
+                finished[entry["sha256"]] = entry
+        except KeyboardInterrupt:
+            pool.terminate()
+            print(f"\n⚠️ Interrupted - {len(pending):,} files left; run the same command again to resume",
+                  file=sys.stderr)
+            sys.exit(130)
+
+        copied = 0
+        for entry in duplicates:
+            original = finished.get(entry["sha256"])
+            if not original:
+                continue  # ITS ORIGINAL FAILED - ALREADY REPORTED
+            destination = os.path.join(out_dir, entry["output"])
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.copyfile(os.path.join(out_dir, original["output"]), destination + PARTIAL)
+            os.replace(destination + PARTIAL, destination)
+            AppendManifest(manifest_file, {**entry, "output_size": original["output_size"], "copied_from": original["source"]})
+            copied += 1
+        print(f"\r{throughput.Line()}", file=sys.stderr)
+
+    print(json.dumps({
+        "sources": len(sources),
+        "skipped": skipped,
+        "copied": copied,
+        **throughput.Summary(),
+        "failures": failures,
+        "manifest": manifest_path,
+    }, indent=2))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    Main()
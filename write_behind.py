@@ -0,0 +1,305 @@
+import os
+import glob
+import json
+import time
+import queue
+import atexit
+import threading
+from datetime import datetime
+import psycopg2
+from psycopg2.extras import execute_values
+
+try:
+    import fcntl
+except ImportError:  # NO fcntl (WINDOWS) - ORPHANED WAL FILES ARE NOT REPLAYED AUTOMATICALLY
+    fcntl = None
+
+from db_helpers import ConnectToDB, NotifySubmission, SubmissionEvent, NOTIFY_KINDS
+
+# ============================================ WRITE-BEHIND SUBMISSION BUFFER ============================================
+# PUBLIC FORM POSTS ARE ACCEPTED INTO A BOUNDED QUEUE AND A BACKGROUND THREAD FLUSHES THEM WITH ONE MULTI-ROW
+# INSERT + ONE COMMIT PER BATCH, SO A BURST PAYS ONE fsync PER BATCH INSTEAD OF ONE PER SUBMISSION.
+#
+# DURABILITY (WRITE_BEHIND_WAL / WRITE_BEHIND_FSYNC):
+#   no WAL dir        - queue lives in memory only; a crash loses up to one queue of submissions
+#   WAL, fsync=never  - every submission is appended to a per-worker log first; survives a process crash
+#   WAL, fsync=always - the log is fsync'd before the request returns; survives power loss
+# EACH QUEUED SUBMISSION REMEMBERS WHERE ITS LINE ENDS IN THE LOG. AFTER EVERY COMMITTED BATCH THE LOG IS CUT DOWN TO
+# WHAT IS STILL UNCOMMITTED (TRUNCATED WHEN NOTHING IS, OTHERWISE THE TAIL IS COPIED TO A NEW FILE AND RENAMED OVER IT),
+# SO IT STAYS AS SMALL AS THE QUEUE UNDER STEADY TRAFFIC AND A REPLAY ONLY RE-INSERTS A BATCH THAT DIED MID-CHECKPOINT.
+# LOGS LEFT BEHIND BY DEAD WORKERS ARE REPLAYED AT STARTUP.
+# IF THE QUEUE IS FULL, Submit() FALLS BACK TO THE DIRECT INSERT, WHICH SLOWS THE CALLER DOWN (BACKPRESSURE).
+# A BATCH THAT FAILS ON A CONNECTION/TIMEOUT ERROR IS RETRIED WITH BACKOFF. ONE THE DATABASE REFUSES (BAD DATA) IS
+# BISECTED: THE GOOD ROWS ARE INSERTED AND THE BAD ONES GO TO THE SPOOL'S rejected.jsonl, SO NOTHING QUEUES BEHIND THEM.
+
+WRITE_BEHIND_ENABLED = os.environ.get("WRITE_BEHIND", "0") == "1"
+WRITE_BEHIND_MAX_ROWS = int(os.environ.get("WRITE_BEHIND_MAX_ROWS", 100))
+WRITE_BEHIND_MAX_DELAY_MS = int(os.environ.get("WRITE_BEHIND_MAX_DELAY_MS", 200))
+WRITE_BEHIND_QUEUE_SIZE = int(os.environ.get("WRITE_BEHIND_QUEUE_SIZE", 10000))
+WRITE_BEHIND_WAL = os.environ.get("WRITE_BEHIND_WAL", "")
+WRITE_BEHIND_FSYNC = os.environ.get("WRITE_BEHIND_FSYNC", "never")
+
+TABLES = {
+    "contact_me": (
+        ("name", "email", "message", "timestamp"),
+        lambda d: (d.get('HumanName'), d.get('EmailAddy'), d.get('message')),
+    ),
+    "support": (
+        ("name", "email", "page", "issue", "timestamp"),
+        lambda d: (d.get('name'), d.get('email'), d.get('page'), d.get('issue')),
+    ),
+    "game_feedback": (
+        ("name", "email", "stars", "review", "timestamp"),
+        lambda d: (d.get('name'), d.get('email'), d.get('stars'), d.get('review')),
+    ),
+}
+
+
+def InsertRecords(records):
+    """One multi-row INSERT per table, one commit for the whole batch - records are [table, values, submitted_at].
+    True once committed, False if the database is unreachable (retry later), None if it refused the rows themselves"""
+    conn = ConnectToDB()
+    if not conn:
+        return False
+    try:
+        cursor = conn.cursor()
+        by_table = {}
+        for table, values, submitted_at in records:
+            by_table.setdefault(table, []).append((*values, submitted_at))
+        for table, rows in by_table.items():
+            columns = TABLES[table][0]
+            inserted = execute_values(
+                cursor,
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s RETURNING id, status, timestamp",
+                rows, page_size=len(rows), fetch=True
+            )
+            for row, values in zip(inserted, rows):
+                NotifySubmission(cursor, SubmissionEvent(NOTIFY_KINDS[table], row, dict(zip(columns, values))))
+        conn.commit()
+        cursor.close()
+        conn.close()
+        return True
+    except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:  # DROPPED CONNECTION, statement_timeout
+        print(f"❌ Database unavailable flushing {len(records)} submissions: {e}")
+        conn.close()
+        return False
+    except Exception as e:
+        print(f"❌ Error flushing {len(records)} submissions: {e}")
+        conn.rollback()
+        conn.close()
+        return None
+
+
+def Record(table, data):
+    """The WAL/spool form of a submission: [table, column values, submitted_at]"""
+    return [table, list(TABLES[table][1](data)), datetime.now().isoformat()]
+
+
+class WriteBehindBuffer:
+    def __init__(self, wal_dir=WRITE_BEHIND_WAL, max_rows=WRITE_BEHIND_MAX_ROWS,
+                 max_delay_ms=WRITE_BEHIND_MAX_DELAY_MS, queue_size=WRITE_BEHIND_QUEUE_SIZE,
+                 fsync=WRITE_BEHIND_FSYNC):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self.fsync = fsync == "always"
+        self.wal_dir = wal_dir
+        self.wal = None
+        self.wal_path = None
+        self.wal_lock = threading.Lock()
+        self.wal_base = 0     # LOG POSITION OF THE FIRST BYTE STILL IN THE FILE (POSITIONS COUNT EVERY BYTE EVER WRITTEN)
+        self.wal_written = 0  # LOG POSITION AFTER THE LAST APPENDED LINE
+        self.stats = {"accepted": 0, "flushed": 0, "batches": 0, "fallbacks": 0, "errors": 0, "rejected": 0}
+        self.stop = threading.Event()
+        self.thread = None
+
+    # ---------- WAL ----------
+    def OpenWAL(self):
+        if not self.wal_dir:
+            return
+        os.makedirs(self.wal_dir, exist_ok=True)
+        self.ReplayOrphans()
+        self.wal_path = os.path.join(self.wal_dir, f"submissions-{os.getpid()}-{int(time.time())}.wal")
+        self.wal = self.LockedWAL(self.wal_path)
+
+    def LockedWAL(self, path):
+        wal = open(path, "ab")
+        if fcntl:
+            fcntl.flock(wal, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return wal
+
+    def AppendWAL(self, record):
+        """Caller holds wal_lock - returns the log position just past the record's line"""
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        self.wal.write(line)
+        self.wal.flush()
+        if self.fsync:
+            os.fsync(self.wal.fileno())
+        self.wal_written += len(line)
+        return self.wal_written
+
+    def CheckpointWAL(self, position):
+        """Drop every line before `position` (the end of the last committed record) from the log"""
+        if not self.wal:
+            return
+        with self.wal_lock:
+            if position <= self.wal_base:
+                return
+            if position >= self.wal_written:  # NOTHING UNCOMMITTED - CUT IT IN PLACE
+                self.wal.truncate(0)
+                self.wal_base = self.wal_written
+                return
+            with open(self.wal_path, "rb") as f:
+                f.seek(position - self.wal_base)
+                tail = f.read()
+            # COPY THE UNCOMMITTED TAIL TO A NEW FILE AND RENAME IT OVER THE LOG - A CRASH LEAVES ONE OR THE OTHER WHOLE
+            wal = self.LockedWAL(self.wal_path + ".tmp")
+            wal.write(tail)
+            wal.flush()
+            if self.fsync:
+                os.fsync(wal.fileno())
+            os.replace(self.wal_path + ".tmp", self.wal_path)
+            self.wal.close()
+            self.wal = wal
+            self.wal_base = position
+
+    def ReplayOrphans(self):
+        """Insert submissions from WAL files whose worker is gone (their lock is free)"""
+        if fcntl is None:
+            return
+        for path in glob.glob(os.path.join(self.wal_dir, "*.wal.tmp")):  # A CHECKPOINT THAT DIED - ITS .wal IS WHOLE
+            with open(path, "rb") as f:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    continue
+                os.remove(path)
+        for path in glob.glob(os.path.join(self.wal_dir, "*.wal")):
+            try:
+                with open(path, "r+", encoding="utf-8") as f:
+                    try:
+                        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        continue  # A LIVE WORKER OWNS IT
+                    records = [json.loads(line) for line in f if line.strip()]
+                    result = self.InsertBatch(records) if records else True
+                    left = self.Isolate(records) if result is None else ([] if result else records)
+                    if left:  # KEEP ONLY WHAT'S LEFT SO NOTHING IS INSERTED TWICE - TRY AGAIN NEXT BOOT
+                        f.seek(0)
+                        f.truncate()
+                        f.writelines(json.dumps(record) + "\n" for record in left)
+                        f.flush()
+                        os.fsync(f.fileno())
+                        continue
+                    print(f"✅ Replayed {len(records)} submissions from {os.path.basename(path)}")
+                os.remove(path)
+            except Exception as e:
+                print(f"❌ Error replaying {path}: {e}")
+
+    # ---------- PRODUCER ----------
+    def Submit(self, table, data):
+        """Accept a submission for a later batched insert - False means the caller should insert directly"""
+        item = [Record(table, data), None]  # [RECORD, LOG POSITION AFTER ITS LINE] - SET BEFORE wal_lock IS RELEASED
+        with self.wal_lock:
+            try:
+                self.queue.put_nowait(item)
+            except queue.Full:
+                self.stats["fallbacks"] += 1
+                return False
+            self.stats["accepted"] += 1
+            if self.wal:
+                try:
+                    item[1] = self.AppendWAL(item[0])
+                except Exception as e:  # STILL QUEUED - ONLY CRASH SAFETY IS LOST FOR THIS ONE
+                    print(f"❌ Write-behind WAL error: {e}")
+        return True
+
+    def Settle(self, items):
+        """The items (a prefix of the queue order) are committed or rejected - checkpoint the log past them"""
+        positions = [position for _, position in items if position is not None]
+        if positions:
+            try:
+                self.CheckpointWAL(positions[-1])
+            except Exception as e:  # THE LOG JUST KEEPS THE LINES - A CRASH NOW WOULD REPLAY THEM
+                print(f"❌ Write-behind WAL checkpoint error: {e}")
+
+    # ---------- CONSUMER ----------
+    def InsertBatch(self, records):
+        return InsertRecords(records)
+
+    def Reject(self, record):
+        from spool import spool  # spool IMPORTS THIS MODULE - RESOLVED AT CALL TIME
+        spool.Reject(record)
+        self.stats["rejected"] += 1
+
+    def Isolate(self, records):
+        """Split a refused batch in halves until the bad rows are alone: insert the rest, reject those.
+        Returns the records still to retry - non-empty only if the database went away part way"""
+        if len(records) == 1:
+            self.Reject(records[0])
+            return []
+        middle = len(records) // 2
+        halves = [records[:middle], records[middle:]]
+        for index, half in enumerate(halves):
+            result = self.InsertBatch(half)
+            left = self.Isolate(half) if result is None else ([] if result else half)
+            if left:  # ALWAYS A TAIL OF `half` - EVERYTHING BEFORE IT IS INSERTED OR REJECTED
+                return left + [record for rest in halves[index + 1:] for record in rest]
+        return []
+
+    def Run(self):
+        batch = []
+        backoff = self.max_delay
+        while not (self.stop.is_set() and self.queue.empty() and not batch):
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_rows:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if not batch:
+                continue
+
+            records = [record for record, _ in batch]
+            result = self.InsertBatch(records)
+            retry = [] if result else records
+            rejected = self.stats["rejected"]
+            if result is None:  # RETRYING THE SAME ROWS WOULD FAIL FOREVER - SET THE BAD ONES ASIDE
+                self.stats["errors"] += 1
+                retry = self.Isolate(records)
+            done = len(batch) - len(retry)  # retry IS ALWAYS A TAIL OF THE BATCH
+            self.stats["flushed"] += done - (self.stats["rejected"] - rejected)
+            self.Settle(batch[:done])
+            batch = batch[done:]
+            if not batch:
+                self.stats["batches"] += 1
+                backoff = self.max_delay
+            else:
+                # DB IS UNREACHABLE - KEEP WHAT'S LEFT OF THE BATCH (IT IS STILL IN THE WAL) AND BACK OFF
+                self.stats["errors"] += 1
+                if self.stop.is_set():
+                    print(f"❌ Dropping {len(batch)} unflushed submissions on shutdown (kept in WAL if enabled)")
+                    return
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def Start(self):
+        self.OpenWAL()
+        self.thread = threading.Thread(target=self.Run, name="write-behind", daemon=True)
+        self.thread.start()
+        atexit.register(self.Shutdown)
+        print(f"✅ Write-behind buffer started (batch {self.max_rows} rows / {int(self.max_delay * 1000)} ms)")
+
+    def Shutdown(self, timeout=10):
+        self.stop.set()
+        if self.thread:
+            self.thread.join(timeout)
+
+
+buffer = None
+if WRITE_BEHIND_ENABLED:
+    buffer = WriteBehindBuffer()
+    buffer.Start()